@@ -122,6 +122,7 @@ def create_spec_file():
         '    "src.core.uv_manager",',
         '    "src.core.node_base",',
         '    "src.core.workflow_runner",',
+        '    "src.cli",',
         '    ',
         '    # JSON 和其他依赖',
         '    "json",',
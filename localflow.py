@@ -0,0 +1,11 @@
+"""
+LocalFlow 命令行入口（不启动图形界面）
+
+    python -m localflow run workflows/<name>/workflow.json --json
+"""
+import sys
+
+from src.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,55 @@
 import sys
+import time
 
-from PySide6.QtWidgets import QApplication
+_START_TIME = time.perf_counter()
+
+# 启动时间预算（毫秒）：从进程启动到主窗口首帧绘制
+STARTUP_BUDGET_MS = 1500
+
+
+def _report_startup(window, timings: dict):
+    """首帧绘制后输出各阶段启动耗时，并与预算比较"""
+    timings["首帧"] = time.perf_counter()
+
+    phases = []
+    previous = _START_TIME
+    for name, timestamp in timings.items():
+        phases.append(f"{name} {(timestamp - previous) * 1000:.0f}ms")
+        previous = timestamp
+    total_ms = (previous - _START_TIME) * 1000
+
+    message = f"启动耗时 {total_ms:.0f}ms / 预算 {STARTUP_BUDGET_MS}ms（{', '.join(phases)}）"
+    if total_ms > STARTUP_BUDGET_MS:
+        message = f"警告: 启动超出预算 - {message}"
+    print(message)
+    window.statusBar().showMessage(message, 5000)
 
-from src.main_window import MainWindow
 
 if __name__ == '__main__':
+    # 命令行模式：python main.py run|batch <workflow.json>，不导入 PySide6
+    if len(sys.argv) > 1 and sys.argv[1] in ("run", "batch"):
+        from src.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    timings = {}
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from src.main_window import MainWindow
+    timings["导入"] = time.perf_counter()
+
     app = QApplication(sys.argv)
-    
+
     # Apply global theme
     from src.core.theme_manager import ThemeManager
     ThemeManager.apply_theme(app)
-    
+    timings["主题"] = time.perf_counter()
+
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    timings["主窗口"] = time.perf_counter()
+
+    # 事件循环处理完首次绘制后再统计
+    QTimer.singleShot(0, lambda: _report_startup(window, timings))
+    sys.exit(app.exec())
@@ -0,0 +1,213 @@
+"""
+命令行运行器
+无需启动图形界面即可执行已保存的工作流（不导入 PySide6），供 cron / CI 使用
+
+用法:
+    python -m localflow run workflows/<name>/workflow.json [...] [--input JSON] [--parallel N] [--json]
+    python -m localflow batch workflows/<name>/workflow.json --inputs inputs.jsonl [--parallel N]
+
+退出码:
+    0  所有工作流执行成功
+    1  至少一个工作流执行失败
+    2  参数错误或输入无法解析
+
+batch 命令从 JSON Lines 文件（或 "-" 表示 stdin）逐行读取初始上下文，
+以 JSON Lines 格式逐条输出每个条目的结果。
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, TextIO
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+def _parse_input(value: str) -> Dict[str, Any]:
+    """解析 --input 参数：JSON 字符串，或 JSON 文件路径"""
+    if not value:
+        return {}
+
+    path = Path(value)
+    if path.is_file():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        data = json.loads(value)
+
+    if not isinstance(data, dict):
+        raise ValueError("输入数据必须是 JSON 对象")
+    return data
+
+
+def _iter_jsonl(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """逐行读取 JSON Lines 输入，跳过空行"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError(f"第 {line_no} 行不是 JSON 对象")
+        yield data
+
+
+def run_workflow(workflow_path: str, initial_data: Dict[str, Any] = None,
+                 prepare_env: bool = True) -> Dict[str, Any]:
+    """
+    加载并执行单个工作流
+
+    Args:
+        workflow_path: workflow.json 路径
+        initial_data: 初始输入数据
+        prepare_env: 是否先准备虚拟环境和依赖
+
+    Returns:
+        执行报告 {workflow, success, result, error, duration}
+    """
+    from src.core.uv_manager import UVManager
+    from src.core.workflow_executor import WorkflowExecutor
+
+    start_time = time.perf_counter()
+    report = {"workflow": workflow_path, "success": False, "result": None, "error": None}
+
+    try:
+        # 工作流目录位于 <workspace>/<name>/workflow.json
+        workspace_root = Path(workflow_path).resolve().parent.parent
+        executor = WorkflowExecutor.load_workflow(workflow_path, UVManager(str(workspace_root)))
+
+        if prepare_env and not executor.prepare_environment():
+            print(f"警告: 工作流环境准备失败，将使用当前Python环境: {workflow_path}")
+
+        report["result"] = executor.execute(dict(initial_data or {}))
+        report["success"] = True
+    except Exception as e:
+        report["error"] = str(e)
+
+    report["duration"] = round(time.perf_counter() - start_time, 6)
+    return report
+
+
+def _print_report(report: Dict[str, Any], as_json: bool, stream):
+    """输出单个工作流的执行报告"""
+    if as_json:
+        stream.write(json.dumps(report, ensure_ascii=False, default=str) + "\n")
+    elif report["success"]:
+        stream.write(f"[OK] {report['workflow']} ({report['duration']:.3f}s)\n")
+        for key, value in report["result"].items():
+            stream.write(f"  {key} = {value}\n")
+    else:
+        stream.write(f"[FAILED] {report['workflow']} ({report['duration']:.3f}s): {report['error']}\n")
+    stream.flush()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="localflow", description="LocalFlow 命令行工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="执行已保存的工作流")
+    run_parser.add_argument("workflows", nargs="+", help="workflow.json 文件路径")
+    run_parser.add_argument("--input", default="", help="初始输入数据（JSON 字符串或 JSON 文件路径）")
+    run_parser.add_argument("--parallel", type=int, default=1, help="同时执行的工作流数量")
+    run_parser.add_argument("--json", action="store_true", help="以 JSON Lines 格式输出结果")
+    run_parser.add_argument("--no-prepare", action="store_true", help="跳过虚拟环境和依赖准备")
+
+    batch_parser = subparsers.add_parser("batch", help="使用多组输入批量执行同一工作流")
+    batch_parser.add_argument("workflow", help="workflow.json 文件路径")
+    batch_parser.add_argument("--inputs", default="-", help="JSON Lines 输入文件，默认从 stdin 读取")
+    batch_parser.add_argument("--parallel", type=int, default=4, help="同时处理的条目数量")
+    batch_parser.add_argument("--no-prepare", action="store_true", help="跳过虚拟环境和依赖准备")
+
+    return parser
+
+
+def run_batch(args) -> int:
+    """执行 batch 命令"""
+    from src.core.uv_manager import UVManager
+    from src.core.workflow_executor import WorkflowExecutor
+
+    if not Path(args.workflow).is_file():
+        print(f"工作流文件不存在: {args.workflow}", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.inputs != "-" and not Path(args.inputs).is_file():
+        print(f"输入文件不存在: {args.inputs}", file=sys.stderr)
+        return EXIT_USAGE
+
+    out = sys.stdout
+    all_success = True
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            workspace_root = Path(args.workflow).resolve().parent.parent
+            executor = WorkflowExecutor.load_workflow(args.workflow, UVManager(str(workspace_root)))
+        except Exception as e:
+            print(f"加载工作流失败: {e}", file=sys.stderr)
+            return EXIT_FAILED
+
+        if not args.no_prepare and not executor.prepare_environment():
+            print(f"警告: 工作流环境准备失败，将使用当前Python环境: {args.workflow}")
+
+        input_stream = sys.stdin if args.inputs == "-" else open(args.inputs, 'r', encoding='utf-8')
+        try:
+            for item in executor.execute_batch(_iter_jsonl(input_stream), args.parallel, stream=out):
+                all_success = all_success and item["success"]
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"无法解析输入数据: {e}", file=sys.stderr)
+            return EXIT_USAGE
+        finally:
+            if input_stream is not sys.stdin:
+                input_stream.close()
+
+    return EXIT_OK if all_success else EXIT_FAILED
+
+
+def main(argv: List[str] = None) -> int:
+    """命令行入口"""
+    parser = _build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+
+    if args.parallel < 1:
+        print("--parallel 必须大于 0", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.command == "batch":
+        return run_batch(args)
+
+    try:
+        initial_data = _parse_input(args.input)
+    except (ValueError, OSError) as e:
+        print(f"无法解析输入数据: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    for workflow_path in args.workflows:
+        if not Path(workflow_path).is_file():
+            print(f"工作流文件不存在: {workflow_path}", file=sys.stderr)
+            return EXIT_USAGE
+
+    # 结果输出到真实 stdout，执行过程中的日志重定向到 stderr，保证输出可被解析
+    out = sys.stdout
+    all_success = True
+    with contextlib.redirect_stdout(sys.stderr):
+        with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+            futures = [
+                pool.submit(run_workflow, path, initial_data, not args.no_prepare)
+                for path in args.workflows
+            ]
+            for future in futures:
+                report = future.result()
+                all_success = all_success and report["success"]
+                _print_report(report, args.json, out)
+
+    return EXIT_OK if all_success else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -78,14 +78,11 @@ class CustomNodeManager:
                 source_code="",
                 config_schema=config.get("config_schema", {}),
                 dependencies=config.get("dependencies", []),
-                version=config.get("version", "1.0.0")
+                version=config.get("version", "1.0.0"),
+                # 源代码在首次使用时读取
+                source_path=str(node_dir / config.get("entry_file", "node.py"))
             )
             
-            entry_file = node_dir / config.get("entry_file", "node.py")
-            if entry_file.exists():
-                with open(entry_file, 'r', encoding='utf-8') as sf:
-                    node_def.source_code = sf.read()
-                    
             return node_def
         except Exception as e:
             print(f"加载节点失败 {node_dir}: {e}")
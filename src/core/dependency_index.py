@@ -0,0 +1,148 @@
+"""
+依赖反向索引
+回答"哪些工作流需要某个 pip 包"：包（及版本约束） -> 声明该依赖的节点类型 -> 使用这些节点的工作流
+
+不单独持久化：包到节点类型由节点注册表的依赖索引给出，节点类型到工作流由
+工作流扫描器的 SQLite 索引给出，两者都是增量维护的，查询时直接组合，结果始终是最新的。
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
+
+from src.core.node_registry import NodeRegistry, get_registry, split_requirement
+from src.core.workflow_scanner import WorkflowScanner, WorkflowNodeInfo
+
+
+def specifiers_overlap(first: str, second: str) -> bool:
+    """
+    两个版本约束（如 ">=2" 和 "==2.2.0"）是否存在同时满足的版本
+    
+    空约束表示任意版本。两个约束的交集非空时，必然包含某个约束边界上的版本，
+    或紧挨在边界之上的版本，因此只需用这些候选版本检验。无法解析的约束按字符串比较。
+    """
+    if not first or not second:
+        return True
+    try:
+        specifier_sets = (SpecifierSet(first), SpecifierSet(second))
+    except InvalidSpecifier:
+        return first == second
+    
+    candidates = {Version("0")}
+    for specifier_set in specifier_sets:
+        for specifier in specifier_set:
+            try:
+                bound = Version(specifier.version.rstrip(".*"))
+            except InvalidVersion:
+                continue
+            # 边界本身，以及比边界稍大、但小于任何更高发布版本的版本
+            candidates.add(bound)
+            candidates.add(Version(f"{bound.base_version}.0.0.1"))
+            candidates.add(Version(f"{bound.base_version}.0.1"))
+    return any(
+        all(specifier_set.contains(version, prereleases=True) for specifier_set in specifier_sets)
+        for version in candidates
+    )
+
+
+@dataclass
+class PackageUsage:
+    """某个节点对依赖包的声明及其使用情况"""
+    package: str        # 规范化的包名
+    requirement: str    # 节点声明的依赖（含版本约束），如 "pandas>=2"
+    node_type: str
+    node_name: str
+    workflows: List[WorkflowNodeInfo]  # 使用该节点的工作流
+
+
+class DependencyIndex:
+    """跨工作流的依赖反向索引"""
+    
+    def __init__(self, scanner: WorkflowScanner = None, registry: NodeRegistry = None):
+        """
+        Args:
+            scanner: 工作流扫描器，默认新建
+            registry: 节点注册表，默认使用全局注册表
+        """
+        self._scanner = scanner or WorkflowScanner()
+        self._registry = registry
+    
+    @property
+    def registry(self) -> NodeRegistry:
+        return self._registry or get_registry()
+    
+    def get_packages(self) -> List[str]:
+        """获取所有节点声明过的依赖包名"""
+        return self.registry.get_dependency_names()
+    
+    def find_usages(self, requirement: Optional[str] = None) -> List[PackageUsage]:
+        """
+        查询依赖包被哪些节点和工作流使用
+        
+        Args:
+            requirement: 包名，可带版本约束（如 "pandas>=2"，此时只匹配所声明的
+                         版本范围与之有交集的节点）；为空时返回所有依赖
+        
+        Returns:
+            按包名、节点类型排序的使用情况列表（包括未被任何工作流使用的节点）
+        """
+        if requirement and requirement.strip():
+            package, specifier = split_requirement(requirement)
+            packages = [package]
+        else:
+            specifier = ""
+            packages = self.get_packages()
+        
+        usages = []
+        for package in packages:
+            for node_def in self.registry.get_nodes_by_dependency(package):
+                for declared in node_def.dependencies:
+                    name, declared_specifier = split_requirement(declared)
+                    if name != package or not specifiers_overlap(specifier, declared_specifier):
+                        continue
+                    usages.append(PackageUsage(
+                        package=package,
+                        requirement=declared.strip(),
+                        node_type=node_def.node_type,
+                        node_name=node_def.name,
+                        workflows=[],
+                    ))
+        
+        # 一次查询所有相关节点类型的工作流
+        workflows = self._scanner.get_workflows_using_nodes(usage.node_type for usage in usages)
+        for usage in usages:
+            usage.workflows = workflows.get(usage.node_type, [])
+        usages.sort(key=lambda usage: (usage.package, usage.node_type, usage.requirement))
+        return usages
+    
+    def get_affected_workflows(self, packages: Iterable[str]) -> Dict[str, str]:
+        """
+        获取依赖了指定包的所有工作流（例如依赖升级后需要重建环境的工作流）
+        
+        Args:
+            packages: 包名或依赖声明列表
+        
+        Returns:
+            {工作流名称: workflow.json 路径}，按名称排序
+        """
+        affected = {}
+        for requirement in packages:
+            for usage in self.find_usages(requirement):
+                for info in usage.workflows:
+                    affected[info.workflow_name] = info.workflow_path
+        return dict(sorted(affected.items()))
+    
+    def get_workflow_requirements(self, workflow_name: str) -> List[str]:
+        """
+        获取工作流中节点声明的所有依赖（去重、排序），无需加载工作流
+        
+        Args:
+            workflow_name: 工作流名称
+        """
+        requirements = set()
+        for usage in self._scanner.get_nodes_in_workflow(workflow_name):
+            node_def = self.registry.get_node(usage.node_type)
+            if node_def:
+                requirements.update(d.strip() for d in node_def.dependencies if d.strip())
+        return sorted(requirements)
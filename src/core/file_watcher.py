@@ -0,0 +1,113 @@
+"""
+文件监视器
+周期性比较目录下文件的状态（mtime/size），生成新增/修改/删除事件
+
+不依赖平台相关的通知机制（inotify 等），由调用方在收到通知或定时调用 poll()；
+只比较文件状态，不读取文件内容，单次轮询的开销与文件数量成正比，
+因此图形界面应在后台线程中调用（同一时刻只能有一个线程调用 poll()）。
+"""
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 事件类型
+ADDED = "added"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class FileEvent:
+    """文件变化事件"""
+    kind: str   # ADDED / MODIFIED / DELETED
+    path: str   # 文件路径
+    root: str   # 所属监视目录
+
+
+class FileWatcher:
+    """基于文件状态比较的目录监视器"""
+    
+    # 默认跳过的目录（虚拟环境、生成的脚本、缓存等）
+    DEFAULT_IGNORE_DIRS = {".venv", "venv", "scripts", "__pycache__", ".git"}
+    
+    def __init__(self, roots: Iterable[str], suffixes: Iterable[str] = (".json", ".py"),
+                 ignore_dirs: Optional[Iterable[str]] = None):
+        """
+        初始化监视器
+        
+        Args:
+            roots: 要监视的目录列表
+            suffixes: 关注的文件后缀
+            ignore_dirs: 遍历时跳过的目录名
+        """
+        self.roots = [str(Path(root)) for root in roots]
+        self.suffixes = tuple(suffixes)
+        self.ignore_dirs = set(self.DEFAULT_IGNORE_DIRS if ignore_dirs is None else ignore_dirs)
+        # 文件路径 -> (所属目录, mtime_ns, size)
+        self._snapshot: Optional[Dict[str, Tuple[str, int, int]]] = None
+        # 上次遍历到的目录（包括监视目录本身）
+        self._directories: List[str] = []
+    
+    def _take_snapshot(self) -> Dict[str, Tuple[str, int, int]]:
+        """遍历所有监视目录，记录文件状态"""
+        snapshot = {}
+        directories = []
+        for root in self.roots:
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                directories.append(directory)
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.ignore_dirs:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(self.suffixes):
+                            stat = entry.stat()
+                            snapshot[entry.path] = (root, stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        # 遍历期间文件被删除
+                        continue
+        self._directories = directories
+        return snapshot
+    
+    def watched_paths(self) -> Tuple[List[str], List[str]]:
+        """
+        上次轮询时存在的目录和文件，可交给平台的变化通知机制监视
+        
+        Returns:
+            (目录列表, 文件列表)
+        """
+        return list(self._directories), list(self._snapshot or ())
+    
+    def poll(self) -> List[FileEvent]:
+        """
+        检查自上次调用以来的变化
+        
+        首次调用只建立基线，不产生事件。
+        
+        Returns:
+            变化事件列表
+        """
+        current = self._take_snapshot()
+        previous = self._snapshot
+        self._snapshot = current
+        if previous is None:
+            return []
+        
+        events = []
+        for path, (root, mtime_ns, size) in current.items():
+            old = previous.get(path)
+            if old is None:
+                events.append(FileEvent(ADDED, path, root))
+            elif old[1] != mtime_ns or old[2] != size:
+                events.append(FileEvent(MODIFIED, path, root))
+        for path in previous.keys() - current.keys():
+            events.append(FileEvent(DELETED, path, previous[path][0]))
+        return events
@@ -2,6 +2,7 @@
 节点基类和节点类型定义
 每个节点都是一个独立的Python脚本
 """
+import ast
 import json
 import sys
 from abc import ABC, abstractmethod
@@ -22,6 +23,9 @@ class NodeType(Enum):
 class NodeBase(ABC):
     """节点基类"""
     
+    # 纯节点：无第三方依赖、无副作用，可由执行器直接在宿主进程内调用 execute()
+    pure = False
+    
     def __init__(self, node_id: str, node_type: NodeType, config: dict = None):
         """
         初始化节点
@@ -267,6 +271,8 @@ if __name__ == "__main__":
 class VariableAssignNode(NodeBase):
     """变量赋值节点"""
     
+    pure = True
+    
     def __init__(self, node_id: str, config: dict = None):
         super().__init__(node_id, NodeType.VARIABLE_ASSIGN, config)
         # config: {"variable_name": "x", "value": "100", "value_type": "int"}
@@ -310,6 +316,43 @@ class VariableAssignNode(NodeBase):
         return self._get_base_script_template(execute_code)
 
 
+# 可在宿主进程内求值的表达式语法：常量、变量名、算术/比较/逻辑运算和条件表达式
+_SAFE_EXPRESSION_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load,
+    ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+)
+# 乘方和左移的结果可能大到耗尽内存或长时间卡住（如 9**9**9），
+# 只有右侧是不超过该值的数字常量时才在宿主进程内求值
+_MAX_INLINE_EXPONENT = 100
+
+
+def is_safe_expression(expression: str) -> bool:
+    """
+    表达式是否只包含算术运算和变量名
+    
+    去掉 __builtins__ 并不能隔离 eval（可经由 ().__class__.__mro__ 等属性逃逸），
+    因此只有语法树中没有属性访问、调用、下标等节点的表达式才允许在宿主进程内求值；
+    指数不是小常量的乘方同样交给隔离的工作进程，失控时不会拖垮宿主进程。
+    """
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError:
+        return False
+    for node in ast.walk(tree):
+        if not isinstance(node, _SAFE_EXPRESSION_NODES):
+            return False
+        if isinstance(node, ast.Name) and node.id.startswith("__"):
+            return False
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Pow, ast.LShift)):
+            exponent = node.right
+            if not (isinstance(exponent, ast.Constant)
+                    and type(exponent.value) in (int, float)
+                    and abs(exponent.value) <= _MAX_INLINE_EXPONENT):
+                return False
+    return True
+
+
 class VariableCalcNode(NodeBase):
     """变量计算节点"""
     
@@ -317,11 +360,19 @@ class VariableCalcNode(NodeBase):
         super().__init__(node_id, NodeType.VARIABLE_CALC, config)
         # config: {"expression": "x + y * 2", "output_var": "result"}
     
+    @property
+    def pure(self) -> bool:
+        """只有算术表达式在宿主进程内求值，其余表达式仍在隔离的虚拟环境中执行"""
+        return is_safe_expression(self.config.get("expression", "0"))
+    
     def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """执行变量计算"""
+        """执行变量计算（仅限算术表达式）"""
         expression = self.config.get("expression", "0")
         output_var = self.config.get("output_var", "result")
         
+        if not is_safe_expression(expression):
+            raise ValueError(f"表达式只能包含算术运算和变量名: {expression}")
+        
         # 使用输入数据作为计算上下文
         context = {**input_data}
         result = eval(expression, {"__builtins__": {}}, context)
@@ -452,6 +503,8 @@ class SQLiteExecuteNode(NodeBase):
 class SQLStatementNode(NodeBase):
     """SQL语句节点"""
     
+    pure = True
+    
     def __init__(self, node_id: str, config: dict = None):
         super().__init__(node_id, NodeType.SQL_STATEMENT, config)
         # config: {"sql": "SELECT * FROM users WHERE id = {user_id}", "output_var": "sql"}
@@ -4,9 +4,11 @@
 """
 import json
 import os
+import re
+import threading
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 
@@ -27,28 +29,103 @@ NODE_SOURCE_INFO = {
 }
 
 
-@dataclass
+def split_requirement(requirement: str) -> Tuple[str, str]:
+    """
+    拆分依赖声明为规范化的包名和版本约束
+    
+    例如 "Pandas >= 2.0" -> ("pandas", ">=2.0")，版本约束中的空白会被去掉
+    """
+    requirement = requirement.strip()
+    name = re.match(r"[^\s<>=!~;\[(]*", requirement).group(0)
+    specifier = re.sub(r"\s+", "", requirement[len(name):])
+    return name.lower().replace("_", "-"), specifier
+
+
+@dataclass(init=False)
 class NodeDefinition:
-    """节点定义"""
+    """
+    节点定义
+    
+    source_code 是属性而不是字段：文件型节点（设置了 source_path）在首次访问时才读取源文件，
+    生成的 __repr__/__eq__ 不包含源代码，打印或比较节点定义不会触发读取。
+    """
     node_type: str           # 节点类型标识
     name: str                # 显示名称
     description: str         # 描述
     source: NodeSource       # 来源
     category: str            # 分类
-    source_code: str         # 源代码（execute函数）
     config_schema: Dict      # 配置项定义
     modified: bool = False   # 是否被用户修改
     repo_url: str = ""       # 来源仓库URL（GitHub/内网节点）
     dependencies: List[str] = field(default_factory=list)  # pip 依赖包列表
     version: str = "1.0.0"   # 节点版本
+    source_path: str = ""    # 源代码文件，设置后 source_code 在首次访问时读取
+    _source_code: Optional[str] = field(default=None, repr=False, compare=False)
+    _source_mtime: Optional[int] = field(default=None, repr=False, compare=False)
+    
+    def __init__(self, node_type: str, name: str, description: str, source: NodeSource,
+                 category: str, source_code: str, config_schema: Dict, modified: bool = False,
+                 repo_url: str = "", dependencies: List[str] = None, version: str = "1.0.0",
+                 source_path: str = ""):
+        # 参数顺序与原先的字段顺序一致，source_code 仍可作为构造参数
+        self.node_type = node_type
+        self.name = name
+        self.description = description
+        self.source = source
+        self.category = category
+        self.config_schema = config_schema
+        self.modified = modified
+        self.repo_url = repo_url
+        self.dependencies = dependencies if dependencies is not None else []
+        self.version = version
+        self.source_path = source_path
+        # 设置了 source_path 时构造参数只是占位，首次访问 source_code 时读取文件
+        self._source_code = source_code
+        self._source_mtime = None
+    
+    @property
+    def source_code(self) -> str:
+        """源代码（execute函数）：文件型节点按需从 source_path 读取，文件修改后重新读取"""
+        if self.source_path:
+            try:
+                mtime = os.stat(self.source_path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime != self._source_mtime:
+                with open(self.source_path, 'r', encoding='utf-8') as f:
+                    self._source_code = f.read()
+                self._source_mtime = mtime
+        return self._source_code
+    
+    @source_code.setter
+    def source_code(self, value: str):
+        """设置源代码，在源文件再次修改前以该值为准"""
+        self._source_code = value
+        try:
+            self._source_mtime = os.stat(self.source_path).st_mtime_ns if self.source_path else None
+        except OSError:
+            self._source_mtime = None
 
 
 class NodeRegistry:
     """节点注册表"""
     
-    def __init__(self):
+    # 节点目录缓存的格式版本，变化时重建缓存
+    CATALOG_FORMAT = 1
+    
+    def __init__(self, user_data_dir: str = "user_data"):
         self._nodes: Dict[str, NodeDefinition] = {}
-        self._user_data_dir = Path("user_data")
+        # 二级索引：来源/分类/依赖包名 -> {节点类型: 节点定义}
+        self._by_source: Dict[NodeSource, Dict[str, NodeDefinition]] = {}
+        self._by_category: Dict[str, Dict[str, NodeDefinition]] = {}
+        self._by_dependency: Dict[str, Dict[str, NodeDefinition]] = {}
+        self._user_data_dir = Path(user_data_dir)
+        # 节点目录 -> 节点类型（自定义/外部节点），用于按目录增量更新
+        self._node_dirs: Dict[str, str] = {}
+        # 节点目录缓存：节点目录 -> {"stamp": node.json 的 [mtime_ns, size], "definition": 节点定义}
+        self._catalog_path = self._user_data_dir / "node_catalog.json"
+        self._catalog: Dict[str, dict] = {}
+        self._version = 0
         self._load_official_nodes()
         self._load_external_nodes()
     
@@ -203,69 +280,288 @@ class NodeRegistry:
         ]
         
         for node in official_nodes:
-            self._nodes[node.node_type] = node
+            self._add_node(node)
     
-    def _load_external_nodes(self):
-        """加载外部和下载的节点"""
-        # 加载自定义节点
+    def _iter_node_dirs(self):
+        """遍历所有自定义节点和外部下载节点 (GitHub/Enterprise) 的目录"""
         from src.core.custom_node_manager import CustomNodeManager
         manager = CustomNodeManager(self._user_data_dir)
-        custom_nodes = manager.load_all_custom_nodes()
-        for node in custom_nodes:
-            self._nodes[node.node_type] = node
-            
-        # 加载外部下载的节点 (GitHub/Enterprise)
+        for node_dir in manager.custom_nodes_dir.iterdir():
+            if node_dir.is_dir():
+                yield node_dir
+        
         external_dir = self._user_data_dir / "external_nodes"
         if not external_dir.exists():
             return
-            
-        # 遍历外部节点目录
         for source_dir in external_dir.iterdir():
             if not source_dir.is_dir(): continue
             for node_dir in source_dir.iterdir():
-                if not node_dir.is_dir(): continue
-                
-                config_file = node_dir / "node.json"
-                if config_file.exists():
-                    try:
-                        with open(config_file, 'r', encoding='utf-8') as f:
-                            config = json.load(f)
-                            # 从配置文件创建 NodeDefinition
-                            node_def = NodeDefinition(
-                                node_type=config.get("node_type", node_dir.name),
-                                name=config.get("name", node_dir.name),
-                                description=config.get("description", ""),
-                                source=NodeSource(source_dir.name),
-                                category=config.get("category", "外部"),
-                                source_code="", # 将在运行时按需加载或通过 read_file
-                                config_schema=config.get("config_schema", {}),
-                                repo_url=config.get("repo_url", ""),
-                                dependencies=config.get("dependencies", []),
-                                version=config.get("version", "1.0.0")
-                            )
-                            # 读取源代码
-                            entry_file = node_dir / config.get("entry_file", "node.py")
-                            if entry_file.exists():
-                                with open(entry_file, 'r', encoding='utf-8') as sf:
-                                    node_def.source_code = sf.read()
-                                    
-                            self._nodes[node_def.node_type] = node_def
-                    except Exception as e:
-                        print(f"加载外部节点失败 {node_dir}: {e}")
+                if node_dir.is_dir():
+                    yield node_dir
+    
+    def _load_external_nodes(self):
+        """加载外部和下载的节点，node.json 未变化的目录直接使用目录缓存"""
+        cached = self._read_catalog()
+        dirty = False
+        
+        for node_dir in self._iter_node_dirs():
+            key = str(node_dir)
+            stamp = self._node_dir_stamp(node_dir)
+            entry = cached.get(key)
+            if entry is not None and entry.get("stamp") == stamp:
+                definition = entry.get("definition")
+                node_def = self._definition_from_dict(definition) if definition else None
+                self._catalog[key] = entry
+            else:
+                node_def = self._read_node_dir(node_dir)
+                self._update_catalog(node_dir, stamp, node_def)
+                dirty = True
+            
+            if node_def is not None:
+                self._add_node(node_def)
+                self._node_dirs[key] = node_def.node_type
+        
+        # 有目录新增、修改或删除时重写目录缓存
+        if dirty or cached.keys() != self._catalog.keys():
+            self._save_catalog()
+    
+    def _read_node_dir(self, node_dir: Path) -> Optional[NodeDefinition]:
+        """解析节点目录下的 node.json"""
+        if node_dir.parent.name == "custom_nodes":
+            from src.core.custom_node_manager import CustomNodeManager
+            manager = CustomNodeManager(self._user_data_dir)
+            return manager._load_node_from_dir(node_dir)
+        return self._load_external_node(node_dir)
+    
+    def _load_node_dir(self, node_dir: Path) -> Optional[str]:
+        """
+        从节点目录加载单个自定义/外部节点并注册，同时更新目录缓存
+        
+        Returns:
+            注册的节点类型，加载失败时返回 None
+        """
+        node_def = self._read_node_dir(node_dir)
+        self._update_catalog(node_dir, self._node_dir_stamp(node_dir), node_def)
+        
+        if node_def is None:
+            return None
+        self._add_node(node_def)
+        self._node_dirs[str(node_dir)] = node_def.node_type
+        return node_def.node_type
+    
+    def _load_external_node(self, node_dir: Path) -> Optional[NodeDefinition]:
+        """从 external_nodes/<来源>/<节点> 目录加载外部节点定义"""
+        config_file = node_dir / "node.json"
+        if not config_file.exists():
+            return None
+        
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+                # 从配置文件创建 NodeDefinition
+                node_def = NodeDefinition(
+                    node_type=config.get("node_type", node_dir.name),
+                    name=config.get("name", node_dir.name),
+                    description=config.get("description", ""),
+                    source=NodeSource(node_dir.parent.name),
+                    category=config.get("category", "外部"),
+                    source_code="",
+                    config_schema=config.get("config_schema", {}),
+                    repo_url=config.get("repo_url", ""),
+                    dependencies=config.get("dependencies", []),
+                    version=config.get("version", "1.0.0"),
+                    # 源代码在首次使用时读取
+                    source_path=str(node_dir / config.get("entry_file", "node.py"))
+                )
+            return node_def
+        except Exception as e:
+            print(f"加载外部节点失败 {node_dir}: {e}")
+            return None
+    
+    def reload_node_dir(self, node_dir: Path) -> List[str]:
+        """
+        重新加载单个节点目录（目录被删除时注销对应节点）
+        
+        Returns:
+            发生变化的节点类型列表
+        """
+        changed = []
+        old_type = self._node_dirs.pop(str(node_dir), None)
+        if old_type:
+            self._remove_node(old_type)
+            changed.append(old_type)
+        
+        if node_dir.is_dir():
+            new_type = self._load_node_dir(node_dir)
+        else:
+            new_type = None
+            self._catalog.pop(str(node_dir), None)
+        if new_type and new_type not in changed:
+            changed.append(new_type)
+        
+        self._save_catalog()
+        if changed:
+            self._version += 1
+        return changed
+    
+    # === 节点目录缓存 ===
+    
+    @staticmethod
+    def _node_dir_stamp(node_dir: Path) -> Optional[List[int]]:
+        """node.json 的 [mtime_ns, size]，不存在时为 None"""
+        try:
+            stat = os.stat(node_dir / "node.json")
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    @staticmethod
+    def _definition_to_dict(node_def: NodeDefinition) -> dict:
+        """序列化节点定义（源代码按需从 source_path 读取，不写入缓存）"""
+        return {
+            "node_type": node_def.node_type,
+            "name": node_def.name,
+            "description": node_def.description,
+            "source": node_def.source.value,
+            "category": node_def.category,
+            "config_schema": node_def.config_schema,
+            "repo_url": node_def.repo_url,
+            "dependencies": node_def.dependencies,
+            "version": node_def.version,
+            "source_path": node_def.source_path,
+        }
+    
+    @staticmethod
+    def _definition_from_dict(data: dict) -> NodeDefinition:
+        """从目录缓存还原节点定义"""
+        return NodeDefinition(
+            node_type=data["node_type"],
+            name=data["name"],
+            description=data["description"],
+            source=NodeSource(data["source"]),
+            category=data["category"],
+            source_code="",
+            config_schema=data["config_schema"],
+            repo_url=data["repo_url"],
+            dependencies=data["dependencies"],
+            version=data["version"],
+            source_path=data["source_path"]
+        )
+    
+    def _update_catalog(self, node_dir: Path, stamp, node_def: Optional[NodeDefinition]):
+        """记录节点目录的解析结果（解析失败也记录，避免每次启动重复解析）"""
+        if stamp is None:
+            self._catalog.pop(str(node_dir), None)
+            return
+        self._catalog[str(node_dir)] = {
+            "stamp": stamp,
+            "definition": self._definition_to_dict(node_def) if node_def else None,
+        }
+    
+    def _read_catalog(self) -> Dict[str, dict]:
+        """读取目录缓存，格式不匹配或损坏时返回空缓存"""
+        try:
+            with open(self._catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("format") == self.CATALOG_FORMAT:
+                return data["dirs"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+    
+    def _save_catalog(self):
+        """写入目录缓存"""
+        tmp_path = self._catalog_path.with_name(self._catalog_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"format": self.CATALOG_FORMAT, "dirs": self._catalog}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._catalog_path)
+        except OSError as e:
+            print(f"写入节点目录缓存失败: {e}")
+    
+    @property
+    def version(self) -> int:
+        """注册表版本号，节点增删改时递增，界面可据此判断是否需要刷新"""
+        return self._version
+    
+    def apply_file_events(self, events) -> List[str]:
+        """
+        根据 user_data 目录的文件变化事件增量更新注册表
+        
+        Args:
+            events: FileEvent 列表（见 src.core.file_watcher）
+        
+        Returns:
+            发生变化的节点类型列表
+        """
+        # 自定义节点位于 custom_nodes/<节点>，外部节点位于 external_nodes/<来源>/<节点>
+        node_dirs = set()
+        for event in events:
+            path = Path(event.path)
+            for base, depth in ((self._user_data_dir / "custom_nodes", 1),
+                                (self._user_data_dir / "external_nodes", 2)):
+                try:
+                    parts = path.relative_to(base).parts
+                except ValueError:
+                    continue
+                if len(parts) > depth:
+                    node_dirs.add(base.joinpath(*parts[:depth]))
+        
+        changed = []
+        for node_dir in sorted(node_dirs):
+            changed.extend(self.reload_node_dir(node_dir))
+        return changed
 
     def register_external_node(self, node_def: NodeDefinition) -> bool:
         """注册外部节点"""
-        self._nodes[node_def.node_type] = node_def
+        self._add_node(node_def)
+        self._version += 1
         return True
 
     def unregister_node(self, node_type: str) -> bool:
         """注销节点"""
-        if node_type in self._nodes:
-            del self._nodes[node_type]
+        if self._remove_node(node_type):
+            self._version += 1
             return True
         return False
     
-
+    # === 索引维护 ===
+    
+    @staticmethod
+    def _normalize_key(node_type) -> str:
+        """把节点类型（NodeType 枚举或字符串）统一为字符串键"""
+        return node_type.value if isinstance(node_type, Enum) else str(node_type)
+    
+    @staticmethod
+    def _dependency_name(requirement: str) -> str:
+        """从依赖声明（如 "requests>=2.0"）中提取规范化的包名"""
+        return split_requirement(requirement)[0]
+    
+    def _add_node(self, node_def: NodeDefinition):
+        """注册节点并更新二级索引（同类型的旧节点会被替换）"""
+        key = self._normalize_key(node_def.node_type)
+        self._remove_node(key)
+        self._nodes[key] = node_def
+        self._by_source.setdefault(node_def.source, {})[key] = node_def
+        self._by_category.setdefault(node_def.category, {})[key] = node_def
+        for requirement in node_def.dependencies:
+            self._by_dependency.setdefault(self._dependency_name(requirement), {})[key] = node_def
+    
+    def _remove_node(self, node_type) -> Optional[NodeDefinition]:
+        """移除节点并更新二级索引"""
+        key = self._normalize_key(node_type)
+        node_def = self._nodes.pop(key, None)
+        if node_def is None:
+            return None
+        buckets = [(self._by_source, node_def.source), (self._by_category, node_def.category)]
+        buckets += [(self._by_dependency, self._dependency_name(r)) for r in node_def.dependencies]
+        for index, index_key in buckets:
+            bucket = index.get(index_key)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[index_key]
+        return node_def
     
     # === 查询方法 ===
     
@@ -278,26 +574,23 @@ class NodeRegistry:
     
     def get_node(self, node_type) -> Optional[NodeDefinition]:
         """获取指定节点 (支持枚举 or 字符串)"""
-        # 直接尝试获取
-        node = self._nodes.get(node_type)
-        if node:
-            return node
-            
-        # 如果是字符串，尝试匹配枚举键
-        if isinstance(node_type, str):
-            for key, val in self._nodes.items():
-                if hasattr(key, 'value') and key.value == node_type:
-                    return val
-        
-        # 如果是枚举，尝试直接用其值字符串匹配
-        if hasattr(node_type, 'value'):
-            return self._nodes.get(node_type.value)
-            
-        return None
+        return self._nodes.get(self._normalize_key(node_type))
     
     def get_nodes_by_source(self, source: NodeSource) -> List[NodeDefinition]:
         """按来源获取节点"""
-        return [n for n in self._nodes.values() if n.source == source]
+        return list(self._by_source.get(source, {}).values())
+    
+    def get_nodes_by_category(self, category: str) -> List[NodeDefinition]:
+        """按分类获取节点"""
+        return list(self._by_category.get(category, {}).values())
+    
+    def get_nodes_by_dependency(self, package: str) -> List[NodeDefinition]:
+        """获取声明了指定 pip 依赖包的节点（忽略版本约束和大小写）"""
+        return list(self._by_dependency.get(self._dependency_name(package), {}).values())
+    
+    def get_dependency_names(self) -> List[str]:
+        """获取所有节点声明过的 pip 依赖包名（规范化，已排序）"""
+        return sorted(self._by_dependency)
     
     def _node_to_dict(self, node: NodeDefinition) -> dict:
         """将NodeDefinition转换为字典"""
@@ -334,12 +627,13 @@ class NodeRegistry:
     
     def save_modified_source(self, node_type: str, source_code: str) -> bool:
         """保存修改后的源代码"""
-        node = self._nodes.get(node_type)
+        node = self.get_node(node_type)
         if not node:
             return False
         
         # 更新内存中的源代码
         node.source_code = source_code
+        self._version += 1
         
         if node.source == NodeSource.CUSTOM:
             # 自定义节点：直接保存到其目录
@@ -361,7 +655,7 @@ class NodeRegistry:
     def reset_to_original(self, node_type: str) -> bool:
         """重置为原始源代码"""
         # 简单实现，删除修改文件
-        node = self._nodes.get(node_type)
+        node = self.get_node(node_type)
         if not node:
             return False
         
@@ -370,12 +664,13 @@ class NodeRegistry:
             modified_file.unlink()
         
         node.modified = False
+        self._version += 1
         # 重新加载原始代码（这里简化处理，实际需要重新加载）
         return True
     
     def is_modified(self, node_type: str) -> bool:
         """检查节点是否被修改"""
-        node = self._nodes.get(node_type)
+        node = self.get_node(node_type)
         return node.modified if node else False
     
     def get_node_info(self, node_type) -> dict:
@@ -397,10 +692,21 @@ class NodeRegistry:
 
 # 全局单例
 _registry_instance = None
+_registry_lock = threading.Lock()
 
 def get_registry() -> NodeRegistry:
     """获取全局节点注册表实例"""
     global _registry_instance
     if _registry_instance is None:
-        _registry_instance = NodeRegistry()
+        # 后台预加载与界面线程可能同时调用
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = NodeRegistry()
     return _registry_instance
+
+
+def preload_registry() -> threading.Thread:
+    """在后台线程中创建全局注册表（读取各节点目录的 node.json），不阻塞调用方"""
+    thread = threading.Thread(target=get_registry, name="node-registry-preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,107 @@
+"""
+节点搜索索引
+对节点名称、分类和描述建立 n-gram 倒排索引，搜索时只需查表而无需逐个比较字符串
+
+中文文本没有空格分词，因此以 1~3 个字符的 n-gram 为索引项：
+长度不超过 3 的查询直接命中对应的倒排表，更长的查询对其所有 3-gram 的倒排表
+求交集后再确认子串匹配。匹配语义与逐个节点做子串比较一致。
+"""
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class NodeSearchIndex:
+    """节点元数据的倒排索引"""
+    
+    # 参与搜索的字段及其权重
+    FIELD_WEIGHTS = {
+        "name": 3,
+        "category": 2,
+        "description": 1,
+    }
+    
+    MAX_GRAM = 3
+    
+    def __init__(self, nodes: Iterable[dict] = ()):
+        """
+        Args:
+            nodes: 节点字典列表（NodeRegistry.get_all_nodes() 的格式）
+        """
+        self._texts: List[Dict[str, str]] = []
+        # n-gram -> 包含该片段的节点序号
+        self._postings: Dict[str, Set[int]] = {}
+        self.build(nodes)
+    
+    def build(self, nodes: Iterable[dict]):
+        """重建索引，节点序号即其在 nodes 中的位置"""
+        self._texts = []
+        self._postings = {}
+        for position, node in enumerate(nodes):
+            texts = {field: str(node.get(field) or "").lower() for field in self.FIELD_WEIGHTS}
+            self._texts.append(texts)
+            for text in texts.values():
+                for gram in self._grams(text):
+                    self._postings.setdefault(gram, set()).add(position)
+    
+    def _grams(self, text: str) -> Set[str]:
+        """文本中所有长度 1~MAX_GRAM 的片段"""
+        grams = set()
+        for size in range(1, self.MAX_GRAM + 1):
+            for start in range(len(text) - size + 1):
+                grams.add(text[start:start + size])
+        return grams
+    
+    def _candidates(self, term: str) -> Set[int]:
+        """可能包含 term 的节点（长查询需要再确认子串匹配）"""
+        if len(term) <= self.MAX_GRAM:
+            return self._postings.get(term, set())
+        
+        grams = [term[i:i + self.MAX_GRAM] for i in range(len(term) - self.MAX_GRAM + 1)]
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+    
+    def _score(self, position: int, term: str) -> int:
+        """term 在节点各字段中的得分，0 表示不匹配"""
+        score = 0
+        for field, text in self._texts[position].items():
+            if term not in text:
+                continue
+            weight = self.FIELD_WEIGHTS[field]
+            score += weight
+            if text == term:
+                score += weight * 2
+            elif text.startswith(term):
+                score += weight
+        return score
+    
+    def search(self, query: str) -> Optional[Dict[int, int]]:
+        """
+        搜索节点
+        
+        查询按空白拆分为多个词，节点需包含所有词。
+        
+        Returns:
+            {节点序号: 得分}，得分越高越相关；查询为空时返回 None 表示不过滤
+        """
+        terms = query.lower().split()
+        if not terms:
+            return None
+        
+        scores: Dict[int, int] = {}
+        for i, term in enumerate(terms):
+            candidates = self._candidates(term)
+            if i > 0:
+                candidates = candidates & scores.keys()
+            term_scores = {}
+            for position in candidates:
+                score = self._score(position, term)
+                if score:
+                    term_scores[position] = scores.get(position, 0) + score
+            scores = term_scores
+            if not scores:
+                break
+        return scores
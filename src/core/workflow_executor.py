@@ -2,15 +2,20 @@
 工作流执行引擎
 负责工作流的执行、节点调度、数据传递
 """
+import hashlib
 import json
 import pickle
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, TextIO
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 import time
 
 from .node_base import NodeBase, NodeType
 from .uv_manager import UVManager
+from . import workflow_metadata
 
 
 class WorkflowExecutor:
@@ -30,6 +35,8 @@ class WorkflowExecutor:
         self.edges: List[tuple] = []  # (from_node_id, to_node_id)
         self.execution_order: List[str] = []
         self.context: Dict[str, Any] = {}  # 执行上下文
+        self._script_paths: Dict[str, str] = {}  # 已生成的节点脚本 {node_id: script_path}
+        self.workflow_path: Optional[str] = None  # 最近保存/加载的 workflow.json，用于记录运行状态
     
     def add_node(self, node: NodeBase):
         """添加节点"""
@@ -156,9 +163,46 @@ class WorkflowExecutor:
         
         return result
     
-    def generate_scripts(self) -> Dict[str, str]:
+    def _build_execution_groups(self) -> List[List[str]]:
         """
-        为所有节点生成Python脚本
+        将执行顺序划分为执行组
+        
+        相邻且构成线性链（前驱只有一个后继、后继只有一个前驱）的Worker节点
+        合并为一组，由Worker在一次调用中依次执行；其余节点各自成组。
+        
+        Returns:
+            按执行顺序排列的节点ID分组
+        """
+        successors = defaultdict(set)
+        predecessors = defaultdict(set)
+        for from_id, to_id in self.edges:
+            successors[from_id].add(to_id)
+            predecessors[to_id].add(from_id)
+        
+        groups: List[List[str]] = []
+        for node_id in self.execution_order:
+            if groups and not self.is_in_process(node_id):
+                prev_id = groups[-1][-1]
+                if (not self.is_in_process(prev_id)
+                        and successors[prev_id] == {node_id}
+                        and predecessors[node_id] == {prev_id}):
+                    groups[-1].append(node_id)
+                    continue
+            groups.append([node_id])
+        
+        return groups
+    
+    def is_in_process(self, node_id: str) -> bool:
+        """节点是否可以在宿主进程内直接执行（无需生成脚本和Worker）"""
+        node = self.nodes.get(node_id)
+        return bool(node is not None and getattr(node, "pure", False))
+    
+    def generate_scripts(self, node_ids: List[str] = None) -> Dict[str, str]:
+        """
+        为节点生成Python脚本
+        
+        Args:
+            node_ids: 需要生成脚本的节点ID列表，默认为所有节点
         
         Returns:
             节点ID到脚本路径的映射
@@ -167,17 +211,23 @@ class WorkflowExecutor:
         scripts_dir = workflow_dir / "scripts"
         scripts_dir.mkdir(exist_ok=True)
         
+        if node_ids is None:
+            node_ids = list(self.nodes.keys())
+        
         script_paths = {}
-        for node_id, node in self.nodes.items():
-            script_path = node.generate_script(str(scripts_dir))
+        for node_id in node_ids:
+            script_path = self.nodes[node_id].generate_script(str(scripts_dir))
             script_paths[node_id] = script_path
         
+        self._script_paths.update(script_paths)
         return script_paths
     
     def execute_node(self, node_id: str, input_data: Dict[str, Any] = None, worker_process = None) -> Dict[str, Any]:
         """
         执行单个节点
         
+        纯节点直接在当前进程调用 execute()，其余节点通过Worker或子进程执行脚本。
+        
         Args:
             node_id: 节点ID
             input_data: 输入数据
@@ -190,15 +240,20 @@ class WorkflowExecutor:
             raise ValueError(f"节点不存在: {node_id}")
         
         node = self.nodes[node_id]
+        node_type_str = node.node_type.value if hasattr(node.node_type, "value") else str(node.node_type)
         
-        # 生成脚本
-        workflow_dir = self.uv_manager.get_workflow_dir(self.workflow_name)
-        scripts_dir = workflow_dir / "scripts"
-        scripts_dir.mkdir(exist_ok=True)
+        print(f"执行节点: {node_id} ({node_type_str})")
         
-        script_path = node.generate_script(str(scripts_dir))
+        if self.is_in_process(node_id):
+            try:
+                return node.execute(input_data or {}) or {}
+            except Exception as e:
+                raise RuntimeError(f"节点执行失败: {e}") from e
         
-        print(f"执行节点: {node_id} ({node.node_type.value})")
+        # 复用 execute() 中已生成的脚本，单独调用时才重新生成
+        script_path = self._script_paths.get(node_id)
+        if not script_path or not Path(script_path).exists():
+            script_path = self.generate_scripts([node_id])[node_id]
         
         # 如果有Worker进程，优先使用Worker
         if worker_process:
@@ -221,71 +276,255 @@ class WorkflowExecutor:
         
         return result["data"] or {}
     
-    def execute(self, initial_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    def execute_chain(self, node_ids: List[str], input_data: Dict[str, Any], worker_process) -> Dict[str, Any]:
         """
-        执行整个工作流
+        在Worker中一次性执行一条线性节点链
         
         Args:
-            initial_data: 初始输入数据
+            node_ids: 按执行顺序排列的节点ID列表
+            input_data: 链首节点的输入数据
+            worker_process: Worker进程对象
         
         Returns:
-            最终输出数据
+            链中所有节点输出合并后的数据
         """
-        # 确定执行顺序
-        self.execution_order = self._topological_sort()
-        print(f"执行顺序: {self.execution_order}")
+        steps = []
+        for node_id in node_ids:
+            script_path = self._script_paths.get(node_id)
+            if not script_path or not Path(script_path).exists():
+                script_path = self.generate_scripts([node_id])[node_id]
+            steps.append({"node_id": node_id, "script_path": script_path})
+        
+        print(f"执行节点链: {' -> '.join(node_ids)}")
+        
+        command = {
+            "type": "run_chain",
+            "steps": steps,
+            "input_data": input_data or {}
+        }
+        result = self.uv_manager.send_command_to_worker(worker_process, command)
         
-        # 初始化上下文
-        self.context = initial_data or {}
+        if not result["success"]:
+            failed_id = result.get("node_id")
+            if failed_id:
+                raise RuntimeError(f"节点 {failed_id} 执行失败: {result['error']}")
+            raise RuntimeError(f"节点执行失败: {result['error']}")
         
-        # 生成所有脚本
-        script_paths = self.generate_scripts()
-        print(f"已生成 {len(script_paths)} 个节点脚本")
+        return result.get("data") or {}
+    
+    def _run_groups(self, groups: List[List[str]], context: Dict[str, Any], worker_process) -> Dict[str, Any]:
+        """
+        按执行组顺序执行节点，线性链在Worker中一次执行
         
-        # 启动Worker进程
-        worker_process = None
-        try:
-            print("正在启动工作流执行引擎...")
-            worker_process = self.uv_manager.start_worker(self.workflow_name)
-            if worker_process:
-                print("工作流执行引擎启动成功")
-            else:
-                print("工作流执行引擎启动失败，将使用传统模式执行")
-                
-            # 按顺序执行节点
-            for node_id in self.execution_order:
-                node = self.nodes[node_id]
-                
+        Args:
+            groups: _build_execution_groups() 的结果
+            context: 执行上下文（原地更新）
+            worker_process: Worker进程对象，可为None
+        
+        Returns:
+            更新后的执行上下文
+        """
+        for group in groups:
+            if worker_process and len(group) > 1:
+                try:
+                    output_data = self.execute_chain(group, context.copy(), worker_process)
+                    context.update(output_data)
+                    print(f"节点链 {group[0]} -> {group[-1]} 执行成功")
+                except Exception as e:
+                    print(f"节点链 {group[0]} -> {group[-1]} 执行失败: {e}")
+                    raise
+                continue
+            
+            for node_id in group:
                 # 收集输入数据
-                input_data = self.context.copy()
+                input_data = context.copy()
                 
                 # 执行节点
                 try:
                     output_data = self.execute_node(node_id, input_data, worker_process)
                     
                     # 更新上下文
-                    self.context.update(output_data)
+                    context.update(output_data)
                     
                     print(f"节点 {node_id} 执行成功")
                     
                 except Exception as e:
                     print(f"节点 {node_id} 执行失败: {e}")
                     raise
+        
+        return context
+    
+    def _prepare_execution(self) -> List[str]:
+        """
+        确定执行顺序并为Worker节点生成脚本
+        
+        Returns:
+            需要在Worker中执行的节点ID列表
+        """
+        # 确定执行顺序
+        self.execution_order = self._topological_sort()
+        print(f"执行顺序: {self.execution_order}")
+        
+        # 只为需要在虚拟环境中运行的节点生成脚本
+        self._script_paths.clear()
+        worker_node_ids = [n for n in self.execution_order if not self.is_in_process(n)]
+        script_paths = self.generate_scripts(worker_node_ids)
+        print(f"已生成 {len(script_paths)} 个节点脚本，"
+              f"{len(self.execution_order) - len(worker_node_ids)} 个节点将在进程内执行")
+        
+        return worker_node_ids
+    
+    def _stop_worker(self, worker_process):
+        """关闭Worker进程"""
+        try:
+            # 发送退出命令
+            self.uv_manager.send_command_to_worker(worker_process, {"type": "exit"}, timeout=2)
+            worker_process.terminate()
+            worker_process.wait(timeout=2)
+        except:
+            if worker_process.poll() is None:
+                worker_process.kill()
+        print("工作流执行引擎已关闭")
+    
+    def execute(self, initial_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        执行整个工作流
+        
+        Args:
+            initial_data: 初始输入数据
+        
+        Returns:
+            最终输出数据
+        """
+        worker_node_ids = self._prepare_execution()
+        
+        # 初始化上下文
+        self.context = initial_data or {}
+        
+        # 启动Worker进程（全部为纯节点时无需启动）
+        worker_process = None
+        start_time = time.perf_counter()
+        try:
+            if worker_node_ids:
+                print("正在启动工作流执行引擎...")
+                worker_process = self.uv_manager.start_worker(self.workflow_name)
+                if worker_process:
+                    print("工作流执行引擎启动成功")
+                else:
+                    print("工作流执行引擎启动失败，将使用传统模式执行")
+            
+            self._run_groups(self._build_execution_groups(), self.context, worker_process)
+        except Exception as e:
+            self._record_run(False, time.perf_counter() - start_time, str(e))
+            raise
         finally:
             # 清理Worker进程
             if worker_process:
-                try:
-                    # 发送退出命令
-                    self.uv_manager.send_command_to_worker(worker_process, {"type": "exit"}, timeout=2)
-                    worker_process.terminate()
-                    worker_process.wait(timeout=2)
-                except:
-                    if worker_process.poll() is None:
-                        worker_process.kill()
-                print("工作流执行引擎已关闭")
+                self._stop_worker(worker_process)
         
+        self._record_run(True, time.perf_counter() - start_time)
         return self.context
     
+    def _record_run(self, success: bool, duration: float, error: str = None, batch: Dict[str, int] = None):
+        """把运行状态写入工作流元数据（工作流尚未保存时跳过）"""
+        if self.workflow_path:
+            workflow_metadata.record_run(self.workflow_path, success, duration, error, batch)
+    
+    def execute_batch(self, inputs: Iterable[Dict[str, Any]], max_workers: int = 4,
+                      stream: TextIO = None) -> Iterator[Dict[str, Any]]:
+        """
+        使用同一工作流批量处理多组输入
+        
+        脚本只生成一次，Worker进程在各条目之间复用（最多 max_workers 个），
+        条目并发执行，结果按完成顺序逐条产出。输入按需读取，可以是生成器。
+        
+        Args:
+            inputs: 初始上下文的可迭代对象
+            max_workers: 最大并发条目数（同时也是Worker进程数上限）
+            stream: 可选的文本流，每条结果会以一行JSON写入
+        
+        Returns:
+            结果迭代器，每项为 {index, success, result, error, duration}
+        
+        整批结束后在工作流元数据中记录一次运行汇总（成功、失败条目数）。
+        """
+        max_workers = max(1, max_workers)
+        start_time = time.perf_counter()
+        counts = {"succeeded": 0, "failed": 0}
+        worker_node_ids = self._prepare_execution()
+        groups = self._build_execution_groups()
+        
+        idle_workers = queue.Queue()
+        started_workers = []
+        pool_lock = threading.Lock()
+        
+        def acquire_worker():
+            if not worker_node_ids:
+                return None
+            try:
+                return idle_workers.get_nowait()
+            except queue.Empty:
+                pass
+            with pool_lock:
+                if len(started_workers) < max_workers:
+                    worker = self.uv_manager.start_worker(self.workflow_name)
+                    started_workers.append(worker)
+                    return worker
+            return idle_workers.get()
+        
+        def release_worker(worker):
+            if not worker_node_ids:
+                return
+            if worker is not None and worker.poll() is not None:
+                # Worker已退出，下次按需重新启动
+                with pool_lock:
+                    started_workers.remove(worker)
+                return
+            idle_workers.put(worker)
+        
+        def run_item(index: int, initial_data: Dict[str, Any]) -> Dict[str, Any]:
+            start_time = time.perf_counter()
+            item = {"index": index, "success": False, "result": None, "error": None}
+            worker = acquire_worker()
+            try:
+                item["result"] = self._run_groups(groups, dict(initial_data or {}), worker)
+                item["success"] = True
+            except Exception as e:
+                item["error"] = str(e)
+            finally:
+                release_worker(worker)
+            item["duration"] = round(time.perf_counter() - start_time, 6)
+            return item
+        
+        def emit(item: Dict[str, Any]) -> Dict[str, Any]:
+            counts["succeeded" if item["success"] else "failed"] += 1
+            if stream is not None:
+                stream.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+                stream.flush()
+            return item
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                pending = set()
+                for index, initial_data in enumerate(inputs):
+                    pending.add(pool.submit(run_item, index, initial_data))
+                    # 限制在途条目数量，避免一次性读入全部输入
+                    if len(pending) >= max_workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield emit(future.result())
+                
+                for future in as_completed(pending):
+                    yield emit(future.result())
+        finally:
+            for worker in started_workers:
+                if worker:
+                    self._stop_worker(worker)
+            if counts["succeeded"] or counts["failed"]:
+                failed = counts["failed"]
+                self._record_run(not failed, time.perf_counter() - start_time,
+                                 f"{failed} 个条目执行失败" if failed else None, dict(counts))
+    
     def save_workflow(self, file_path: str, node_positions: dict = None):
         """保存工作流到文件
         
@@ -307,8 +546,13 @@ class WorkflowExecutor:
                 node_dict["position"] = node_positions[node.node_id]
             workflow_data["nodes"].append(node_dict)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(workflow_data, f, ensure_ascii=False, indent=2)
+        content = json.dumps(workflow_data, ensure_ascii=False, indent=2).encode('utf-8')
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        
+        # 同步维护紧凑的元数据文件，供列表和统计使用
+        workflow_metadata.write_metadata(file_path, workflow_data, hashlib.sha1(content).hexdigest())
+        self.workflow_path = file_path
     
     @classmethod
     def load_workflow(cls, file_path: str, uv_manager: UVManager = None) -> 'WorkflowExecutor':
@@ -327,6 +571,7 @@ class WorkflowExecutor:
         for from_id, to_id in workflow_data["edges"]:
             executor.add_edge(from_id, to_id)
         
+        executor.workflow_path = file_path
         return executor
     
     def get_execution_stats(self) -> dict:
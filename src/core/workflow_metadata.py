@@ -0,0 +1,199 @@
+"""
+工作流元数据
+在 workflow.json 旁维护一个紧凑的 workflow.meta.json，列表和统计只需读取它，
+无需解析包含全部节点配置和位置的完整工作流文件。
+
+元数据中记录了生成时 workflow.json 的 mtime/size，二者不一致（如手动编辑）
+时视为过期，会重新解析工作流并重写元数据。
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+META_FILENAME = "workflow.meta.json"
+
+# 元数据格式版本，变化时旧文件视为过期
+META_VERSION = 2
+
+
+def get_metadata_path(workflow_path: str) -> Path:
+    """获取工作流对应的元数据文件路径"""
+    return Path(workflow_path).parent / META_FILENAME
+
+
+def dependency_fingerprint(dependencies) -> str:
+    """计算依赖列表的指纹（与顺序、重复无关）"""
+    normalized = "\n".join(sorted(set(dependencies or [])))
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def build_metadata(workflow_data: dict, workflow_hash: str) -> Dict[str, Any]:
+    """
+    从完整的工作流数据构建元数据
+    
+    Args:
+        workflow_data: workflow.json 的内容
+        workflow_hash: workflow.json 内容的 sha1
+    
+    Returns:
+        元数据字典（不含文件状态和运行状态）。只记录各节点类型的数量，
+        节点ID由工作流扫描器的索引提供
+    """
+    node_types: Dict[str, int] = {}
+    for node in workflow_data.get("nodes", []):
+        node_type = node.get("node_type", "")
+        if node_type and node.get("node_id"):
+            node_types[node_type] = node_types.get(node_type, 0) + 1
+    
+    return {
+        "version": META_VERSION,
+        "workflow_name": workflow_data.get("workflow_name"),
+        "node_count": len(workflow_data.get("nodes", [])),
+        "node_types": node_types,
+        "dependency_fingerprint": dependency_fingerprint(workflow_data.get("dependencies")),
+        "workflow_hash": workflow_hash,
+    }
+
+
+def _write_json_atomic(path: Path, data: dict) -> bool:
+    """
+    原子地写入 JSON 文件，失败时返回 False
+    
+    每次写入使用唯一的临时文件，多个线程（后台加载、扫描、保存、运行记录）
+    同时写入时不会互相覆盖或替换成未写完的文件。
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"写入工作流元数据失败: {path} - {e}")
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return False
+
+
+def _read_sidecar(workflow_path: str) -> Optional[dict]:
+    """读取元数据文件（不检查是否过期）"""
+    try:
+        with open(get_metadata_path(workflow_path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_metadata(workflow_path: str, workflow_data: dict, workflow_hash: str) -> Optional[dict]:
+    """
+    为刚写入的 workflow.json 生成元数据文件，保留已有的运行状态
+    
+    Returns:
+        写入的元数据，工作流文件不存在时返回 None
+    """
+    try:
+        stat = os.stat(workflow_path)
+    except OSError:
+        return None
+    
+    metadata = build_metadata(workflow_data, workflow_hash)
+    metadata["modified"] = stat.st_mtime
+    metadata["workflow_mtime_ns"] = stat.st_mtime_ns
+    metadata["workflow_size"] = stat.st_size
+    
+    previous = _read_sidecar(workflow_path)
+    metadata["last_run"] = previous.get("last_run") if previous else None
+    
+    _write_json_atomic(get_metadata_path(workflow_path), metadata)
+    return metadata
+
+
+def read_metadata(workflow_path: str) -> Optional[dict]:
+    """
+    读取元数据，只读取元数据文件
+    
+    Returns:
+        元数据；不存在、已损坏或已过期时返回 None
+    """
+    metadata = _read_sidecar(workflow_path)
+    if not metadata or metadata.get("version") != META_VERSION:
+        return None
+    
+    try:
+        stat = os.stat(workflow_path)
+    except OSError:
+        return None
+    if (metadata.get("workflow_mtime_ns") != stat.st_mtime_ns or
+            metadata.get("workflow_size") != stat.st_size):
+        return None
+    return metadata
+
+
+def load_metadata(workflow_path: str) -> Optional[dict]:
+    """
+    获取工作流元数据，元数据缺失或过期时解析 workflow.json 并重新生成
+    
+    Returns:
+        元数据；工作流文件无效时返回 None
+    """
+    metadata = read_metadata(workflow_path)
+    if metadata is not None:
+        return metadata
+    
+    workflow = read_workflow(workflow_path)
+    if workflow is None:
+        return None
+    return write_metadata(workflow_path, *workflow)
+
+
+def read_workflow(workflow_path: str) -> Optional[Tuple[dict, str]]:
+    """
+    解析完整的 workflow.json
+    
+    Returns:
+        (工作流数据, 内容的 sha1)；文件无效时返回 None
+    """
+    try:
+        with open(workflow_path, 'rb') as f:
+            content = f.read()
+        workflow_data = json.loads(content.decode('utf-8'))
+    except (OSError, ValueError) as e:
+        print(f"读取工作流失败: {workflow_path} - {e}")
+        return None
+    
+    if not isinstance(workflow_data, dict) or 'workflow_name' not in workflow_data:
+        return None
+    return workflow_data, hashlib.sha1(content).hexdigest()
+
+
+def record_run(workflow_path: str, success: bool, duration: float, error: str = None,
+               batch: Dict[str, int] = None) -> None:
+    """
+    记录工作流最近一次的运行状态（只修改元数据文件）
+    
+    Args:
+        batch: 批量运行时的汇总 {"succeeded": 成功条目数, "failed": 失败条目数}
+    """
+    metadata = load_metadata(workflow_path)
+    if metadata is None:
+        return
+    
+    metadata["last_run"] = {
+        "status": "success" if success else "failed",
+        "time": time.time(),
+        "duration": round(duration, 3),
+        "error": error,
+    }
+    if batch is not None:
+        metadata["last_run"]["batch"] = batch
+    _write_json_atomic(get_metadata_path(workflow_path), metadata)
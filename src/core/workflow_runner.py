@@ -5,6 +5,7 @@ Worklow Runner
 Persistent worker process that executes nodes on demand.
 Reads JSON commands from stdin and writes results to stdout.
 """
+import os
 import sys
 import json
 import importlib.util
@@ -24,6 +25,32 @@ def load_module_from_file(file_path):
     except Exception as e:
         raise ImportError(f"Failed to load module {file_path}: {e}")
 
+# Loaded node modules, reused across commands: {script_path: (mtime_ns, size, module)}
+_module_cache = {}
+
+def load_cached_module(file_path):
+    """Load a module once and reuse it until the script file changes"""
+    stat = os.stat(file_path)
+    cached = _module_cache.get(file_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+        
+    module = load_module_from_file(file_path)
+    if module:
+        _module_cache[file_path] = (stat.st_mtime_ns, stat.st_size, module)
+    return module
+
+def run_script(script_path, input_data):
+    """Load a node script and call its execute function"""
+    module = load_cached_module(script_path)
+    if not module:
+        raise ImportError(f"Could not load module from {script_path}")
+        
+    if not hasattr(module, "execute"):
+        raise AttributeError(f"Module {script_path} does not have an execute function")
+        
+    return module.execute(input_data)
+
 def handle_run_node(command):
     """Handle run_node command"""
     try:
@@ -33,16 +60,8 @@ def handle_run_node(command):
         if not script_path:
             return {"success": False, "error": "script_path is required"}
             
-        # Load the node module
-        module = load_module_from_file(script_path)
-        if not module:
-            return {"success": False, "error": f"Could not load module from {script_path}"}
-            
-        if not hasattr(module, "execute"):
-            return {"success": False, "error": f"Module {script_path} does not have an execute function"}
-            
         # Execute the node logic
-        output_data = module.execute(input_data)
+        output_data = run_script(script_path, input_data)
         
         return {
             "success": True, 
@@ -57,6 +76,44 @@ def handle_run_node(command):
             "traceback": tb
         }
 
+def handle_run_chain(command):
+    """
+    Handle run_chain command.
+    Executes a fused linear chain of nodes in order, passing the context
+    between them in memory. Only the accumulated outputs are sent back.
+    """
+    steps = command.get("steps", [])
+    context = dict(command.get("input_data", {}))
+    updates = {}
+    completed = []
+    
+    for step in steps:
+        node_id = step.get("node_id")
+        try:
+            script_path = step.get("script_path")
+            if not script_path:
+                raise ValueError("script_path is required")
+                
+            output_data = run_script(script_path, dict(context)) or {}
+            context.update(output_data)
+            updates.update(output_data)
+            completed.append(node_id)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+                "node_id": node_id,
+                "completed": completed,
+                "data": updates
+            }
+    
+    return {
+        "success": True,
+        "data": updates,
+        "completed": completed
+    }
+
 def main():
     """Main loop"""
     # Print ready signal
@@ -86,6 +143,13 @@ def main():
                 print(json.dumps(result, ensure_ascii=False))
                 print("###JSON_OUTPUT_END###", flush=True)
                 
+            elif cmd_type == "run_chain":
+                result = handle_run_chain(command)
+                
+                print("###JSON_OUTPUT###")
+                print(json.dumps(result, ensure_ascii=False))
+                print("###JSON_OUTPUT_END###", flush=True)
+                
             else:
                 error_result = {"success": False, "error": f"Unknown command: {cmd_type}"}
                 print("###JSON_OUTPUT###")
@@ -1,14 +1,21 @@
 """
 工作流扫描器
 扫描所有工作流文件，建立节点类型到工作流的索引
+
+索引持久化在 SQLite 文件中（默认 user_data/workflow_index.db），记录每个
+workflow.json 的 mtime/size/hash 及其节点使用情况。刷新时只处理发生变化的
+文件：先用 workflow.meta.json 中的哈希判断内容是否变化，变化时才解析完整的
+工作流，查询直接从索引中读取。
 """
-import json
 import os
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from dataclasses import dataclass
 
 from src.core.node_base import NodeType
+from src.core.workflow_metadata import read_metadata, read_workflow, write_metadata
 
 
 @dataclass
@@ -42,105 +49,176 @@ class WorkflowScanner:
         "sqlite_execute": {"name": "SQLite执行", "icon": "▶️"},
     }
     
-    def __init__(self, workflows_dir: str = "workflows"):
+    # 索引结构版本，变化时重建索引
+    INDEX_VERSION = 1
+    
+    def __init__(self, workflows_dir: str = "workflows", index_path: str = None, live: bool = False):
         """
         初始化扫描器
         
         Args:
             workflows_dir: 工作流目录路径
+            index_path: 索引数据库路径，默认为 user_data/workflow_index.db
+            live: 索引是否由文件监视器通过 refresh_workflow() 维护，
+                  为 True 时查询只在首次全量检查文件状态
         """
         self.workflows_dir = Path(workflows_dir)
-        # 节点类型 -> 使用该节点的工作流列表
-        self._node_to_workflows: Dict[str, List[WorkflowNodeInfo]] = {}
-        # 工作流名称 -> 节点使用情况
-        self._workflow_to_nodes: Dict[str, List[NodeUsageInfo]] = {}
+        self.index_path = Path(index_path) if index_path else Path("user_data") / "workflow_index.db"
+        self.live = live
+        self._scanned = False
+        self._lock = threading.RLock()
+        self._conn = self._open_index()
     
-    def scan_all_workflows(self) -> None:
-        """扫描所有工作流并建立索引"""
-        self._node_to_workflows.clear()
-        self._workflow_to_nodes.clear()
-        
+    def _open_index(self) -> sqlite3.Connection:
+        """打开（必要时创建）索引数据库，无法写入时退回内存数据库"""
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+            self._init_schema(conn)
+        except sqlite3.Error as e:
+            print(f"无法打开工作流索引 {self.index_path}，使用内存索引: {e}")
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._init_schema(conn)
+        return conn
+    
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        """创建索引表"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.INDEX_VERSION:
+            conn.executescript("""
+                DROP TABLE IF EXISTS workflow_nodes;
+                DROP TABLE IF EXISTS workflows;
+            """)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS workflows (
+                path TEXT PRIMARY KEY,
+                workflow_name TEXT,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS workflow_nodes (
+                path TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                node_id TEXT NOT NULL,
+                node_type TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_workflow_nodes_type ON workflow_nodes(node_type);
+            CREATE INDEX IF NOT EXISTS idx_workflow_nodes_path ON workflow_nodes(path);
+            CREATE INDEX IF NOT EXISTS idx_workflows_name ON workflows(workflow_name);
+        """)
+        conn.execute(f"PRAGMA user_version = {self.INDEX_VERSION}")
+        conn.commit()
+    
+    def _list_workflow_files(self) -> Dict[str, os.stat_result]:
+        """列出工作流目录下所有 workflow.json 及其文件状态"""
+        files = {}
         if not self.workflows_dir.exists():
-            return
+            return files
         
-        # 遍历工作流目录
-        for item in self.workflows_dir.iterdir():
-            if item.is_dir():
-                workflow_json = item / "workflow.json"
-                if workflow_json.exists() and workflow_json.is_file():
-                    self._scan_workflow(workflow_json)
+        for item in os.scandir(self.workflows_dir):
+            if not item.is_dir():
+                continue
+            workflow_json = os.path.join(item.path, "workflow.json")
+            try:
+                stat = os.stat(workflow_json)
+            except OSError:
+                continue
+            files[str(Path(workflow_json))] = stat
+        return files
     
-    def _scan_workflow(self, workflow_path: Path) -> None:
+    def scan_all_workflows(self) -> None:
+        """增量刷新索引：只重新解析新增或发生变化的工作流文件"""
+        files = self._list_workflow_files()
+        
+        with self._lock:
+            indexed = {
+                path: (mtime_ns, size, file_hash)
+                for path, mtime_ns, size, file_hash in
+                self._conn.execute("SELECT path, mtime_ns, size, hash FROM workflows")
+            }
+            
+            # 删除已不存在的工作流
+            for path in indexed.keys() - files.keys():
+                self._remove_workflow(path)
+            
+            for path, stat in files.items():
+                entry = indexed.get(path)
+                if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                    continue
+                self._scan_workflow(Path(path), stat, entry[2] if entry else None)
+            
+            self._conn.commit()
+            self._scanned = True
+    
+    def _ensure_index(self) -> None:
+        """查询前确保索引是最新的（只检查文件状态）"""
+        if not (self.live and self._scanned):
+            self.scan_all_workflows()
+    
+    def refresh_workflow(self, workflow_path: str) -> None:
+        """刷新单个工作流文件的索引（文件不存在时从索引中移除）"""
+        path = str(Path(workflow_path))
+        with self._lock:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._remove_workflow(path)
+            else:
+                row = self._conn.execute("SELECT hash FROM workflows WHERE path = ?", (path,)).fetchone()
+                self._scan_workflow(Path(path), stat, row[0] if row else None)
+            self._conn.commit()
+    
+    def _remove_workflow(self, path: str) -> None:
+        """从索引中移除工作流"""
+        self._conn.execute("DELETE FROM workflow_nodes WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM workflows WHERE path = ?", (path,))
+    
+    def _scan_workflow(self, workflow_path: Path, stat: os.stat_result, old_hash: Optional[str] = None) -> None:
         """
-        扫描单个工作流文件
+        扫描单个工作流文件并更新索引
         
         Args:
             workflow_path: workflow.json 文件路径
+            stat: 文件状态
+            old_hash: 索引中记录的内容哈希，内容未变时只更新文件状态
         """
-        try:
-            with open(workflow_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, dict) or 'workflow_name' not in data:
-                return
-            
-            workflow_name = data.get('workflow_name', workflow_path.parent.name)
-            nodes = data.get('nodes', [])
-            
-            # 统计每种节点类型的使用情况
-            node_type_count: Dict[str, List[str]] = {}  # type -> [node_ids]
-            
-            for node in nodes:
-                node_type = node.get('node_type', '')
-                node_id = node.get('node_id', '')
-                
-                if node_type and node_id:
-                    if node_type not in node_type_count:
-                        node_type_count[node_type] = []
-                    node_type_count[node_type].append(node_id)
-            
-            # 更新索引
-            for node_type, node_ids in node_type_count.items():
-                if node_type not in self._node_to_workflows:
-                    self._node_to_workflows[node_type] = []
-                
-                self._node_to_workflows[node_type].append(WorkflowNodeInfo(
-                    workflow_name=workflow_name,
-                    workflow_path=str(workflow_path),
-                    node_ids=node_ids,
-                    count=len(node_ids)
-                ))
-            
-            # 建立工作流到节点的索引（按顺序）
-            usage_list: List[NodeUsageInfo] = []
-            seen_types: Dict[str, NodeUsageInfo] = {}
-            
-            for node in nodes:
-                node_type = node.get('node_type', '')
-                node_id = node.get('node_id', '')
-                
+        path = str(workflow_path)
+        # 元数据中的哈希与索引一致时内容未变（如只是重新保存），无需解析工作流
+        metadata = read_metadata(path)
+        if metadata is not None and metadata["workflow_hash"] == old_hash:
+            self._conn.execute(
+                "UPDATE workflows SET mtime_ns = ?, size = ? WHERE path = ?",
+                (stat.st_mtime_ns, stat.st_size, path)
+            )
+            return
+        
+        # 无效文件同样记录，避免每次刷新都重新解析
+        workflow_name = None
+        file_hash = ""
+        node_rows = []
+        workflow = read_workflow(path)
+        if workflow is not None:
+            workflow_data, file_hash = workflow
+            if metadata is None:
+                # 顺便重建缺失或过期的元数据文件
+                write_metadata(path, workflow_data, file_hash)
+            workflow_name = workflow_data["workflow_name"]
+            for node in workflow_data.get("nodes", []):
+                node_type = node.get("node_type", "")
+                node_id = node.get("node_id", "")
                 if node_type and node_id:
-                    if node_type in seen_types:
-                        # 已存在，更新计数和ID列表
-                        seen_types[node_type].count += 1
-                        seen_types[node_type].node_ids.append(node_id)
-                    else:
-                        # 首次出现
-                        info = self.NODE_INFO.get(node_type, {"name": node_type, "icon": "📦"})
-                        usage_info = NodeUsageInfo(
-                            node_type=node_type,
-                            node_name=info["name"],
-                            node_icon=info["icon"],
-                            count=1,
-                            node_ids=[node_id]
-                        )
-                        seen_types[node_type] = usage_info
-                        usage_list.append(usage_info)
-            
-            self._workflow_to_nodes[workflow_name] = usage_list
-            
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"扫描工作流失败: {workflow_path} - {e}")
+                    node_rows.append((path, len(node_rows), node_id, node_type))
+        
+        self._conn.execute("DELETE FROM workflow_nodes WHERE path = ?", (path,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO workflows (path, workflow_name, mtime_ns, size, hash) VALUES (?, ?, ?, ?, ?)",
+            (path, workflow_name, stat.st_mtime_ns, stat.st_size, file_hash)
+        )
+        self._conn.executemany(
+            "INSERT INTO workflow_nodes (path, seq, node_id, node_type) VALUES (?, ?, ?, ?)",
+            node_rows
+        )
     
     def get_workflows_using_node(self, node_type: str) -> List[WorkflowNodeInfo]:
         """
@@ -152,9 +230,47 @@ class WorkflowScanner:
         Returns:
             使用该节点的工作流信息列表
         """
-        # 确保索引是最新的
-        self.scan_all_workflows()
-        return self._node_to_workflows.get(node_type, [])
+        return self.get_workflows_using_nodes([node_type]).get(node_type, [])
+    
+    def get_workflows_using_nodes(self, node_types: Iterable[str]) -> Dict[str, List[WorkflowNodeInfo]]:
+        """
+        批量获取使用各节点类型的工作流（单次查询）
+        
+        Args:
+            node_types: 节点类型值列表
+        
+        Returns:
+            {节点类型: 使用该节点的工作流信息列表}，未被使用的类型不出现在结果中
+        """
+        node_types = list(dict.fromkeys(node_types))
+        if not node_types:
+            return {}
+        self._ensure_index()
+        
+        placeholders = ", ".join("?" * len(node_types))
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT n.node_type, w.path, w.workflow_name, n.node_id
+                FROM workflow_nodes n JOIN workflows w ON w.path = n.path
+                WHERE n.node_type IN ({placeholders}) AND w.workflow_name IS NOT NULL
+                ORDER BY w.path, n.seq
+            """, node_types).fetchall()
+        
+        result: Dict[str, Dict[str, WorkflowNodeInfo]] = {}
+        for node_type, path, workflow_name, node_id in rows:
+            by_path = result.setdefault(node_type, {})
+            info = by_path.get(path)
+            if info is None:
+                info = by_path[path] = WorkflowNodeInfo(
+                    workflow_name=workflow_name,
+                    workflow_path=path,
+                    node_ids=[],
+                    count=0
+                )
+            info.node_ids.append(node_id)
+            info.count += 1
+        
+        return {node_type: list(by_path.values()) for node_type, by_path in result.items()}
     
     def get_nodes_in_workflow(self, workflow_name: str) -> List[NodeUsageInfo]:
         """
@@ -166,9 +282,41 @@ class WorkflowScanner:
         Returns:
             节点使用信息列表（按首次出现顺序）
         """
-        # 确保索引是最新的
-        self.scan_all_workflows()
-        return self._workflow_to_nodes.get(workflow_name, [])
+        self._ensure_index()
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path FROM workflows WHERE workflow_name = ? ORDER BY path DESC LIMIT 1",
+                (workflow_name,)
+            ).fetchone()
+            if not row:
+                return []
+            rows = self._conn.execute(
+                "SELECT node_type, node_id FROM workflow_nodes WHERE path = ? ORDER BY seq",
+                (row[0],)
+            ).fetchall()
+        
+        usage_list: List[NodeUsageInfo] = []
+        seen_types: Dict[str, NodeUsageInfo] = {}
+        for node_type, node_id in rows:
+            if node_type in seen_types:
+                # 已存在，更新计数和ID列表
+                seen_types[node_type].count += 1
+                seen_types[node_type].node_ids.append(node_id)
+            else:
+                # 首次出现
+                info = self.get_node_info(node_type)
+                usage_info = NodeUsageInfo(
+                    node_type=node_type,
+                    node_name=info["name"],
+                    node_icon=info["icon"],
+                    count=1,
+                    node_ids=[node_id]
+                )
+                seen_types[node_type] = usage_info
+                usage_list.append(usage_info)
+        
+        return usage_list
     
     def get_node_info(self, node_type: str) -> dict:
         """
@@ -1,19 +1,35 @@
 from PySide6.QtGui import QIcon, QAction
 from pathlib import Path
+import os
 import sys
 from PySide6.QtWidgets import QMainWindow, QWidget, QToolBar, QTabWidget, QStatusBar, QSizePolicy, QDockWidget
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QTimer
 
 from src.views.overview_widget import OverviewWidget
-from src.views.workflow_tab_widget import WorkflowTabWidget
-from src.dialogs.settings_dialog import SettingsDialog
-from src.views.node_browser import NodeBrowserWidget
-from src.views.node_properties import NodePropertiesWidget
 from src.core.config_manager import ConfigManager
+from src.views.file_change_monitor import FileChangeMonitor
 
 from src.core.theme_manager import ThemeManager
 
+# 以下模块在首次使用时才导入，缩短首帧时间：
+#   src.views.workflow_tab_widget  - 打开/新建工作流时
+#   src.views.node_browser         - 节点浏览器首次显示时（会加载节点注册表、扫描工作流）
+#   src.views.node_properties      - 节点属性面板首次显示时
+#   src.dialogs.settings_dialog    - 打开设置时
+
+
+def _is_workflow_tab(widget) -> bool:
+    """判断标签页是否为工作流标签（不触发 WorkflowTabWidget 的导入）"""
+    module = sys.modules.get("src.views.workflow_tab_widget")
+    # 模块尚未导入时不可能存在工作流标签页
+    return module is not None and isinstance(widget, module.WorkflowTabWidget)
+
+
 class MainWindow(QMainWindow):
+    # 监视的目录
+    WORKFLOWS_DIR = "workflows"
+    USER_DATA_DIR = "user_data"
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("LocalFlow")
@@ -26,6 +42,16 @@ class MainWindow(QMainWindow):
         
         self._setup_layout()
         self._restore_window_state()
+        
+        # 监视工作流和用户数据目录，增量更新首页卡片、节点使用索引和节点注册表
+        # （收到文件系统通知后在后台线程比较文件状态，界面线程只处理事件）
+        self._file_monitor = FileChangeMonitor([self.WORKFLOWS_DIR, self.USER_DATA_DIR], self)
+        self._file_monitor.changed.connect(self._on_file_changes)
+        QTimer.singleShot(0, self._file_monitor.start)
+        
+        # 首帧之后在后台加载节点注册表，打开节点浏览器时通常已就绪
+        from src.core.node_registry import preload_registry
+        QTimer.singleShot(0, preload_registry)
 
     def _setup_layout(self):
 
@@ -88,28 +114,21 @@ class MainWindow(QMainWindow):
         self.addToolBar(Qt.LeftToolBarArea, toolbar)
         self.addToolBar(Qt.RightToolBarArea, toolbar_right)
         
-        # 左侧停靠窗口 - 节点浏览器
+        # 左侧停靠窗口 - 节点浏览器（内容在首次显示时创建）
+        self._node_browser = None
         self.node_browser_dock = QDockWidget("节点浏览器", self)
         self.node_browser_dock.setAllowedAreas(Qt.LeftDockWidgetArea)
-        self.node_browser = NodeBrowserWidget(self)
-        self.node_browser_dock.setWidget(self.node_browser)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.node_browser_dock)
         self.node_browser_dock.hide()  # 默认隐藏
+        self.node_browser_dock.visibilityChanged.connect(self._on_node_browser_visibility_changed)
         
-        # 右侧停靠窗口 - 节点属性
+        # 右侧停靠窗口 - 节点属性（内容在首次显示时创建）
+        self._node_properties = None
         self.node_properties_dock = QDockWidget("节点属性", self)
         self.node_properties_dock.setAllowedAreas(Qt.RightDockWidgetArea)
-        self.node_properties = NodePropertiesWidget(self)
-        self.node_properties_dock.setWidget(self.node_properties)
         self.addDockWidget(Qt.RightDockWidgetArea, self.node_properties_dock)
         self.node_properties_dock.hide()  # 默认隐藏
-        
-        # 连接信号
-        self.node_properties.properties_updated.connect(self._on_node_properties_updated)
-        
-        # 连接节点浏览器信号
-        self.node_browser.open_workflow_requested.connect(self._on_open_workflow_from_browser)
-        self.node_browser.highlight_nodes_requested.connect(self._on_highlight_nodes_requested)
+        self.node_properties_dock.visibilityChanged.connect(self._on_node_properties_visibility_changed)
         
         # 切换Tab时更新节点浏览器统计
         self.tabs.currentChanged.connect(self._on_tab_changed)
@@ -126,25 +145,98 @@ class MainWindow(QMainWindow):
         self.node_browser_dock.installEventFilter(self)
         self.node_properties_dock.installEventFilter(self)
     
-    def _toggle_node_browser(self):
-        """切换节点浏览器显示"""
-        if self.node_browser_dock.isVisible():
-            self.node_browser_dock.hide()
-        else:
-            self.node_browser_dock.show()
+    def poll_file_changes(self):
+        """请求尽快检查文件变化（如保存工作流之后），结果由 _on_file_changes 处理"""
+        self._file_monitor.request_poll()
     
-    def _toggle_node_properties(self):
-        """切换节点属性显示"""
-        if self.node_properties_dock.isVisible():
-            self.node_properties_dock.hide()
-        else:
-            self.node_properties_dock.show()
+    def _on_file_changes(self, events):
+        """把文件变化事件分发给首页、节点浏览器和节点注册表"""
+        from src.core.file_watcher import FileEvent, MODIFIED
+        from src.core.workflow_metadata import META_FILENAME
+        
+        workflows_root = str(Path(self.WORKFLOWS_DIR))
+        workflow_events = [e for e in events
+                           if e.root == workflows_root and Path(e.path).name == "workflow.json"]
+        changed_paths = {e.path for e in workflow_events}
+        for e in events:
+            if e.root != workflows_root or Path(e.path).name != META_FILENAME:
+                continue
+            # 元数据变化（如运行状态）视为对应工作流被修改
+            workflow_json = str(Path(e.path).with_name("workflow.json"))
+            if workflow_json not in changed_paths and os.path.exists(workflow_json):
+                changed_paths.add(workflow_json)
+                workflow_events.append(FileEvent(MODIFIED, workflow_json, e.root))
+        user_data_events = [e for e in events if e.root == str(Path(self.USER_DATA_DIR))]
+        
+        if workflow_events:
+            overview_widget = self.tabs.widget(0)
+            if hasattr(overview_widget, 'apply_workflow_changes'):
+                overview_widget.apply_workflow_changes(workflow_events)
+            if self._node_browser is not None:
+                self._node_browser.apply_workflow_changes([e.path for e in workflow_events])
+        
+        if user_data_events:
+            from src.core.node_registry import get_registry
+            changed_types = get_registry().apply_file_events(user_data_events)
+            if changed_types:
+                print(f"节点已更新: {', '.join(changed_types)}")
+                if self._node_browser is not None:
+                    self._node_browser.reload_nodes()
+    
+    def _on_node_browser_visibility_changed(self, visible: bool):
+        """节点浏览器首次显示时，在首帧绘制之后再创建其内容"""
+        if visible and self._node_browser is None:
+            QTimer.singleShot(0, self._ensure_node_browser)
+    
+    def _on_node_properties_visibility_changed(self, visible: bool):
+        """节点属性面板首次显示时，在首帧绘制之后再创建其内容"""
+        if visible and self._node_properties is None:
+            QTimer.singleShot(0, self._ensure_node_properties)
+    
+    @property
+    def node_browser(self):
+        """节点浏览器，首次访问时创建"""
+        return self._ensure_node_browser()
+    
+    @property
+    def node_properties(self):
+        """节点属性面板，首次访问时创建"""
+        return self._ensure_node_properties()
+    
+    def _ensure_node_browser(self):
+        """创建节点浏览器（加载节点注册表并扫描工作流）"""
+        if self._node_browser is None:
+            from src.views.node_browser import NodeBrowserWidget
+            
+            # 工作流变化由文件监视器推送，查询时无需重新检查目录
+            self._node_browser = NodeBrowserWidget(self, live_updates=True)
+            self.node_browser_dock.setWidget(self._node_browser)
+            
+            # 连接节点浏览器信号
+            self._node_browser.open_workflow_requested.connect(self._on_open_workflow_from_browser)
+            self._node_browser.highlight_nodes_requested.connect(self._on_highlight_nodes_requested)
+            
+            # 同步当前标签页的统计
+            self._on_tab_changed(self.tabs.currentIndex())
+        return self._node_browser
+    
+    def _ensure_node_properties(self):
+        """创建节点属性面板"""
+        if self._node_properties is None:
+            from src.views.node_properties import NodePropertiesWidget
+            
+            self._node_properties = NodePropertiesWidget(self)
+            self.node_properties_dock.setWidget(self._node_properties)
+            
+            # 连接信号
+            self._node_properties.properties_updated.connect(self._on_node_properties_updated)
+        return self._node_properties
     
     def _on_node_properties_updated(self, node_id: str, config: dict):
         """节点属性已更新"""
         # 获取当前工作流标签页
         current_widget = self.tabs.currentWidget()
-        if isinstance(current_widget, WorkflowTabWidget):
+        if _is_workflow_tab(current_widget):
             current_widget.update_node_config(node_id, config)
     
     def _on_open_workflow_from_browser(self, workflow_name: str, workflow_path: str, node_type: str):
@@ -152,7 +244,7 @@ class MainWindow(QMainWindow):
         # 检查工作流是否已经打开
         for i in range(self.tabs.count()):
             widget = self.tabs.widget(i)
-            if isinstance(widget, WorkflowTabWidget) and widget.workflow_name == workflow_name:
+            if _is_workflow_tab(widget) and widget.workflow_name == workflow_name:
                 # 已经打开，切换到该标签并高亮节点
                 self.tabs.setCurrentIndex(i)
                 widget.canvas.highlight_nodes_by_type(node_type)
@@ -161,37 +253,43 @@ class MainWindow(QMainWindow):
         # 需要打开工作流，复用OverviewWidget的逻辑
         overview_widget = self.tabs.widget(0)
         if hasattr(overview_widget, '_on_open_workflow'):
-            overview_widget._on_open_workflow(workflow_name, workflow_path)
+            loader = overview_widget._on_open_workflow(workflow_name, workflow_path)
             
-            # 等待工作流打开后高亮节点
-            from PySide6.QtCore import QTimer
-            QTimer.singleShot(100, lambda: self._highlight_after_open(node_type))
+            # 画布加载完成后高亮节点
+            if loader is not None:
+                loader.finished.connect(lambda _count: self._highlight_after_open(node_type))
     
     def _highlight_after_open(self, node_type: str):
         """工作流打开后高亮节点"""
         current_widget = self.tabs.currentWidget()
-        if isinstance(current_widget, WorkflowTabWidget):
+        if _is_workflow_tab(current_widget):
             current_widget.canvas.highlight_nodes_by_type(node_type)
     
     def _on_highlight_nodes_requested(self, node_type: str):
         """处理高亮节点请求"""
         current_widget = self.tabs.currentWidget()
-        if isinstance(current_widget, WorkflowTabWidget):
+        if _is_workflow_tab(current_widget):
             current_widget.canvas.highlight_nodes_by_type(node_type)
     
     def _on_tab_changed(self, index: int):
         """Tab切换时更新节点浏览器统计"""
+        # 节点浏览器尚未创建时无需更新，创建时会同步当前标签页
+        if self._node_browser is None:
+            return
+        
         widget = self.tabs.widget(index)
-        if isinstance(widget, WorkflowTabWidget):
+        if _is_workflow_tab(widget):
             # 获取工作流中的节点数据
             nodes_data = widget.canvas.get_all_nodes()
-            self.node_browser.update_workflow_stats(widget.workflow_name, nodes_data)
+            self._node_browser.update_workflow_stats(widget.workflow_name, nodes_data)
         else:
             # 非工作流标签（如Overview）
-            self.node_browser.update_workflow_stats(None)
+            self._node_browser.update_workflow_stats(None)
 
     def add_workflow_tab(self):
         """Add a new workflow tab"""
+        from src.views.workflow_tab_widget import WorkflowTabWidget
+        
         self.workflow_count += 1
         workflow_name = f"工作流 {self.workflow_count}"
         workflow_widget = WorkflowTabWidget(workflow_name, self)
@@ -212,7 +310,7 @@ class MainWindow(QMainWindow):
             return
         
         widget = self.tabs.widget(index)
-        if isinstance(widget, WorkflowTabWidget):
+        if _is_workflow_tab(widget):
             if not self._check_save_before_close(widget):
                 return  # 用户取消关闭
         
@@ -280,7 +378,7 @@ class MainWindow(QMainWindow):
         Returns:
             bool: True表示可以继续关闭，False表示用户取消关闭
         """
-        if not workflow_widget.is_modified():
+        if workflow_widget.is_loading() or not workflow_widget.is_modified():
             return True
         
         from PySide6.QtWidgets import QMessageBox
@@ -321,7 +419,7 @@ class MainWindow(QMainWindow):
         # 检查所有工作流是否有未保存的更改
         for i in range(1, self.tabs.count()):  # 跳过Overview
             widget = self.tabs.widget(i)
-            if isinstance(widget, WorkflowTabWidget):
+            if _is_workflow_tab(widget):
                 if not self._check_save_before_close(widget):
                     event.ignore()
                     return
@@ -359,7 +457,7 @@ class MainWindow(QMainWindow):
     def add_node_to_canvas(self, node_type):
         """添加节点到当前画布的中心位置"""
         current_widget = self.tabs.currentWidget()
-        if isinstance(current_widget, WorkflowTabWidget):
+        if _is_workflow_tab(current_widget):
             from src.views.node_graphics import NodeGraphicsItem
             import time
             
@@ -416,7 +514,7 @@ class MainWindow(QMainWindow):
             return
         
         widget = self.tabs.widget(index)
-        if isinstance(widget, WorkflowTabWidget):
+        if _is_workflow_tab(widget):
             widget.rename_workflow()
     
     def update_tab_name(self, workflow_widget, new_name):
@@ -512,5 +610,7 @@ class MainWindow(QMainWindow):
     
     def _open_settings(self):
         """Open settings dialog"""
+        from src.dialogs.settings_dialog import SettingsDialog
+        
         dialog = SettingsDialog(self)
         dialog.exec()
\ No newline at end of file
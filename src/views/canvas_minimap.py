@@ -0,0 +1,194 @@
+"""
+画布小地图
+在画布右下角显示整个工作流的缩略图和当前视口位置，点击或拖动即可跳转
+
+缩略图是一张低分辨率的快照：每个节点只画一个色块，不经过场景渲染。
+节点增删或移动后（场景的 nodes_changed 信号）只重画快照中变化的区域，
+节点超出快照范围时才整体重建，因此在上万个节点的工作流中导航也不需要
+反复缩放、重绘整个场景；悬停、连线预览等重绘不会触发刷新。
+"""
+from PySide6.QtCore import Qt, QPointF, QRectF, QTimer
+from PySide6.QtGui import QColor, QPainter, QPen, QPixmap, QTransform
+from PySide6.QtWidgets import QWidget
+
+from src.core.theme_manager import ThemeManager
+
+
+class CanvasMinimap(QWidget):
+    """WorkflowCanvas 的小地图（作为画布的子控件浮在右下角）"""
+    
+    MINIMAP_WIDTH = 220
+    MINIMAP_HEIGHT = 150
+    # 与画布边缘的距离
+    MARGIN = 12
+    # 快照范围在节点外额外留出的比例，节点小范围移动时不必重建快照
+    EXTENT_PADDING = 0.1
+    # 节点变化后延迟刷新快照的时间（毫秒），期间的变化合并处理
+    REFRESH_DELAY_MS = 200
+    
+    BACKGROUND_COLOR = QColor(ThemeManager.COLORS['background'])
+    BORDER_PEN = QPen(QColor(ThemeManager.COLORS['border']), 1)
+    VIEWPORT_PEN = QPen(QColor(ThemeManager.COLORS['accent']), 1)
+    
+    def __init__(self, canvas):
+        """
+        Args:
+            canvas: 所属的 WorkflowCanvas（同时作为父控件）
+        """
+        super().__init__(canvas)
+        self.canvas = canvas
+        self.scene = canvas.scene()
+        
+        # 快照及其对应的场景范围；场景坐标 -> 快照坐标的变换
+        self._snapshot = None
+        self._extent = QRectF()
+        self._transform = QTransform()
+        
+        # 尚未重画的节点矩形（场景坐标）
+        self._dirty_rects = []
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self._refresh)
+        self.scene.nodes_changed.connect(self._on_nodes_changed)
+        
+        self.setFixedSize(self.MINIMAP_WIDTH, self.MINIMAP_HEIGHT)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setToolTip("点击或拖动跳转到对应位置")
+        self.hide()
+    
+    def place(self):
+        """移动到画布右下角"""
+        self.move(
+            self.canvas.width() - self.width() - self.MARGIN,
+            self.canvas.height() - self.height() - self.MARGIN
+        )
+    
+    def _on_nodes_changed(self, rects):
+        """记录变化的节点矩形，稍后统一刷新快照"""
+        self._dirty_rects.extend(rects)
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start(self.REFRESH_DELAY_MS)
+    
+    def _refresh(self):
+        """重画快照中变化的区域"""
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        
+        if not self.scene.node_count():
+            self._snapshot = None
+            self.hide()
+            return
+        if self._snapshot is None:
+            self._rebuild()
+            return
+        
+        # 有节点超出快照范围（新增或移出）时整体重建
+        for rect in rects:
+            if not self._extent.contains(rect):
+                self._rebuild()
+                return
+        
+        painter = QPainter(self._snapshot)
+        for rect in rects:
+            rect = rect.intersected(self._extent)
+            if rect.isEmpty():
+                continue
+            # 按整像素清除，再重画与这些像素相交的节点
+            pixels = self._transform.mapRect(rect).toAlignedRect().adjusted(-1, -1, 1, 1)
+            painter.setClipRect(pixels)
+            painter.fillRect(pixels, self.BACKGROUND_COLOR)
+            self._draw_nodes(painter, self._nodes_in(self._transform.inverted()[0].mapRect(QRectF(pixels))))
+        painter.end()
+        self.update()
+    
+    def _rebuild(self):
+        """按当前所有节点重建快照"""
+        nodes = self.scene.get_nodes()
+        if not nodes:
+            self._snapshot = None
+            self.hide()
+            return
+        
+        bounds = QRectF()
+        for node in nodes:
+            bounds = bounds.united(self._node_rect(node))
+        self._extent = self._fit_extent(bounds)
+        scale = self.width() / self._extent.width()
+        self._transform = QTransform.fromScale(scale, scale).translate(-self._extent.left(), -self._extent.top())
+        
+        self._snapshot = QPixmap(self.size())
+        self._snapshot.fill(self.BACKGROUND_COLOR)
+        painter = QPainter(self._snapshot)
+        self._draw_nodes(painter, nodes)
+        painter.end()
+        
+        self.place()
+        self.show()
+        self.update()
+    
+    def _fit_extent(self, bounds: QRectF) -> QRectF:
+        """在节点范围外留出余量，并扩展为与小地图相同的宽高比"""
+        padding = max(bounds.width(), bounds.height()) * self.EXTENT_PADDING + 1
+        extent = bounds.adjusted(-padding, -padding, padding, padding)
+        aspect = self.width() / self.height()
+        if extent.width() / extent.height() < aspect:
+            extra = extent.height() * aspect - extent.width()
+            extent.adjust(-extra / 2, 0, extra / 2, 0)
+        else:
+            extra = extent.width() / aspect - extent.height()
+            extent.adjust(0, -extra / 2, 0, extra / 2)
+        return extent
+    
+    def _nodes_in(self, rect: QRectF) -> list:
+        """场景区域内的节点"""
+        from src.views.node_graphics import NodeGraphicsItem
+        return [item for item in self.scene.items(rect) if isinstance(item, NodeGraphicsItem)]
+    
+    def _node_rect(self, node) -> QRectF:
+        """节点主体在场景中的矩形"""
+        pos = node.scenePos()
+        return QRectF(pos.x(), pos.y(), node.width, node.height)
+    
+    def _draw_nodes(self, painter: QPainter, nodes):
+        """每个节点画一个色块（至少 1 像素，缩得很小时也能看到）"""
+        for node in nodes:
+            rect = self._transform.mapRect(self._node_rect(node))
+            rect.setWidth(max(rect.width(), 1))
+            rect.setHeight(max(rect.height(), 1))
+            painter.fillRect(rect, node.header_color)
+    
+    def paintEvent(self, event):
+        """绘制快照和当前视口范围"""
+        if self._snapshot is None:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._snapshot)
+        
+        viewport = self.canvas.mapToScene(self.canvas.viewport().rect()).boundingRect()
+        viewport_rect = self._transform.mapRect(viewport).intersected(QRectF(self.rect()).adjusted(0, 0, -1, -1))
+        if not viewport_rect.isEmpty():
+            painter.setPen(self.VIEWPORT_PEN)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(viewport_rect)
+        
+        painter.setPen(self.BORDER_PEN)
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+    
+    def mousePressEvent(self, event):
+        """点击跳转"""
+        if event.button() == Qt.LeftButton:
+            self._jump_to(event.position())
+        event.accept()
+    
+    def mouseMoveEvent(self, event):
+        """拖动时视口跟随"""
+        if event.buttons() & Qt.LeftButton:
+            self._jump_to(event.position())
+        event.accept()
+    
+    def _jump_to(self, pos: QPointF):
+        """把画布视口中心移到小地图上的位置"""
+        if self._snapshot is None:
+            return
+        self.canvas.centerOn(self._transform.inverted()[0].map(pos))
+        self.update()
@@ -0,0 +1,122 @@
+"""
+文件变化监视
+用 QFileSystemWatcher 接收目录和文件的变化通知，收到通知后在线程池中用
+FileWatcher 比较文件状态，再把 FileEvent 列表交回界面线程
+
+界面线程不再遍历目录：通知只触发一次后台比较；平台通知不可用或监视数量
+超出系统限制时，由间隔较长的定时比较兜底。
+"""
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, QFileSystemWatcher, Signal
+
+from src.core.file_watcher import FileWatcher
+
+
+class _PollSignals(QObject):
+    """后台比较任务的信号（不设置父对象，任务结束前保持有效）"""
+    polled = Signal(object, object, object)  # 事件列表, 目录列表, 文件列表
+
+
+class _PollTask(QRunnable):
+    """在线程池中比较一次文件状态"""
+    
+    def __init__(self, watcher: FileWatcher, signals: _PollSignals):
+        super().__init__()
+        self.watcher = watcher
+        self.signals = signals
+    
+    def run(self):
+        try:
+            events = self.watcher.poll()
+        except Exception as e:
+            print(f"检查文件变化失败: {e}")
+            events = []
+        directories, files = self.watcher.watched_paths()
+        self.signals.polled.emit(events, directories, files)
+
+
+class FileChangeMonitor(QObject):
+    """监视目录下的文件变化，在界面线程发出 FileEvent 列表"""
+    
+    # 收到通知后等待的时间（毫秒），合并一次保存产生的多个通知
+    DEBOUNCE_MS = 200
+    # 兜底的定时比较间隔（毫秒）
+    FALLBACK_POLL_MS = 10000
+    
+    changed = Signal(object)  # List[FileEvent]
+    
+    def __init__(self, roots, parent=None):
+        """
+        Args:
+            roots: 要监视的目录列表
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._watcher = FileWatcher(roots)
+        
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self.request_poll)
+        self._fs_watcher.fileChanged.connect(self.request_poll)
+        
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._start_poll)
+        
+        self._fallback_timer = QTimer(self)
+        self._fallback_timer.setInterval(self.FALLBACK_POLL_MS)
+        self._fallback_timer.timeout.connect(self._start_poll)
+        
+        # 同一时刻只有一个后台比较；进行中又收到通知时，结束后再比较一次
+        self._polling = False
+        self._poll_again = False
+        self._warned_watch_limit = False
+        self._signals = _PollSignals()
+        self._signals.polled.connect(self._on_polled)
+    
+    def start(self):
+        """建立文件状态基线并开始监视"""
+        self._start_poll()
+        self._fallback_timer.start()
+    
+    def request_poll(self, *args):
+        """请求尽快比较一次文件状态（多次请求会被合并）"""
+        self._debounce_timer.start()
+    
+    def _start_poll(self):
+        """在线程池中比较文件状态"""
+        if self._polling:
+            self._poll_again = True
+            return
+        self._polling = True
+        QThreadPool.globalInstance().start(_PollTask(self._watcher, self._signals))
+    
+    def _on_polled(self, events, directories, files):
+        """后台比较完成：更新监视的路径并发出事件"""
+        self._polling = False
+        self._sync_watched_paths(directories, files)
+        # 兜底定时从最近一次比较完成时重新计时
+        self._fallback_timer.start()
+        
+        if self._poll_again:
+            self._poll_again = False
+            self.request_poll()
+        if events:
+            self.changed.emit(events)
+    
+    def _sync_watched_paths(self, directories, files):
+        """让 QFileSystemWatcher 监视当前存在的目录和文件（被替换的文件需要重新添加）"""
+        wanted_dirs = set(directories)
+        wanted_files = set(files)
+        current_dirs = set(self._fs_watcher.directories())
+        current_files = set(self._fs_watcher.files())
+        
+        stale = list((current_dirs - wanted_dirs) | (current_files - wanted_files))
+        if stale:
+            self._fs_watcher.removePaths(stale)
+        missing = list((wanted_dirs - current_dirs) | (wanted_files - current_files))
+        if missing:
+            failed = self._fs_watcher.addPaths(missing)
+            if failed and not self._warned_watch_limit:
+                # 超出系统的监视数量限制等情况，这些路径依靠定时比较兜底
+                self._warned_watch_limit = True
+                print(f"无法监视 {len(failed)} 个路径，将定时检查这些文件的变化")
@@ -4,17 +4,209 @@
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
                                QLabel, QLineEdit, QPushButton, QHBoxLayout, QSplitter,
-                               QAbstractItemView, QTabWidget, QFrame, QComboBox)
-from PySide6.QtCore import Qt, Signal, QMimeData
+                               QAbstractItemView, QTabWidget, QFrame, QComboBox, QListView,
+                               QTreeWidget, QTreeWidgetItem)
+from PySide6.QtCore import (Qt, Signal, QMimeData, QAbstractListModel, QModelIndex,
+                            QSortFilterProxyModel, QTimer)
 from PySide6.QtGui import QIcon, QColor, QFont, QDrag
 
 from src.core.node_base import NodeType
 from src.core.theme_manager import ThemeManager
 from src.core.workflow_scanner import WorkflowScanner
 from src.core.node_registry import NodeRegistry, NodeSource, NODE_SOURCE_INFO, get_registry
+from src.core.node_search import NodeSearchIndex
+from src.core.dependency_index import DependencyIndex
 
 
-class DraggableListWidget(QListWidget):
+class NodeListModel(QAbstractListModel):
+    """
+    节点列表模型，行顺序即节点数据的顺序（与搜索索引的节点序号一致）
+    
+    节点以类型字符串为键：重新加载时只插入/删除有变化的行，
+    显示文本和颜色按节点类型缓存，节点未变化时直接复用。
+    """
+    
+    # 影响显示内容的字段，变化时需要重新生成缓存
+    DISPLAY_FIELDS = ('name', 'description', 'source', 'modified')
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = []    # 行 -> 节点类型
+        self._nodes = {}   # 节点类型 -> 节点数据
+        self._items = {}   # 节点类型 -> (显示文本, 前景色)
+    
+    @staticmethod
+    def _key(node_data):
+        return node_data.get('type_str', '')
+    
+    def set_nodes(self, nodes) -> bool:
+        """
+        更新节点数据，只对新增/删除/变化的节点发出行变化通知
+        
+        Returns:
+            节点列表是否有变化
+        """
+        nodes = list(nodes)
+        new_nodes = {self._key(node): node for node in nodes}
+        new_keys = list(new_nodes)
+        if len(new_keys) != len(nodes):
+            # 类型重复（不应出现），无法按键比较，整体重置
+            self._reset(nodes)
+            return True
+        
+        # 保留的节点相对顺序变化时无法通过插入/删除得到新顺序，整体重置
+        kept = [key for key in self._keys if key in new_nodes]
+        if kept != [key for key in new_keys if key in self._nodes]:
+            self._reset(nodes)
+            return True
+        
+        changed = False
+        
+        # 删除（从后往前按连续区间删除）
+        row = len(self._keys) - 1
+        while row >= 0:
+            if self._keys[row] in new_nodes:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._keys[row] not in new_nodes:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            for key in self._keys[row + 1:last + 1]:
+                del self._nodes[key]
+                self._items.pop(key, None)
+            del self._keys[row + 1:last + 1]
+            self.endRemoveRows()
+            changed = True
+        
+        # 插入（按连续区间插入到新位置）
+        row = 0
+        while row < len(new_keys):
+            if row < len(self._keys) and self._keys[row] == new_keys[row]:
+                row += 1
+                continue
+            first = row
+            while row < len(new_keys) and new_keys[row] not in self._nodes:
+                row += 1
+            self.beginInsertRows(QModelIndex(), first, row - 1)
+            self._keys[first:first] = new_keys[first:row]
+            for key in new_keys[first:row]:
+                self._nodes[key] = new_nodes[key]
+            self.endInsertRows()
+            changed = True
+        
+        # 更新保留的节点，显示内容变化的行使缓存失效并通知视图
+        for row, key in enumerate(self._keys):
+            old, new = self._nodes[key], new_nodes[key]
+            if old is new:
+                continue
+            self._nodes[key] = new
+            if any(old.get(field) != new.get(field) for field in self.DISPLAY_FIELDS):
+                self._items.pop(key, None)
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+                changed = True
+            elif old != new:
+                changed = True
+        return changed
+    
+    def _reset(self, nodes):
+        """整体替换节点数据"""
+        self.beginResetModel()
+        self._keys = [self._key(node) for node in nodes]
+        self._nodes = {self._key(node): node for node in nodes}
+        self._items = {}
+        self.endResetModel()
+    
+    def nodes(self):
+        """按行顺序返回节点数据"""
+        return [self._nodes[key] for key in self._keys]
+    
+    def _item(self, key):
+        """获取节点的显示文本和颜色（按节点类型缓存）"""
+        item = self._items.get(key)
+        if item is None:
+            node_data = self._nodes[key]
+            
+            # 获取来源信息
+            source = node_data.get('source', NodeSource.OFFICIAL)
+            source_info = NODE_SOURCE_INFO.get(source, NODE_SOURCE_INFO[NodeSource.OFFICIAL])
+            
+            # 设置文本：来源标签 + 名称 + 修改标记 (不使用图标)
+            is_modified = node_data.get('modified', False)
+            modified_marker = " ⚡已修改" if is_modified else ""
+            source_tag = f"[{source_info['name']}]"
+            text = f"{source_tag} {node_data['name']}{modified_marker}\n{node_data.get('description', '')}"
+            
+            # 修改过的用黄色，否则根据来源设置颜色
+            color = QColor("#FFC107") if is_modified else QColor(source_info['color'])
+            item = self._items[key] = (text, color)
+        return item
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._keys):
+            return None
+        
+        key = self._keys[index.row()]
+        if role == Qt.UserRole:
+            return self._nodes[key]
+        if role == Qt.DisplayRole:
+            return self._item(key)[0]
+        if role == Qt.ForegroundRole:
+            return self._item(key)[1]
+        return None
+    
+    def flags(self, index):
+        flags = super().flags(index)
+        return flags | Qt.ItemIsDragEnabled if index.isValid() else flags
+
+
+class NodeFilterProxyModel(QSortFilterProxyModel):
+    """
+    节点筛选代理
+    
+    搜索结果由 NodeSearchIndex 预先算出，这里只按结果隐藏行并按得分排序，
+    输入时不会重建列表项。
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source_filter = None
+        self._scores = None  # {源模型行号: 得分}，None 表示不按搜索过滤
+    
+    def set_filter(self, source_filter, scores):
+        """
+        Args:
+            source_filter: 只显示该来源的节点，None 表示全部
+            scores: 搜索得分，None 表示不按搜索过滤
+        """
+        self._source_filter = source_filter
+        self._scores = scores
+        self.invalidateFilter()
+        # 有搜索词时按相关度排序，否则保持原始顺序
+        self.sort(0 if scores is not None else -1, Qt.DescendingOrder)
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._scores is not None and source_row not in self._scores:
+            return False
+        if self._source_filter is not None:
+            node_data = self.sourceModel().index(source_row, 0).data(Qt.UserRole)
+            return node_data.get('source') == self._source_filter
+        return True
+    
+    def lessThan(self, left, right):
+        left_score = self._scores.get(left.row(), 0)
+        right_score = self._scores.get(right.row(), 0)
+        if left_score != right_score:
+            return left_score < right_score
+        # 得分相同时保持原始顺序（降序排列，因此行号大的视为"更小"）
+        return left.row() > right.row()
+
+
+class DraggableListView(QListView):
     """支持拖拽的列表控件"""
     
     def __init__(self, parent=None):
@@ -24,11 +216,11 @@ class DraggableListWidget(QListWidget):
     
     def startDrag(self, supportedActions):
         """开始拖拽"""
-        item = self.currentItem()
-        if not item:
+        index = self.currentIndex()
+        if not index.isValid():
             return
         
-        node_data = item.data(Qt.UserRole)
+        node_data = index.data(Qt.UserRole)
         if not node_data:
             return
         
@@ -40,10 +232,10 @@ class DraggableListWidget(QListWidget):
         node_type_str = node_data.get('type_str')
         if not node_type_str and node_data.get('type'):
             node_type_str = node_data['type'].value
-            
+        
         if not node_type_str:
             return
-            
+        
         mime_data.setText(node_type_str)
         drag.setMimeData(mime_data)
         
@@ -61,10 +253,24 @@ class NodeBrowserWidget(QWidget):
     # 信号：请求高亮当前工作流中的节点
     highlight_nodes_requested = Signal(str)  # node_type
     
-    def __init__(self, parent=None):
+    # 搜索输入防抖间隔（毫秒）
+    FILTER_DEBOUNCE_MS = 150
+    
+    def __init__(self, parent=None, live_updates: bool = False):
+        """
+        Args:
+            parent: 父控件
+            live_updates: 工作流变化是否由文件监视器通过 apply_workflow_changes() 推送
+        """
         super().__init__(parent)
-        self._scanner = WorkflowScanner()
+        self._scanner = WorkflowScanner(live=live_updates)
+        self._dependency_index = DependencyIndex(self._scanner)
         self._current_workflow_name = None
+        # 搜索输入防抖：停止输入一小段时间后才应用筛选
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._apply_filters)
         self._setup_ui()
         self._load_nodes()
     
@@ -113,6 +319,10 @@ class NodeBrowserWidget(QWidget):
         
         # Tab 2: 使用统计
         self._setup_usage_stats_tab()
+        
+        # Tab 3: 依赖
+        self._setup_dependency_tab()
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
     
     def _setup_node_list_tab(self):
         """设置节点列表Tab"""
@@ -164,11 +374,19 @@ class NodeBrowserWidget(QWidget):
             }}
         """)
         
-        # 节点列表 - 使用自定义可拖拽列表
-        self.node_list = DraggableListWidget()
+        # 节点列表 - 模型/视图，搜索时只通过代理隐藏和排序行
+        self._node_model = NodeListModel(self)
+        self._node_proxy = NodeFilterProxyModel(self)
+        self._node_proxy.setSourceModel(self._node_model)
+        self._search_index = NodeSearchIndex()
+        self._search_index_size = -1
+        
+        self.node_list = DraggableListView()
+        self.node_list.setModel(self._node_proxy)
+        self.node_list.setUniformItemSizes(True)
         self.node_list.setStyleSheet(self._get_list_style())
-        self.node_list.itemClicked.connect(self._on_node_clicked)
-        self.node_list.itemDoubleClicked.connect(self._on_node_double_clicked)
+        self.node_list.clicked.connect(self._on_node_clicked)
+        self.node_list.doubleClicked.connect(self._on_node_double_clicked)
         splitter.addWidget(self.node_list)
         
         # 节点使用详情区域
@@ -240,23 +458,64 @@ class NodeBrowserWidget(QWidget):
         
         self.tab_widget.addTab(tab_widget, "使用统计")
     
+    def _setup_dependency_tab(self):
+        """设置依赖Tab：依赖包 -> 节点 -> 工作流"""
+        self._dependency_tab = QWidget()
+        tab_layout = QVBoxLayout(self._dependency_tab)
+        tab_layout.setContentsMargins(5, 5, 5, 5)
+        tab_layout.setSpacing(5)
+        
+        self.dependency_input = QLineEdit()
+        self.dependency_input.setPlaceholderText("输入依赖包，如 pandas 或 pandas>=2")
+        self.dependency_input.setStyleSheet(ThemeManager.get_input_style())
+        self.dependency_input.textChanged.connect(self._update_dependency_tree)
+        tab_layout.addWidget(self.dependency_input)
+        
+        self.dependency_tree = QTreeWidget()
+        self.dependency_tree.setHeaderHidden(True)
+        self.dependency_tree.setStyleSheet(f"""
+            QTreeWidget {{
+                background-color: {ThemeManager.COLORS['surface']};
+                border: 1px solid {ThemeManager.COLORS['border']};
+                color: {ThemeManager.COLORS['text']};
+                outline: none;
+            }}
+            QTreeWidget::item {{
+                padding: 4px;
+            }}
+            QTreeWidget::item:selected {{
+                background-color: {ThemeManager.COLORS['selection']};
+                color: {ThemeManager.COLORS['white']};
+            }}
+        """)
+        self.dependency_tree.itemDoubleClicked.connect(self._on_dependency_item_double_clicked)
+        tab_layout.addWidget(self.dependency_tree)
+        
+        self.dependency_hint = QLabel("双击工作流可打开并高亮节点")
+        self.dependency_hint.setStyleSheet(f"color: {ThemeManager.COLORS['text_secondary']}; font-size: 9pt; padding: 5px;")
+        self.dependency_hint.setAlignment(Qt.AlignCenter)
+        tab_layout.addWidget(self.dependency_hint)
+        
+        self.tab_widget.addTab(self._dependency_tab, "依赖")
+    
     def _get_list_style(self) -> str:
         """获取列表控件样式"""
+        # QListView 选择器同时作用于 QListWidget
         return f"""
-            QListWidget {{
+            QListView {{
                 background-color: {ThemeManager.COLORS['surface']};
                 border: 1px solid {ThemeManager.COLORS['border']};
                 color: {ThemeManager.COLORS['text']};
                 outline: none;
             }}
-            QListWidget::item {{
+            QListView::item {{
                 padding: 8px;
                 border-bottom: 1px solid {ThemeManager.COLORS['surface_light']};
             }}
-            QListWidget::item:hover {{
+            QListView::item:hover {{
                 background-color: {ThemeManager.COLORS['surface_light']};
             }}
-            QListWidget::item:selected {{
+            QListView::item:selected {{
                 background-color: {ThemeManager.COLORS['selection']};
                 color: {ThemeManager.COLORS['white']};
             }}
@@ -266,40 +525,33 @@ class NodeBrowserWidget(QWidget):
         """加载节点列表"""
         # 从节点注册表加载节点
         self._registry = get_registry()
+        self._registry_version = self._registry.version
         self.nodes_data = self._registry.get_all_nodes()
         self._current_source_filter = None
         self._populate_list(self.nodes_data)
     
+    def reload_nodes(self):
+        """节点注册表变化后重新加载节点列表（保留当前筛选条件）"""
+        if self._registry.version == self._registry_version:
+            return
+        self._registry_version = self._registry.version
+        self.nodes_data = self._registry.get_all_nodes()
+        self._populate_list(self.nodes_data)
+        self._update_dependency_tree()
+    
     def _populate_list(self, nodes):
-        """填充节点列表"""
-        self.node_list.clear()
+        """
+        更新节点列表
         
-        for node_data in nodes:
-            item = QListWidgetItem()
-            
-            # 获取来源信息
-            source = node_data.get('source', NodeSource.OFFICIAL)
-            source_info = NODE_SOURCE_INFO.get(source, NODE_SOURCE_INFO[NodeSource.OFFICIAL])
-            
-            # 是否已修改
-            is_modified = node_data.get('modified', False)
-            modified_marker = " ⚡已修改" if is_modified else ""
-            
-            # 设置文本：来源标签 + 名称 + 修改标记 (不使用图标)
-            source_tag = f"[{source_info['name']}]"
-            text = f"{source_tag} {node_data['name']}{modified_marker}\n{node_data.get('description', '')}"
-            item.setText(text)
-            
-            # 设置数据
-            item.setData(Qt.UserRole, node_data)
-            
-            # 根据来源设置颜色
-            if is_modified:
-                item.setForeground(QColor("#FFC107"))  # 修改过的用黄色
-            else:
-                item.setForeground(QColor(source_info['color']))
-            
-            self.node_list.addItem(item)
+        模型只插入/删除有变化的行，节点列表没有变化时不重建搜索索引、不重新筛选。
+        """
+        if not self._node_model.set_nodes(nodes) and self._search_index_size == len(nodes):
+            return
+        # 搜索索引的节点序号需与模型的行一致
+        nodes = self._node_model.nodes()
+        self._search_index.build(nodes)
+        self._search_index_size = len(nodes)
+        self._apply_filters()
     
     def _on_source_filter_changed(self, index):
         """来源筛选变化"""
@@ -318,38 +570,22 @@ class NodeBrowserWidget(QWidget):
         from src.dialogs.add_node_dialog import AddNodeDialog
         dialog = AddNodeDialog(self)
         if dialog.exec():
-            # 刷新节点列表
-            self._load_nodes()
+            # 刷新节点列表（只更新变化的节点）
+            self.reload_nodes()
     
     def _apply_filters(self):
-        """应用筛选条件"""
-        search_text = self.search_input.text().lower()
-        
-        filtered = []
-        for node in self.nodes_data:
-            # 来源筛选
-            if self._current_source_filter is not None:
-                if node.get('source') != self._current_source_filter:
-                    continue
-            
-            # 搜索筛选
-            if search_text:
-                if (search_text not in node['name'].lower() and 
-                    search_text not in node['description'].lower() and
-                    search_text not in node['category'].lower()):
-                    continue
-            
-            filtered.append(node)
-        
-        self._populate_list(filtered)
+        """应用筛选条件（查询倒排索引，只更新代理的过滤和排序）"""
+        self._filter_timer.stop()
+        scores = self._search_index.search(self.search_input.text())
+        self._node_proxy.set_filter(self._current_source_filter, scores)
     
     def _filter_nodes(self, text):
-        """过滤节点"""
-        self._apply_filters()
+        """过滤节点（防抖，连续输入只在停顿后筛选一次）"""
+        self._filter_timer.start()
     
-    def _on_node_clicked(self, item):
+    def _on_node_clicked(self, index):
         """节点被点击"""
-        node_data = item.data(Qt.UserRole)
+        node_data = index.data(Qt.UserRole)
         # 获取节点类型字符串
         node_type_str = node_data.get('type_str', '')
         if node_data.get('type'):
@@ -395,9 +631,9 @@ class NodeBrowserWidget(QWidget):
                 data["node_type"]
             )
     
-    def _on_node_double_clicked(self, item):
+    def _on_node_double_clicked(self, index):
         """节点被双击"""
-        node_data = item.data(Qt.UserRole)
+        node_data = index.data(Qt.UserRole)
         print(f"双击节点: {node_data['name']}")
         
         # 通知主窗口添加节点到画布中心
@@ -408,12 +644,65 @@ class NodeBrowserWidget(QWidget):
                 node_type_str = node_data.get('type_str')
                 if not node_type_str and node_data.get('type'):
                     node_type_str = node_data['type'].value
-                    
+                
                 if node_type_str:
                     widget.add_node_to_canvas(node_type_str)
                 break
             widget = widget.parent() if hasattr(widget, 'parent') else None
     
+    def _on_tab_changed(self, index):
+        """切换到依赖Tab时刷新（依赖树只在可见时更新）"""
+        if self.tab_widget.widget(index) is self._dependency_tab:
+            self._update_dependency_tree()
+    
+    def _update_dependency_tree(self):
+        """按输入的依赖包更新依赖树"""
+        if self.tab_widget.currentWidget() is not self._dependency_tab:
+            return
+        
+        self.dependency_tree.clear()
+        usages = self._dependency_index.find_usages(self.dependency_input.text())
+        
+        package_items = {}
+        workflow_names = set()
+        for usage in usages:
+            package_item = package_items.get(usage.package)
+            if package_item is None:
+                package_item = package_items[usage.package] = QTreeWidgetItem([f"📦 {usage.package}"])
+                self.dependency_tree.addTopLevelItem(package_item)
+            
+            node_item = QTreeWidgetItem(package_item, [
+                f"{usage.node_name}  ({usage.requirement})  {len(usage.workflows)}个工作流"
+            ])
+            for wf_info in usage.workflows:
+                workflow_item = QTreeWidgetItem(node_item, [f"📁 {wf_info.workflow_name}  ({wf_info.count}次)"])
+                workflow_item.setData(0, Qt.UserRole, {
+                    "workflow_name": wf_info.workflow_name,
+                    "workflow_path": wf_info.workflow_path,
+                    "node_type": usage.node_type,
+                })
+                workflow_names.add(wf_info.workflow_name)
+        
+        for package_item in package_items.values():
+            package_item.setExpanded(len(package_items) == 1)
+        
+        if not usages:
+            self.dependency_hint.setText("没有节点声明该依赖")
+        else:
+            self.dependency_hint.setText(
+                f"{len(package_items)} 个依赖包，{len(workflow_names)} 个工作流受影响\n双击工作流可打开并高亮节点"
+            )
+    
+    def _on_dependency_item_double_clicked(self, item, column):
+        """依赖树中的工作流被双击"""
+        data = item.data(0, Qt.UserRole)
+        if data:
+            self.open_workflow_requested.emit(
+                data["workflow_name"],
+                data["workflow_path"],
+                data["node_type"]
+            )
+    
     def _on_stats_item_clicked(self, item):
         """统计列表项被点击"""
         data = item.data(Qt.UserRole)
@@ -506,14 +795,30 @@ class NodeBrowserWidget(QWidget):
     def refresh_node_usage(self):
         """刷新节点使用情况（重新扫描工作流目录）"""
         self._scanner.scan_all_workflows()
+        self._refresh_usage_views()
+    
+    def apply_workflow_changes(self, workflow_paths):
+        """
+        工作流文件变化后增量更新使用索引，不重新扫描目录
         
+        Args:
+            workflow_paths: 发生变化的 workflow.json 路径列表
+        """
+        for path in workflow_paths:
+            self._scanner.refresh_workflow(path)
+        self._refresh_usage_views()
+    
+    def _refresh_usage_views(self):
+        """按当前索引刷新使用列表和工作流统计"""
         # 如果当前有选中的节点，刷新使用列表
-        current_item = self.node_list.currentItem()
-        if current_item:
-            node_data = current_item.data(Qt.UserRole)
+        current_index = self.node_list.currentIndex()
+        if current_index.isValid():
+            node_data = current_index.data(Qt.UserRole)
             if node_data:
-                self._update_usage_list(node_data['type'].value)
+                self._update_usage_list(node_data['type_str'])
         
         # 刷新当前工作流统计
         if self._current_workflow_name:
             self.update_workflow_stats(self._current_workflow_name)
+        
+        self._update_dependency_tree()
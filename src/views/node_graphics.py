@@ -2,19 +2,93 @@
 节点图形组件
 用于在画板上显示和交互的节点
 """
-from PySide6.QtWidgets import (QGraphicsItem, QGraphicsTextItem, 
-                               QGraphicsRectItem, QGraphicsEllipseItem,
-                               QMenu, QGraphicsSceneMouseEvent)
+from PySide6.QtWidgets import (QGraphicsItem, QMenu, QGraphicsSceneMouseEvent,
+                               QStyleOptionGraphicsItem)
 from PySide6.QtCore import Qt, QRectF, QPointF
-from PySide6.QtGui import QBrush, QColor, QPen, QFont, QPainter
+from PySide6.QtGui import (QBrush, QColor, QPen, QFont, QPainter, QPainterPath,
+                           QStaticText, QTransform)
 
 from src.core.node_base import NodeType
 from src.core.theme_manager import ThemeManager
 
 
+# 细节层次阈值（levelOfDetailFromTransform 的值，1 表示原始大小）
+# 不低于 LOD_FULL 时完整绘制；不低于 LOD_SIMPLE 时绘制无文字、无抗锯齿的简化方框；
+# 更小时每个节点只绘制一个色块
+LOD_FULL = 0.5
+LOD_SIMPLE = 0.2
+
+
+def level_of_detail(painter: QPainter) -> float:
+    """当前绘制的细节层次（视图缩放比例）"""
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+
+
+class NodeTextCache:
+    """
+    节点文本的共享缓存
+    
+    字体和排版好的 QStaticText 按（文本, 字体）缓存，相同标题/类型的节点共用同一份，
+    由节点在 paint 中直接绘制，不再为每个节点创建文本子项。颜色在绘制时由画笔决定。
+    """
+    
+    _fonts = {}
+    _texts = {}
+    
+    @classmethod
+    def font(cls, point_size: int, bold: bool = False) -> QFont:
+        """获取共享字体"""
+        key = (point_size, bold)
+        font = cls._fonts.get(key)
+        if font is None:
+            font = cls._fonts[key] = QFont("Arial", point_size, QFont.Bold if bold else QFont.Normal)
+        return font
+    
+    @classmethod
+    def text(cls, text: str, font: QFont) -> QStaticText:
+        """获取已按字体排版的静态文本"""
+        key = (text, font.key())
+        static_text = cls._texts.get(key)
+        if static_text is None:
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(QTransform(), font)
+            cls._texts[key] = static_text
+        return static_text
+
+
 class NodeGraphicsItem(QGraphicsItem):
     """节点图形项"""
     
+    # 节点使用设备坐标缓存：未变化的节点重绘时直接复用缓存的像素，
+    # 缩放后缓存失效并按新的细节层次重新绘制
+    USE_ITEM_CACHE = True
+    
+    # 尺寸（所有节点相同，作为类属性共享）
+    width = 180
+    height = 80
+    header_height = 30
+    corner_radius = 8
+    port_radius = 6
+    # 边界矩形在节点主体外的余量（选中边框和端口）
+    MARGIN = 8
+    
+    # 文本颜色
+    TITLE_COLOR = QColor(ThemeManager.COLORS['white'])
+    TYPE_COLOR = QColor(ThemeManager.COLORS['text_secondary'])
+    
+    # 所有节点共享的画笔和画刷
+    SELECTED_COLOR = QColor(ThemeManager.COLORS['accent'])
+    EXECUTING_COLOR = QColor("#4CAF50")
+    ERROR_COLOR = QColor("#f44336")
+    BODY_BRUSH = QBrush(QColor(ThemeManager.COLORS['surface']))
+    BORDER_PEN = QPen(QColor(ThemeManager.COLORS['border']), 1)
+    SELECTED_PEN = QPen(SELECTED_COLOR, 3)
+    EXECUTING_PEN = QPen(EXECUTING_COLOR, 2)
+    ERROR_PEN = QPen(ERROR_COLOR, 3)
+    PORT_BRUSH = QBrush(QColor(ThemeManager.COLORS['success']))
+    PORT_PEN = QPen(QColor(ThemeManager.COLORS['surface']), 2)
+    
     # 节点类型对应的颜色
     NODE_COLORS = {
         NodeType.VARIABLE_ASSIGN: "#4CAF50",    # 绿色
@@ -23,6 +97,8 @@ class NodeGraphicsItem(QGraphicsItem):
         NodeType.SQLITE_EXECUTE: "#9C27B0",     # 紫色
         NodeType.SQL_STATEMENT: "#00BCD4",      # 青色
     }
+    # 节点类型 -> 头部颜色（按需生成）
+    _header_colors = {}
     
     def __init__(self, node_id: str, node_type, title: str = None, parent=None):
         """
@@ -40,108 +116,134 @@ class NodeGraphicsItem(QGraphicsItem):
         self.node_type = node_type
         
         # 处理节点值和标题
-        node_type_val = node_type.value if hasattr(node_type, "value") else str(node_type)
-        self.title = title or node_type_val
+        self.title = title or self.node_type_value
         self.config = {}  # 节点配置
         
-        # 尺寸
-        self.width = 180
-        self.height = 80
-        self.header_height = 30
-        self.corner_radius = 8
-        
-        # 颜色
-        color_hex = self.NODE_COLORS.get(node_type, "#607D8B")
-        self.color = QColor(color_hex)
-        self.header_color = self.color.darker(110)
-        self.body_color = QColor(ThemeManager.COLORS['surface'])
-        self.border_color = QColor(ThemeManager.COLORS['border'])
-        self.selected_color = QColor(ThemeManager.COLORS['accent'])
+        # 头部颜色（同类型节点共用一个 QColor）
+        self.header_color = self._header_color(node_type)
         
         # 状态
-        self.is_selected = False
         self.is_executing = False
         self.is_error = False
         
-        # 选中的画笔
-        self.selected_pen = QPen(self.selected_color, 3)
-        
         # 设置标志
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
         self.setFlag(QGraphicsItem.ItemIsFocusable, True)
         
-        # 创建文本项
-        self._create_text_items()
+        # 文本（共享排版结果，在 paint 中绘制）
+        self._layout_texts()
+        
+        if self.USE_ITEM_CACHE:
+            self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         
         # 输入输出端口
         self.input_ports = []
         self.output_ports = []
         self._create_ports()
     
-    def _create_text_items(self):
-        """创建文本项"""
-        # 标题文本
-        self.title_item = QGraphicsTextItem(self.title, self)
-        self.title_item.setDefaultTextColor(QColor(ThemeManager.COLORS['white']))
-        font = QFont("Arial", 10, QFont.Bold)
-        self.title_item.setFont(font)
-        
-        # 居中标题
-        title_width = self.title_item.boundingRect().width()
-        self.title_item.setPos(
-            (self.width - title_width) / 2,
-            (self.header_height - self.title_item.boundingRect().height()) / 2
+    @classmethod
+    def _header_color(cls, node_type) -> QColor:
+        """节点类型对应的头部颜色（按类型缓存）"""
+        color = cls._header_colors.get(node_type)
+        if color is None:
+            color = cls._header_colors[node_type] = QColor(cls.NODE_COLORS.get(node_type, "#607D8B")).darker(110)
+        return color
+    
+    @property
+    def node_type_value(self) -> str:
+        """节点类型值（NodeType 枚举取其值，自定义节点即字符串本身）"""
+        return self.node_type.value if hasattr(self.node_type, "value") else str(self.node_type)
+    
+    def _layout_texts(self):
+        """从共享缓存获取标题和类型文本，并计算居中位置"""
+        # 标题文本（头部居中）
+        self._title_font = NodeTextCache.font(10, bold=True)
+        self._title_text = NodeTextCache.text(self.title, self._title_font)
+        title_size = self._title_text.size()
+        self._title_pos = QPointF(
+            (self.width - title_size.width()) / 2,
+            (self.header_height - title_size.height()) / 2
         )
         
-        # 节点类型文本
-        node_type_val = self.node_type.value if hasattr(self.node_type, "value") else str(self.node_type)
-        self.type_item = QGraphicsTextItem(node_type_val, self)
-        self.type_item.setDefaultTextColor(QColor(ThemeManager.COLORS['text_secondary']))
-        font = QFont("Arial", 8)
-        self.type_item.setFont(font)
-        
-        # 居中类型
-        type_width = self.type_item.boundingRect().width()
-        self.type_item.setPos(
-            (self.width - type_width) / 2,
-            self.header_height + 10
+        # 节点类型文本（主体上方居中）
+        self._type_font = NodeTextCache.font(8)
+        self._type_text = NodeTextCache.text(self.node_type_value, self._type_font)
+        self._type_pos = QPointF(
+            (self.width - self._type_text.size().width()) / 2,
+            self.header_height + 14
         )
     
     def _create_ports(self):
-        """创建输入输出端口"""
-        port_radius = 6
-        
+        """创建输入输出端口（由节点绘制，不是子图元）"""
         # 输入端口（左侧）
-        input_port = PortGraphicsItem(
-            self, 
-            PortType.INPUT, 
-            QPointF(0, self.height / 2),
-            port_radius
-        )
-        self.input_ports.append(input_port)
+        self.input_ports.append(NodePort(self, PortType.INPUT, QPointF(0, self.height / 2), self.port_radius))
         
         # 输出端口（右侧）
-        output_port = PortGraphicsItem(
-            self,
-            PortType.OUTPUT,
-            QPointF(self.width, self.height / 2),
-            port_radius
-        )
-        self.output_ports.append(output_port)
+        self.output_ports.append(NodePort(self, PortType.OUTPUT, QPointF(self.width, self.height / 2), self.port_radius))
     
     def boundingRect(self) -> QRectF:
-        """返回边界矩形"""
-        return QRectF(0, 0, self.width, self.height)
+        """返回边界矩形（包含选中边框和端口）"""
+        margin = self.MARGIN
+        return QRectF(-margin, -margin, self.width + margin * 2, self.height + margin * 2)
+    
+    def shape(self) -> QPainterPath:
+        """点击区域为节点主体和端口"""
+        path = QPainterPath()
+        path.addRect(0, 0, self.width, self.height)
+        for port in self.input_ports + self.output_ports:
+            path.addEllipse(port.rect())
+        return path
+    
+    def port_at(self, scene_pos: QPointF):
+        """
+        获取场景坐标处的端口
+        
+        Returns:
+            NodePort，不在任何端口上时返回 None
+        """
+        local_pos = self.mapFromScene(scene_pos)
+        for port in self.input_ports + self.output_ports:
+            if port.contains(local_pos):
+                return port
+        return None
+    
+    def _state_pen(self) -> QPen:
+        """选中/错误/执行状态对应的边框画笔，无特殊状态时返回 None"""
+        if self.isSelected():
+            return self.SELECTED_PEN
+        if self.is_error:
+            return self.ERROR_PEN
+        if self.is_executing:
+            return self.EXECUTING_PEN
+        return None
+    
+    def _paint_ports(self, painter: QPainter):
+        """绘制端口"""
+        painter.setPen(self.PORT_PEN)
+        painter.setBrush(self.PORT_BRUSH)
+        for port in self.input_ports + self.output_ports:
+            painter.drawEllipse(port.rect())
     
     def paint(self, painter: QPainter, option, widget=None):
-        """绘制节点"""
+        """绘制节点（按细节层次选择绘制方式）"""
+        lod = level_of_detail(painter)
+        if lod < LOD_SIMPLE:
+            # 远景：只绘制一个色块，状态用颜色表示
+            state_pen = self._state_pen()
+            painter.fillRect(0, 0, self.width, self.height,
+                             state_pen.color() if state_pen is not None else self.header_color)
+            return
+        if lod < LOD_FULL:
+            self._paint_simple(painter)
+            return
+        
         painter.setRenderHint(QPainter.Antialiasing)
         
         # 选中状态边框（使用Qt的选中状态）
         if self.isSelected():
-            painter.setPen(self.selected_pen)
+            painter.setPen(self.SELECTED_PEN)
             painter.setBrush(Qt.NoBrush)
             painter.drawRoundedRect(
                 -2, -2, 
@@ -150,15 +252,15 @@ class NodeGraphicsItem(QGraphicsItem):
             )
         
         # 绘制主体
-        painter.setPen(QPen(self.border_color, 1))
-        painter.setBrush(QBrush(self.body_color))
+        painter.setPen(self.BORDER_PEN)
+        painter.setBrush(self.BODY_BRUSH)
         painter.drawRoundedRect(
             0, 0, self.width, self.height,
             self.corner_radius, self.corner_radius
         )
         
         # 绘制头部
-        painter.setBrush(QBrush(self.header_color))
+        painter.setBrush(self.header_color)
         painter.drawRoundedRect(
             0, 0, self.width, self.header_height,
             self.corner_radius, self.corner_radius
@@ -171,9 +273,17 @@ class NodeGraphicsItem(QGraphicsItem):
             self.width, self.corner_radius
         )
         
+        # 绘制文本
+        painter.setFont(self._title_font)
+        painter.setPen(self.TITLE_COLOR)
+        painter.drawStaticText(self._title_pos, self._title_text)
+        painter.setFont(self._type_font)
+        painter.setPen(self.TYPE_COLOR)
+        painter.drawStaticText(self._type_pos, self._type_text)
+        
         # 执行状态指示
         if self.is_executing:
-            painter.setPen(QPen(QColor("#4CAF50"), 2))
+            painter.setPen(self.EXECUTING_PEN)
             painter.setBrush(Qt.NoBrush)
             painter.drawRoundedRect(
                 0, 0, self.width, self.height,
@@ -182,12 +292,30 @@ class NodeGraphicsItem(QGraphicsItem):
         
         # 错误状态指示
         if self.is_error:
-            painter.setPen(QPen(QColor("#f44336"), 3))
+            painter.setPen(self.ERROR_PEN)
             painter.setBrush(Qt.NoBrush)
             painter.drawRoundedRect(
                 0, 0, self.width, self.height,
                 self.corner_radius, self.corner_radius
             )
+        
+        self._paint_ports(painter)
+    
+    def _paint_simple(self, painter: QPainter):
+        """中景：直角方框，不抗锯齿、不绘制文字"""
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setPen(self.BORDER_PEN)
+        painter.setBrush(self.BODY_BRUSH)
+        painter.drawRect(0, 0, self.width, self.height)
+        painter.fillRect(0, 0, self.width, self.header_height, self.header_color)
+        
+        state_pen = self._state_pen()
+        if state_pen is not None:
+            painter.setPen(state_pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(-2, -2, self.width + 4, self.height + 4)
+        
+        self._paint_ports(painter)
     
     def mousePressEvent(self, event: QGraphicsSceneMouseEvent):
         """鼠标按下事件"""
@@ -203,6 +331,16 @@ class NodeGraphicsItem(QGraphicsItem):
         if change == QGraphicsItem.ItemSelectedHasChanged:
             # 选中状态改变时更新显示
             self.update()
+        elif change == QGraphicsItem.ItemPositionHasChanged:
+            # 节点移动后只让相连的连接线更新各自的区域；
+            # 画布场景会把同一帧内的移动合并为一次更新
+            scene = self.scene()
+            if hasattr(scene, 'node_moved'):
+                scene.node_moved(self)
+            else:
+                for port in self.input_ports + self.output_ports:
+                    for connection in port.connections:
+                        connection.update_path()
         return super().itemChange(change, value)
     
     def contextMenuEvent(self, event):
@@ -276,41 +414,52 @@ class PortType:
     OUTPUT = "output"
 
 
-class PortGraphicsItem(QGraphicsEllipseItem):
-    """端口图形项"""
+class NodePort:
+    """
+    节点端口
+    
+    端口由所属节点绘制并按几何位置做点击检测，本身不是图元，只记录位置和连接线。
+    """
+    
+    __slots__ = ("parent_node", "port_type", "position", "radius", "connections")
+    
+    # 点击检测时在端口半径外额外放宽的距离
+    HIT_TOLERANCE = 2
     
     def __init__(self, parent_node: NodeGraphicsItem, port_type: str, position: QPointF, radius: float = 6):
         """
         初始化端口
         
         Args:
-            parent_node: 父节点
+            parent_node: 所属节点
             port_type: 端口类型（INPUT/OUTPUT）
-            position: 相对于父节点的位置
+            position: 端口中心相对于节点的位置
             radius: 端口半径
         """
-        super().__init__(
-            position.x() - radius,
-            position.y() - radius,
-            radius * 2,
-            radius * 2,
-            parent_node
-        )
-        
         self.parent_node = parent_node
         self.port_type = port_type
+        self.position = position
         self.radius = radius
         
-        # 样式
-        self.setBrush(QBrush(QColor(ThemeManager.COLORS['success'])))
-        self.setPen(QPen(QColor(ThemeManager.COLORS['surface']), 2))
-        
         # 连接线
         self.connections = []
     
+    def rect(self) -> QRectF:
+        """端口在节点坐标系中的外接矩形"""
+        return QRectF(
+            self.position.x() - self.radius, self.position.y() - self.radius,
+            self.radius * 2, self.radius * 2
+        )
+    
+    def contains(self, local_pos: QPointF) -> bool:
+        """节点坐标系中的点是否落在端口上"""
+        delta = local_pos - self.position
+        hit_radius = self.radius + self.HIT_TOLERANCE
+        return delta.x() * delta.x() + delta.y() * delta.y() <= hit_radius * hit_radius
+    
     def get_scene_position(self) -> QPointF:
         """获取在场景中的位置"""
-        return self.parentItem().scenePos() + self.rect().center()
+        return self.parent_node.scenePos() + self.position
     
     def add_connection(self, connection):
         """添加连接"""
@@ -325,7 +474,7 @@ class PortGraphicsItem(QGraphicsEllipseItem):
 class ConnectionGraphicsItem(QGraphicsItem):
     """连接线图形项"""
     
-    def __init__(self, start_port: PortGraphicsItem, end_port: PortGraphicsItem = None):
+    def __init__(self, start_port: NodePort, end_port: NodePort = None):
         """
         初始化连接线
         
@@ -350,8 +499,16 @@ class ConnectionGraphicsItem(QGraphicsItem):
             self.end_port.add_connection(self)
         
         self.setZValue(-1)  # 放在节点下层
+        # 绘制时需要 option.exposedRect 来剔除不在重绘区域内的曲线
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        
+        # 缓存的几何信息，只在端点位置变化时由 update_path() 重新计算
+        self._endpoints = None
+        self._path = QPainterPath()
+        self._bounds = QRectF()
+        self._rebuild_geometry(self._current_endpoints())
     
-    def set_end_port(self, end_port: PortGraphicsItem):
+    def set_end_port(self, end_port: NodePort):
         """设置结束端口"""
         if self.end_port:
             self.end_port.remove_connection(self)
@@ -361,6 +518,11 @@ class ConnectionGraphicsItem(QGraphicsItem):
         if self.end_port:
             self.end_port.add_connection(self)
         
+        # 端点所属节点变化，更新画布的邻接索引
+        scene = self.scene()
+        if hasattr(scene, 'register_connection'):
+            scene.register_connection(self)
+        
         self.update_path()
     
     def set_end_pos(self, pos: QPointF):
@@ -369,44 +531,39 @@ class ConnectionGraphicsItem(QGraphicsItem):
         self.update_path()
     
     def update_path(self):
-        """更新路径"""
+        """
+        端点可能变化时更新缓存的路径
+        
+        端点位置没有变化时不做任何事；否则只重绘连接线自身的旧区域和新区域
+        """
+        endpoints = self._current_endpoints()
+        if endpoints == self._endpoints:
+            return
         self.prepareGeometryChange()
+        self._rebuild_geometry(endpoints)
         self.update()
     
-    def boundingRect(self) -> QRectF:
-        """返回边界矩形"""
+    def _current_endpoints(self):
+        """两端在场景中的位置 (start, end)，没有终点时返回 None"""
         if not self.start_port:
-            return QRectF()
-        
-        start = self.start_port.get_scene_position()
-        
+            return None
         if self.end_port:
             end = self.end_port.get_scene_position()
         elif self.end_pos:
-            end = self.end_pos
+            end = QPointF(self.end_pos)
         else:
-            end = start
-        
-        return QRectF(start, end).normalized().adjusted(-10, -10, 10, 10)
+            return None
+        return self.start_port.get_scene_position(), end
     
-    def paint(self, painter: QPainter, option, widget=None):
-        """绘制连接线"""
-        if not self.start_port:
-            return
-        
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        start = self.start_port.get_scene_position()
-        
-        if self.end_port:
-            end = self.end_port.get_scene_position()
-        elif self.end_pos:
-            end = self.end_pos
-        else:
+    def _rebuild_geometry(self, endpoints):
+        """根据端点计算贝塞尔路径和边界矩形（连接线位于场景原点，场景坐标即本地坐标）"""
+        self._endpoints = endpoints
+        self._path = QPainterPath()
+        if endpoints is None:
+            self._bounds = QRectF()
             return
         
-        # 绘制贝塞尔曲线
-        painter.setPen(self.pen)
+        start, end = endpoints
         
         # 计算控制点
         dx = abs(end.x() - start.x())
@@ -415,10 +572,35 @@ class ConnectionGraphicsItem(QGraphicsItem):
         ctrl1 = QPointF(start.x() + offset, start.y())
         ctrl2 = QPointF(end.x() - offset, end.y())
         
-        # 绘制路径
-        from PySide6.QtGui import QPainterPath
-        path = QPainterPath()
-        path.moveTo(start)
-        path.cubicTo(ctrl1, ctrl2, end)
+        self._path.moveTo(start)
+        self._path.cubicTo(ctrl1, ctrl2, end)
         
-        painter.drawPath(path)
+        # 曲线位于两端点和两个控制点的凸包内（反向连线时控制点在端点外侧）
+        self._bounds = self._path.controlPointRect().adjusted(-10, -10, 10, 10)
+    
+    def boundingRect(self) -> QRectF:
+        """返回边界矩形"""
+        return self._bounds
+    
+    def paint(self, painter: QPainter, option, widget=None):
+        """绘制连接线（使用缓存的路径）"""
+        if self._endpoints is None:
+            return
+        
+        painter.setPen(self.pen)
+        
+        # 远景时画直线，不抗锯齿
+        if level_of_detail(painter) < LOD_SIMPLE:
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.drawLine(*self._endpoints)
+            return
+        
+        # 视图只按边界矩形剔除图元；长连线的边界矩形很大，曲线本身可能完全不在重绘区域内
+        exposed = option.exposedRect
+        if not exposed.contains(self._bounds):
+            width = self.pen.widthF()
+            if not self._path.intersects(exposed.adjusted(-width, -width, width, width)):
+                return
+        
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPath(self._path)
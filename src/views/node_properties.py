@@ -544,7 +544,7 @@ class NodePropertiesWidget(QWidget):
                 widget = self.parent()
                 while widget:
                     if hasattr(widget, 'node_browser'):
-                        widget.node_browser._load_nodes()
+                        widget.node_browser.reload_nodes()
                         break
                     widget = widget.parent() if hasattr(widget, 'parent') else None
             else:
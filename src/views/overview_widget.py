@@ -1,84 +1,256 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
-                               QScrollArea, QGridLayout, QFrame, QHBoxLayout, QMessageBox)
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QIcon, QPixmap, QFont
+                               QFrame, QHBoxLayout, QMessageBox, QListView,
+                               QAbstractItemView, QStyledItemDelegate, QStyle)
+from PySide6.QtCore import (Qt, Signal, QTimer, QObject, QRunnable, QThreadPool,
+                            QAbstractListModel, QModelIndex, QSize, QRect, QEvent)
+from PySide6.QtGui import QIcon, QPixmap, QFont, QPainter, QColor, QPen
 import os
-import json
 import shutil
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional
 
 from src.core.theme_manager import ThemeManager
 
 
-class WorkflowCard(QFrame):
-    """工作流卡片"""
+def _read_workflow_metadata(workflow_path: str) -> Optional[dict]:
+    """读取工作流卡片显示的元数据（在后台线程中调用），文件无效时返回 None"""
+    from src.core.workflow_metadata import load_metadata
+    return load_metadata(workflow_path)
+
+
+class _MetadataSignals(QObject):
+    """后台元数据任务的信号（不设置父对象，任务结束前保持有效）"""
+    loaded = Signal(str, int, object)  # workflow_path, generation, metadata
+
+
+class _MetadataTask(QRunnable):
+    """在线程池中批量读取工作流元数据"""
+    
+    def __init__(self, requests, signals: _MetadataSignals):
+        super().__init__()
+        self.requests = requests  # [(workflow_path, generation)]
+        self.signals = signals
+    
+    def run(self):
+        for path, generation in self.requests:
+            self.signals.loaded.emit(path, generation, _read_workflow_metadata(path))
+
+
+class WorkflowListModel(QAbstractListModel):
+    """
+    工作流列表模型
+    
+    行只包含名称和路径，元数据在视图首次需要时（即卡片可见时）由后台线程加载。
+    """
+    
+    PathRole = Qt.UserRole + 1
+    MetadataRole = Qt.UserRole + 2
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 每行: {"name", "path", "metadata", "generation"}
+        self._rows: List[dict] = []
+        self._row_of: Dict[str, int] = {}
+        # 已请求元数据的 (路径, 版本)
+        self._requested = set()
+        self._pending = []
+        self._signals = _MetadataSignals()
+        self._signals.loaded.connect(self._on_metadata_loaded)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        
+        entry = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return entry["name"]
+        if role == self.PathRole:
+            return entry["path"]
+        if role == self.MetadataRole:
+            if entry["metadata"] is None:
+                self._request_metadata(entry)
+            return entry["metadata"]
+        return None
+    
+    def set_workflows(self, workflows: List[dict]):
+        """重置为给定的工作流列表（每项包含 name 和 path）"""
+        self.beginResetModel()
+        self._rows = [self._new_entry(w["name"], w["path"]) for w in workflows]
+        self._reindex()
+        self.endResetModel()
+    
+    def add_workflow(self, name: str, path: str):
+        """追加一个工作流，已存在时忽略"""
+        if path in self._row_of:
+            return
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(self._new_entry(name, path))
+        self._row_of[path] = row
+        self.endInsertRows()
+    
+    def remove_workflow(self, path: str):
+        """移除一个工作流"""
+        row = self._row_of.get(path)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self._reindex()
+        self.endRemoveRows()
+    
+    def invalidate(self, path: str):
+        """工作流文件已修改，下次显示时重新加载元数据"""
+        row = self._row_of.get(path)
+        if row is None:
+            return
+        entry = self._rows[row]
+        entry["metadata"] = None
+        entry["generation"] += 1
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.MetadataRole])
+    
+    def contains(self, path: str) -> bool:
+        return path in self._row_of
+    
+    def _new_entry(self, name: str, path: str) -> dict:
+        return {"name": name, "path": path, "metadata": None, "generation": 0}
+    
+    def _reindex(self):
+        self._row_of = {entry["path"]: row for row, entry in enumerate(self._rows)}
+    
+    def _request_metadata(self, entry: dict):
+        """登记元数据请求，同一轮事件循环内的请求合并为一个后台任务"""
+        key = (entry["path"], entry["generation"])
+        if key in self._requested:
+            return
+        self._requested.add(key)
+        self._pending.append(key)
+        if len(self._pending) == 1:
+            QTimer.singleShot(0, self._flush_requests)
+    
+    def _flush_requests(self):
+        requests, self._pending = self._pending, []
+        if requests:
+            QThreadPool.globalInstance().start(_MetadataTask(requests, self._signals))
+    
+    def _on_metadata_loaded(self, path: str, generation: int, metadata):
+        """后台任务返回元数据（在GUI线程中执行）"""
+        self._requested.discard((path, generation))
+        row = self._row_of.get(path)
+        if row is None or self._rows[row]["generation"] != generation:
+            # 已移除或文件已再次修改
+            return
+        
+        if metadata is None:
+            # 无效的工作流文件不显示
+            self.remove_workflow(path)
+            return
+        
+        self._rows[row]["metadata"] = metadata
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.MetadataRole])
+
+
+class WorkflowCardDelegate(QStyledItemDelegate):
+    """把工作流绘制为卡片，视图只为可见行调用 paint"""
     
     open_clicked = Signal(str, str)  # workflow_name, workflow_path
     delete_clicked = Signal(str)  # workflow_name
     
-    def __init__(self, workflow_name: str, workflow_path: str, parent=None):
+    CARD_SIZE = QSize(220, 180)
+    MARGIN = 15
+    BUTTON_HEIGHT = 28
+    
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.workflow_name = workflow_name
-        self.workflow_path = workflow_path
-        self._setup_ui()
+        self._icon_font = QFont()
+        self._icon_font.setPointSize(32)
+        self._name_font = QFont()
+        self._name_font.setPointSize(11)
+        self._name_font.setBold(True)
     
-    def _setup_ui(self):
-        """设置UI"""
-        self.setFixedSize(220, 180)
-        self.setStyleSheet(f"""
-            WorkflowCard {{
-                background-color: {ThemeManager.COLORS['surface']};
-                border: 1px solid {ThemeManager.COLORS['border']};
-                border-radius: 8px;
-            }}
-            WorkflowCard:hover {{
-                border: 1px solid {ThemeManager.COLORS['accent']};
-                background-color: {ThemeManager.COLORS['surface_lighter']};
-            }}
-        """)
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+    
+    def _button_rects(self, rect: QRect):
+        """打开/删除按钮的区域"""
+        inner = rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        width = (inner.width() - 5) // 2
+        top = inner.bottom() - self.BUTTON_HEIGHT + 1
+        open_rect = QRect(inner.left(), top, width, self.BUTTON_HEIGHT)
+        delete_rect = QRect(open_rect.right() + 6, top, width, self.BUTTON_HEIGHT)
+        return open_rect, delete_rect
+    
+    def paint(self, painter, option, index):
+        colors = ThemeManager.COLORS
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
         
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(15, 15, 15, 15)
-        layout.setSpacing(10)
+        # 卡片背景
+        painter.setPen(QPen(QColor(colors['accent'] if hovered else colors['border']), 1))
+        painter.setBrush(QColor(colors['surface_lighter'] if hovered else colors['surface']))
+        painter.drawRoundedRect(option.rect.adjusted(0, 0, -1, -1), 8, 8)
+        
+        inner = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
         
         # 图标
-        icon_label = QLabel("📊")
-        icon_font = QFont()
-        icon_font.setPointSize(32)
-        icon_label.setFont(icon_font)
-        icon_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(icon_label)
+        painter.setFont(self._icon_font)
+        painter.setPen(QColor(colors['text']))
+        painter.drawText(QRect(inner.left(), inner.top(), inner.width(), 50), Qt.AlignCenter, "📊")
         
         # 工作流名称
-        name_label = QLabel(self.workflow_name)
-        name_font = QFont()
-        name_font.setPointSize(11)
-        name_font.setBold(True)
-        name_label.setFont(name_font)
-        name_label.setAlignment(Qt.AlignCenter)
-        name_label.setStyleSheet(f"color: {ThemeManager.COLORS['text']};")
-        name_label.setWordWrap(True)
-        layout.addWidget(name_label)
-        
-        # 按钮组
-        button_layout = QHBoxLayout()
-        button_layout.setSpacing(5)
-        
-        # 打开按钮
-        open_btn = QPushButton("打开")
-        open_btn.setStyleSheet(ThemeManager.get_button_style("primary"))
-        open_btn.clicked.connect(lambda: self.open_clicked.emit(self.workflow_name, self.workflow_path))
-        button_layout.addWidget(open_btn)
-        
-        # 删除按钮
-        delete_btn = QPushButton("删除")
-        delete_btn.setStyleSheet(ThemeManager.get_button_style("danger"))
-        delete_btn.clicked.connect(lambda: self.delete_clicked.emit(self.workflow_name))
-        button_layout.addWidget(delete_btn)
-        
-        layout.addLayout(button_layout)
-        layout.addStretch()
+        painter.setFont(self._name_font)
+        painter.drawText(QRect(inner.left(), inner.top() + 55, inner.width(), 36),
+                         Qt.AlignCenter | Qt.TextWordWrap, index.data(Qt.DisplayRole))
+        
+        # 元数据（未加载时显示占位文本）
+        metadata = index.data(WorkflowListModel.MetadataRole)
+        if metadata:
+            summary = f"{metadata['node_count']} 个节点"
+            last_run = metadata.get("last_run")
+            if last_run:
+                batch = last_run.get("batch")
+                if batch:
+                    summary += f" · 上次批量运行 {batch['succeeded']} 成功/{batch['failed']} 失败"
+                else:
+                    summary += " · 上次运行" + ("成功" if last_run["status"] == "success" else "失败")
+        else:
+            summary = "加载中..."
+        painter.setFont(option.font)
+        painter.setPen(QColor(colors['text_secondary']))
+        painter.drawText(QRect(inner.left(), inner.top() + 93, inner.width(), 18), Qt.AlignCenter, summary)
+        
+        # 按钮
+        open_rect, delete_rect = self._button_rects(option.rect)
+        for rect, text, color in ((open_rect, "打开", colors['accent']),
+                                  (delete_rect, "删除", colors['error'])):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor(colors['white']))
+            painter.drawText(rect, Qt.AlignCenter, text)
+        
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        """处理卡片按钮点击"""
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            open_rect, delete_rect = self._button_rects(option.rect)
+            pos = event.position().toPoint()
+            if open_rect.contains(pos):
+                self.open_clicked.emit(index.data(Qt.DisplayRole), index.data(WorkflowListModel.PathRole))
+                return True
+            if delete_rect.contains(pos):
+                self.delete_clicked.emit(index.data(Qt.DisplayRole))
+                return True
+        return super().editorEvent(event, model, option, index)
 
 
 class OverviewWidget(QWidget):
@@ -86,7 +258,8 @@ class OverviewWidget(QWidget):
         super().__init__(parent)
         self.parent = parent
         self._setup_ui()
-        self._load_workflows()
+        # 首帧绘制后再扫描工作流目录
+        QTimer.singleShot(0, self._load_workflows)
     
     def _setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -146,21 +319,33 @@ class OverviewWidget(QWidget):
         
         main_layout.addWidget(list_header)
         
-        # 工作流卡片滚动区域
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("""
-            QScrollArea {
+        # 工作流卡片视图（只绘制可见卡片）
+        self._model = WorkflowListModel(self)
+        self._delegate = WorkflowCardDelegate(self)
+        # 排队连接：确认对话框和行删除不在视图的事件处理中进行
+        self._delegate.open_clicked.connect(self._on_open_workflow, Qt.QueuedConnection)
+        self._delegate.delete_clicked.connect(self._on_delete_workflow, Qt.QueuedConnection)
+        
+        self.workflow_view = QListView()
+        self.workflow_view.setViewMode(QListView.IconMode)
+        self.workflow_view.setMovement(QListView.Static)
+        self.workflow_view.setResizeMode(QListView.Adjust)
+        self.workflow_view.setLayoutMode(QListView.Batched)
+        self.workflow_view.setUniformItemSizes(True)
+        self.workflow_view.setSpacing(8)
+        self.workflow_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.workflow_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.workflow_view.setMouseTracking(True)
+        self.workflow_view.setFrameShape(QFrame.NoFrame)
+        self.workflow_view.setStyleSheet("""
+            QListView {
                 border: none;
                 background-color: transparent;
             }
         """)
-        
-        # 工作流卡片容器
-        self.cards_widget = QWidget()
-        self.cards_layout = QGridLayout(self.cards_widget)
-        self.cards_layout.setSpacing(15)
-        self.cards_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.workflow_view.setModel(self._model)
+        self.workflow_view.setItemDelegate(self._delegate)
+        main_layout.addWidget(self.workflow_view)
         
         # 空状态提示
         self.empty_label = QLabel("暂无工作流\n点击上方按钮创建新工作流")
@@ -172,10 +357,11 @@ class OverviewWidget(QWidget):
                 padding: 40px;
             }}
         """)
-        self.cards_layout.addWidget(self.empty_label, 0, 0, Qt.AlignCenter)
+        main_layout.addWidget(self.empty_label)
         
-        scroll.setWidget(self.cards_widget)
-        main_layout.addWidget(scroll)
+        for signal in (self._model.rowsInserted, self._model.rowsRemoved, self._model.modelReset):
+            signal.connect(self._update_empty_state)
+        self._update_empty_state()
         
         self.setLayout(main_layout)
     
@@ -209,159 +395,93 @@ class OverviewWidget(QWidget):
         return relative_path
     
     def _load_workflows(self):
-        """加载已保存的工作流"""
+        """加载已保存的工作流（只列出文件，元数据在卡片可见时后台加载）"""
         workflows_dir = Path("workflows")
         
-        if not workflows_dir.exists():
-            return
-        
         workflow_list = []
         
         # 遍历workflows目录
-        for item in workflows_dir.iterdir():
-            if item.is_dir():
-                workflow_json = item / "workflow.json"
-                if workflow_json.exists() and workflow_json.is_file():
-                    # 验证文件是否可读且包含有效的工作流数据
-                    try:
-                        with open(workflow_json, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            if isinstance(data, dict) and 'workflow_name' in data:
-                                workflow_list.append({
-                                    "name": item.name,
-                                    "path": str(workflow_json)
-                                })
-                    except (json.JSONDecodeError, IOError) as e:
-                        print(f"跳过损坏的工作流文件: {workflow_json} - {e}")
-        
-        # 安全地清空现有卡片
-        # 先收集所有需要删除的widget（除了empty_label）
-        widgets_to_remove = []
-        for i in range(self.cards_layout.count()):
-            item = self.cards_layout.itemAt(i)
-            if item:
-                widget = item.widget()
-                if widget and widget != self.empty_label:
-                    widgets_to_remove.append(widget)
-        
-        # 从布局中移除并删除
-        for widget in widgets_to_remove:
-            self.cards_layout.removeWidget(widget)
-            widget.deleteLater()
-        
-        # 如果有工作流，显示卡片
-        if workflow_list:
-            # 确保empty_label从布局中移除并隐藏
-            if self.empty_label in [self.cards_layout.itemAt(i).widget() 
-                                     for i in range(self.cards_layout.count()) 
-                                     if self.cards_layout.itemAt(i) and self.cards_layout.itemAt(i).widget()]:
-                self.cards_layout.removeWidget(self.empty_label)
-            self.empty_label.hide()
-            
-            # 创建工作流卡片（每行4个）
-            for i, workflow in enumerate(workflow_list):
-                card = WorkflowCard(workflow["name"], workflow["path"], self)
-                card.open_clicked.connect(self._on_open_workflow)
-                card.delete_clicked.connect(self._on_delete_workflow)
-                
-                row = i // 4
-                col = i % 4
-                self.cards_layout.addWidget(card, row, col)
-        else:
-            # 显示空状态
-            # 检查empty_label是否已经在布局中
-            if self.empty_label not in [self.cards_layout.itemAt(i).widget() 
-                                         for i in range(self.cards_layout.count()) 
-                                         if self.cards_layout.itemAt(i) and self.cards_layout.itemAt(i).widget()]:
-                self.cards_layout.addWidget(self.empty_label, 0, 0, Qt.AlignCenter)
-            self.empty_label.show()
+        if workflows_dir.exists():
+            for item in os.scandir(workflows_dir):
+                workflow_json = os.path.join(item.path, "workflow.json")
+                if item.is_dir() and os.path.isfile(workflow_json):
+                    workflow_list.append({
+                        "name": item.name,
+                        "path": str(Path(workflow_json))
+                    })
+        
+        self._model.set_workflows(workflow_list)
+    
+    def apply_workflow_changes(self, events):
+        """
+        根据文件监视事件增量更新卡片，不重新扫描目录
+        
+        Args:
+            events: workflow.json 的 FileEvent 列表（见 src.core.file_watcher）
+        """
+        from src.core.file_watcher import DELETED
+        
+        for event in events:
+            path = str(Path(event.path))
+            if event.kind == DELETED:
+                self._model.remove_workflow(path)
+            elif self._model.contains(path):
+                self._model.invalidate(path)
+            else:
+                self._model.add_workflow(Path(path).parent.name, path)
+    
+    def _update_empty_state(self):
+        """没有工作流时显示空状态提示"""
+        has_workflows = self._model.rowCount() > 0
+        self.workflow_view.setVisible(has_workflows)
+        self.empty_label.setVisible(not has_workflows)
     
     def _on_open_workflow(self, workflow_name: str, workflow_path: str):
-        """打开工作流"""
+        """
+        打开工作流
+        
+        Returns:
+            负责加载画布的 WorkflowCanvasLoader，未打开时返回 None
+        """
         print(f"打开工作流: {workflow_name} - {workflow_path}")
         
         # 检查文件是否存在，如果不存在则刷新列表并提示用户
         if not os.path.exists(workflow_path):
             print(f"工作流文件不存在: {workflow_path}")
-            self._load_workflows()  # 刷新列表
+            self._model.remove_workflow(str(Path(workflow_path)))
             QMessageBox.warning(self, "文件不存在", 
                               f"工作流 '{workflow_name}' 的文件不存在。\n\n可能已被重命名或删除。\n工作流列表已刷新。")
-            return
+            return None
         
         if self.parent:
             # 创建新的工作流标签页
             from src.views.workflow_tab_widget import WorkflowTabWidget
             from src.core.workflow_executor import WorkflowExecutor
             from src.core.uv_manager import UVManager
+            from src.views.workflow_loader import WorkflowCanvasLoader
             
-            # 加载工作流数据
-            try:
-                with open(workflow_path, 'r', encoding='utf-8') as f:
-                    workflow_data = json.load(f)
-                
-                # 创建工作流标签页
-                workflow_widget = WorkflowTabWidget(workflow_name, self.parent)
-                
-                # 加载节点到画布
-                from src.views.node_graphics import NodeGraphicsItem
-                from src.core.node_base import NodeType
-                
-                # 节点类型映射
-                node_type_map = {
-                    "variable_assign": NodeType.VARIABLE_ASSIGN,
-                    "variable_calc": NodeType.VARIABLE_CALC,
-                    "sqlite_connect": NodeType.SQLITE_CONNECT,
-                    "sqlite_execute": NodeType.SQLITE_EXECUTE,
-                    "sql_statement": NodeType.SQL_STATEMENT,
-                }
-                
-                # 添加节点
-                for node_data in workflow_data.get("nodes", []):
-                    node_id = node_data["node_id"]
-                    node_type_str = node_data["node_type"]
-                    node_type = node_type_map.get(node_type_str)
-                    
-                    if node_type:
-                        node_item = NodeGraphicsItem(node_id, node_type, node_type.value)
-                        node_item.config = node_data.get("config", {})
-                        
-                        # 设置位置（如果有的话）
-                        pos = node_data.get("position", {"x": 0, "y": 0})
-                        node_item.setPos(pos.get("x", 0), pos.get("y", 0))
-                        
-                        # 添加到场景
-                        workflow_widget.canvas._scene.addItem(node_item)
-                        workflow_widget.nodes[node_id] = node_item
-                
-                # 添加连接
-                for from_id, to_id in workflow_data.get("edges", []):
-                    workflow_widget.connections.append((from_id, to_id))
-                    
-                    # 创建可视化连接线
-                    if from_id in workflow_widget.nodes and to_id in workflow_widget.nodes:
-                        from_node = workflow_widget.nodes[from_id]
-                        to_node = workflow_widget.nodes[to_id]
-                        
-                        if from_node.output_ports and to_node.input_ports:
-                            from src.views.node_graphics import ConnectionGraphicsItem
-                            connection = ConnectionGraphicsItem(
-                                from_node.output_ports[0],
-                                to_node.input_ports[0]
-                            )
-                            workflow_widget.canvas._scene.addItem(connection)
-                
-                # 添加标签页
-                index = self.parent.tabs.addTab(workflow_widget, workflow_name)
-                self.parent.tabs.setCurrentIndex(index)
-                
-                print(f"工作流已加载: {len(workflow_data.get('nodes', []))} 个节点")
-                
-            except Exception as e:
-                print(f"加载工作流失败: {e}")
-                import traceback
-                traceback.print_exc()
-                
-                QMessageBox.critical(self, "加载失败", f"无法加载工作流:\n{str(e)}")
+            # 先添加标签页，节点和连接线在后台解析后分批添加到画布
+            workflow_widget = WorkflowTabWidget(workflow_name, self.parent)
+            index = self.parent.tabs.addTab(workflow_widget, workflow_name)
+            self.parent.tabs.setCurrentIndex(index)
+            
+            loader = WorkflowCanvasLoader(workflow_widget, workflow_path)
+            loader.progress.connect(workflow_widget.set_loading_progress)
+            loader.failed.connect(lambda error: self._on_open_workflow_failed(workflow_widget, error))
+            workflow_widget.begin_loading()
+            loader.start()
+            return loader
+        return None
+    
+    def _on_open_workflow_failed(self, workflow_widget, error: str):
+        """工作流加载失败，关闭对应的标签页"""
+        print(f"加载工作流失败: {error}")
+        index = self.parent.tabs.indexOf(workflow_widget)
+        if index >= 0:
+            self.parent.tabs.removeTab(index)
+        workflow_widget.deleteLater()
+        
+        QMessageBox.critical(self, "加载失败", f"无法加载工作流:\n{error}")
     
     def _on_delete_workflow(self, workflow_name: str):
         """删除工作流"""
@@ -388,8 +508,10 @@ class OverviewWidget(QWidget):
                 print(f"删除失败: {e}")
                 QMessageBox.critical(self, "删除失败", f"无法删除工作流:\n{str(e)}")
             finally:
-                # 无论成功与否，都刷新列表
-                self._load_workflows()
+                # 无论成功与否，工作流文件已不存在时移除其卡片
+                workflow_path = str(Path("workflows") / workflow_name / "workflow.json")
+                if not os.path.exists(workflow_path):
+                    self._model.remove_workflow(workflow_path)
     
     def refresh_workflows(self):
         """刷新工作流列表"""
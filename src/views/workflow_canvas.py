@@ -1,8 +1,8 @@
 import math
 import time
 
-from PySide6.QtCore import Qt, QLine, Signal, QPointF
-from PySide6.QtGui import QBrush, QColor, QPen, QPainter
+from PySide6.QtCore import Qt, Signal, QPointF, QRectF, QTimer
+from PySide6.QtGui import QBrush, QColor, QPen, QPainter, QPixmap, QTransform
 from PySide6.QtWidgets import QGraphicsScene, QGraphicsView
 
 from src.core.theme_manager import ThemeManager
@@ -27,7 +27,11 @@ class WorkflowCanvas(QGraphicsView):
             | QPainter.TextAntialiasing
             | QPainter.SmoothPixmapTransform
         )
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # 只重绘发生变化的区域；网格背景缓存在视口中，平移时直接滚动复用
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        # 图元的边界矩形已包含抗锯齿和选中边框的余量
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
         
         # Hide the scrollbar
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
@@ -38,6 +42,9 @@ class WorkflowCanvas(QGraphicsView):
         
         self._drag_mode = False
         
+        # 只读时不能添加、删除、移动节点或创建连接（如工作流加载期间）
+        self.read_only = False
+        
         # 连线模式
         self.connection_mode = False
         self.connection_start_port = None
@@ -48,6 +55,10 @@ class WorkflowCanvas(QGraphicsView):
         
         # 设置焦点策略，确保可以接收键盘事件
         self.setFocusPolicy(Qt.StrongFocus)
+        
+        # 小地图（浮在右下角，场景中有节点时显示）
+        from src.views.canvas_minimap import CanvasMinimap
+        self._minimap = CanvasMinimap(self)
 
     def wheelEvent(self, event):
         # Zoom
@@ -58,17 +69,39 @@ class WorkflowCanvas(QGraphicsView):
         else:
             zoom_factor = zoom_out_factor
         self.scale(zoom_factor, zoom_factor)
+        self._minimap.update()
+    
+    def scrollContentsBy(self, dx, dy):
+        """平移（拖动、centerOn 等）后更新小地图上的视口框"""
+        super().scrollContentsBy(dx, dy)
+        self._minimap.update()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._minimap.place()
+        self._minimap.update()
 
+    def set_read_only(self, read_only: bool):
+        """设置画布是否只读（仍可滚动、缩放和通过小地图跳转）"""
+        self.read_only = read_only
+        self.setInteractive(not read_only)
+        self.setAcceptDrops(not read_only)
+        if read_only and self.connection_mode:
+            self._cancel_connection()
+    
     def mousePressEvent(self, event):
         """鼠标按下事件"""
+        if self.read_only:
+            return super().mousePressEvent(event)
+        
         # 检查是否点击在端口上
         item_at_pos = self.itemAt(event.pos())
         
         if event.button() == Qt.LeftButton:
             # 检查是否点击端口
-            from src.views.node_graphics import PortGraphicsItem
-            if isinstance(item_at_pos, PortGraphicsItem):
-                self._start_connection(item_at_pos, event)
+            port = self._port_at(event.pos())
+            if port is not None:
+                self._start_connection(port, event)
                 return
             
             # 检查是否点击节点
@@ -107,11 +140,9 @@ class WorkflowCanvas(QGraphicsView):
         if event.button() == Qt.LeftButton:
             # 检查是否在端口上释放（完成连接）
             if self.connection_mode:
-                item_at_pos = self.itemAt(event.pos())
-                from src.views.node_graphics import PortGraphicsItem, PortType
-                
-                if isinstance(item_at_pos, PortGraphicsItem):
-                    self._finish_connection(item_at_pos)
+                port = self._port_at(event.pos())
+                if port is not None:
+                    self._finish_connection(port)
                 else:
                     self._cancel_connection()
             
@@ -133,6 +164,22 @@ class WorkflowCanvas(QGraphicsView):
         self.setDragMode(QGraphicsView.NoDrag)
         self._drag_mode = False
     
+    def _port_at(self, view_pos):
+        """
+        获取视图坐标处的端口（端口由节点绘制，按几何位置检测）
+        
+        Returns:
+            NodePort，不在端口上时返回 None
+        """
+        from src.views.node_graphics import NodeGraphicsItem
+        
+        scene_pos = self.mapToScene(view_pos)
+        for item in self.items(view_pos):
+            # 跳过覆盖在端口上的连接线（包括正在拖动的临时连接线）
+            if isinstance(item, NodeGraphicsItem):
+                return item.port_at(scene_pos)
+        return None
+    
     def _start_connection(self, start_port, event):
         """开始创建连接"""
         from src.views.node_graphics import PortType, ConnectionGraphicsItem
@@ -324,6 +371,8 @@ class WorkflowCanvas(QGraphicsView):
         
         # 删除选中的节点（Del键或Backspace键）
         if event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
+            if self.read_only:
+                return
             selected_items = self._scene.selectedItems()
             for item in selected_items:
                 if isinstance(item, NodeGraphicsItem):
@@ -343,17 +392,12 @@ class WorkflowCanvas(QGraphicsView):
         Args:
             node_type: 节点类型值 (如 "variable_assign")
         """
-        from src.views.node_graphics import NodeGraphicsItem
-        
         # 先清除所有选中
         self._scene.clearSelection()
         
         # 选中并高亮指定类型的节点
-        for item in self._scene.items():
-            if isinstance(item, NodeGraphicsItem):
-                curr_type = item.node_type.value if hasattr(item.node_type, "value") else str(item.node_type)
-                if curr_type == node_type:
-                    item.setSelected(True)
+        for item in self._scene.get_nodes_by_type(node_type):
+            item.setSelected(True)
     
     def select_nodes_by_ids(self, node_ids: list):
         """
@@ -362,16 +406,14 @@ class WorkflowCanvas(QGraphicsView):
         Args:
             node_ids: 节点ID列表
         """
-        from src.views.node_graphics import NodeGraphicsItem
-        
         # 先清除所有选中
         self._scene.clearSelection()
         
         # 选中指定ID的节点
-        for item in self._scene.items():
-            if isinstance(item, NodeGraphicsItem):
-                if item.node_id in node_ids:
-                    item.setSelected(True)
+        for node_id in set(node_ids):
+            item = self._scene.get_node(node_id)
+            if item is not None:
+                item.setSelected(True)
     
     def get_all_nodes(self) -> list:
         """
@@ -380,21 +422,30 @@ class WorkflowCanvas(QGraphicsView):
         Returns:
             节点信息列表 [{"node_id": str, "node_type": str, ...}, ...]
         """
-        from src.views.node_graphics import NodeGraphicsItem
-        
-        nodes = []
-        for item in self._scene.items():
-            if isinstance(item, NodeGraphicsItem):
-                nodes.append({
-                    "node_id": item.node_id,
-                    "node_type": item.node_type.value if hasattr(item.node_type, "value") else str(item.node_type),
-                    "config": item.config
-                })
-        
-        return nodes
+        return [
+            {
+                "node_id": item.node_id,
+                "node_type": item.node_type_value,
+                "config": item.config
+            }
+            for item in self._scene.get_nodes()
+        ]
 
 
 class WorkflowGraphicsScene(QGraphicsScene):
+    # 节点被添加、移除或移动（同一次事件循环内的变化合并发出），参数为变化前后的节点矩形列表
+    nodes_changed = Signal(object)
+    
+    # 网格按缩放级别分档（相邻两档相差 GRID_ZOOM_STEP 倍），每档缓存一个预渲染的纹理画刷
+    GRID_ZOOM_STEP = 1.25
+    # 网格线在屏幕上的最小间距（像素），更密时不再绘制这一级网格线
+    GRID_MIN_SPACING = 6
+    # 最多缓存的缩放档位数
+    GRID_CACHE_SIZE = 16
+    # BSP 索引深度：场景固定为 32000x32000，深度 10 时叶子约 1000x1000，
+    # 与节点尺寸（180x80）相比足够细，又不会因节点增减频繁重建索引
+    BSP_TREE_DEPTH = 10
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         scene_background_color = ThemeManager.COLORS['background']
@@ -417,6 +468,8 @@ class WorkflowGraphicsScene(QGraphicsScene):
         self.setSceneRect(
             -self._width / 2, -self._height / 2, self._width, self._height
         )
+        self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setBspTreeDepth(self.BSP_TREE_DEPTH)
         self._grid_size = scene_grid_size
         self._grid_chunk = scene_grid_chunk
         self._normal_line_pen = QPen(
@@ -426,50 +479,237 @@ class WorkflowGraphicsScene(QGraphicsScene):
 
         self._dark_line_pen = QPen(QColor(scene_grid_dark_line_color))
         self._dark_line_pen.setWidthF(scene_grid_dark_line_width)
+        
+        # 缩放档位 -> 网格纹理画刷（None 表示该缩放下不绘制网格）
+        self._grid_brushes = {}
 
+        # 邻接索引：节点 -> 与其相连的连接线；连接线 -> 其两端的节点
+        self._adjacency = {}
+        self._connection_nodes = {}
+        # 本帧内移动过的节点，下一次事件循环时统一更新相连的连接线
+        self._moved_nodes = set()
+        
+        # 节点索引：节点ID -> 节点；节点类型值 -> 该类型的节点（按添加顺序）
+        self._nodes_by_id = {}
+        self._nodes_by_type = {}
+        
+        # 节点 -> 最近一次通知时的节点矩形（移动后需要同时通知旧位置）
+        self._node_rects = {}
+        # 尚未通过 nodes_changed 发出的矩形；批量添加期间攒到结束时一次发出
+        self._changed_rects = []
+        self._nodes_changed_pending = False
+        self._bulk_insert = False
+    
     def addItem(self, item):
         super().addItem(item)
-
-    def drawBackground(self, painter, rect):
-        super().drawBackground(painter, rect)
-
-        lines, dark_lines = self.cal_grid_lines(rect)
-        painter.setPen(self._dark_line_pen)
-        painter.drawLines(dark_lines)
-        painter.setPen(self._normal_line_pen)
-        painter.drawLines(lines)
-
-    def cal_grid_lines(self, rect):
-        left, right, top, bottom = (
-            math.floor(rect.left()),
-            math.floor(rect.right()),
-            math.floor(rect.top()),
-            math.floor(rect.bottom()),
+        from src.views.node_graphics import NodeGraphicsItem, ConnectionGraphicsItem
+        if isinstance(item, ConnectionGraphicsItem):
+            self.register_connection(item)
+        elif isinstance(item, NodeGraphicsItem):
+            self._nodes_by_id[item.node_id] = item
+            self._nodes_by_type.setdefault(item.node_type_value, {})[item] = None
+            rect = self._node_rect(item)
+            self._node_rects[item] = rect
+            self._mark_nodes_changed([rect])
+    
+    def removeItem(self, item):
+        from src.views.node_graphics import NodeGraphicsItem, ConnectionGraphicsItem
+        if isinstance(item, ConnectionGraphicsItem):
+            self.unregister_connection(item)
+        else:
+            self._adjacency.pop(item, None)
+            self._moved_nodes.discard(item)
+            if isinstance(item, NodeGraphicsItem):
+                self._unindex_node(item)
+        super().removeItem(item)
+    
+    def clear(self):
+        self._adjacency.clear()
+        self._connection_nodes.clear()
+        self._moved_nodes.clear()
+        self._nodes_by_id.clear()
+        self._nodes_by_type.clear()
+        rects = list(self._node_rects.values())
+        self._node_rects.clear()
+        super().clear()
+        self._mark_nodes_changed(rects)
+    
+    def _unindex_node(self, node):
+        """从节点索引中移除节点"""
+        if self._nodes_by_id.get(node.node_id) is node:
+            del self._nodes_by_id[node.node_id]
+        nodes = self._nodes_by_type.get(node.node_type_value)
+        if nodes is not None:
+            nodes.pop(node, None)
+            if not nodes:
+                del self._nodes_by_type[node.node_type_value]
+        rect = self._node_rects.pop(node, None)
+        if rect is not None:
+            self._mark_nodes_changed([rect])
+    
+    def _node_rect(self, node) -> QRectF:
+        """节点主体在场景中的矩形"""
+        pos = node.scenePos()
+        return QRectF(pos.x(), pos.y(), node.width, node.height)
+    
+    def _mark_nodes_changed(self, rects):
+        """记录变化的节点矩形，下一次事件循环时合并发出 nodes_changed"""
+        if not rects:
+            return
+        self._changed_rects.extend(rects)
+        if not self._bulk_insert and not self._nodes_changed_pending:
+            self._nodes_changed_pending = True
+            QTimer.singleShot(0, self._emit_nodes_changed)
+    
+    def _emit_nodes_changed(self):
+        """发出攒下的节点变化"""
+        self._nodes_changed_pending = False
+        if self._bulk_insert or not self._changed_rects:
+            return
+        rects = self._changed_rects
+        self._changed_rects = []
+        self.nodes_changed.emit(rects)
+    
+    def get_node(self, node_id: str):
+        """按ID获取节点，不存在时返回 None"""
+        return self._nodes_by_id.get(node_id)
+    
+    def node_count(self) -> int:
+        """场景中的节点数"""
+        return len(self._nodes_by_id)
+    
+    def get_nodes(self) -> list:
+        """获取场景中的所有节点（按添加顺序）"""
+        return list(self._nodes_by_id.values())
+    
+    def get_nodes_by_type(self, node_type: str) -> list:
+        """
+        获取指定类型的所有节点
+        
+        Args:
+            node_type: 节点类型值 (如 "variable_assign")
+        """
+        return list(self._nodes_by_type.get(node_type, ()))
+    
+    def begin_bulk_insert(self):
+        """批量添加图元前关闭场景索引，避免每添加一个图元都更新 BSP 树；节点变化攒到结束时一次通知"""
+        self._bulk_insert = True
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+    
+    def end_bulk_insert(self):
+        """批量添加完成后重建场景索引，并发出期间的节点变化"""
+        self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setBspTreeDepth(self.BSP_TREE_DEPTH)
+        self._bulk_insert = False
+        self._emit_nodes_changed()
+    
+    def register_connection(self, connection):
+        """按连接线当前的端口更新邻接索引（端口变化后再次调用即可）"""
+        self.unregister_connection(connection)
+        nodes = tuple(
+            port.parent_node for port in (connection.start_port, connection.end_port) if port
         )
+        self._connection_nodes[connection] = nodes
+        for node in nodes:
+            self._adjacency.setdefault(node, set()).add(connection)
+    
+    def unregister_connection(self, connection):
+        """从邻接索引中移除连接线"""
+        for node in self._connection_nodes.pop(connection, ()):
+            connections = self._adjacency.get(node)
+            if connections is not None:
+                connections.discard(connection)
+                if not connections:
+                    del self._adjacency[node]
+    
+    def get_node_connections(self, node) -> set:
+        """获取与节点相连的连接线"""
+        return set(self._adjacency.get(node, ()))
+    
+    def node_moved(self, node):
+        """
+        节点位置变化
+        
+        同一帧内移动的节点（如拖动多选的节点）会被合并，
+        下一次事件循环时只更新与这些节点相连的连接线，每条只更新一次，
+        并通过 nodes_changed 发出这些节点移动前后的矩形
+        """
+        if node not in self._node_rects:
+            return
+        if not self._moved_nodes:
+            QTimer.singleShot(0, self._flush_moved_nodes)
+        self._moved_nodes.add(node)
+    
+    def _flush_moved_nodes(self):
+        """更新本帧移动过的节点相连的连接线，并通知节点变化"""
+        connections = set()
+        rects = []
+        for node in self._moved_nodes:
+            connections.update(self._adjacency.get(node, ()))
+            rect = self._node_rect(node)
+            rects.append(self._node_rects[node])
+            rects.append(rect)
+            self._node_rects[node] = rect
+        self._moved_nodes.clear()
+        for connection in connections:
+            connection.update_path()
+        self._changed_rects.extend(rects)
+        self._emit_nodes_changed()
 
-        # Top left corner
-        first_left = left - (left % self._grid_size)
-        first_top = top - (top % self._grid_size)
-
-        # Calculate the start and end points of the lines
-        lines = []
-        dark_lines = []
-        # Draw horizontal lines
-        for v in range(first_top, bottom, self._grid_size):
-            line = QLine(left, v, right, v)
-            if v % (self._grid_size * self._grid_chunk) == 0:
-                dark_lines.append(line)
-            else:
-                lines.append(line)
-        # Draw vertical lines
-        for h in range(first_left, right, self._grid_size):
-            line = QLine(h, top, h, bottom)
-            if h % (self._grid_size * self._grid_chunk) == 0:
-                dark_lines.append(line)
-            else:
-                lines.append(line)
-
-        return lines, dark_lines
+    def drawBackground(self, painter, rect):
+        # 视图只做等比缩放，m11 即缩放比例
+        brush = self._grid_brush(painter.worldTransform().m11())
+        if brush is None:
+            super().drawBackground(painter, rect)
+            return
+        # 网格纹理以场景原点对齐并随视图缩放，每帧只需一次填充
+        painter.fillRect(rect, brush)
+    
+    def _grid_brush(self, scale):
+        """
+        获取当前缩放下的网格纹理画刷
+        
+        纹理是一个大格（grid_size * grid_chunk）的图块，大格线在图块边缘。
+        缩小到小格线过密时只保留大格线，大格线也过密时不绘制网格。
+        """
+        level = round(math.log(scale, self.GRID_ZOOM_STEP)) if scale > 0 else 0
+        if level in self._grid_brushes:
+            return self._grid_brushes[level]
+        
+        level_scale = self.GRID_ZOOM_STEP ** level
+        chunk_size = self._grid_size * self._grid_chunk
+        brush = None
+        if chunk_size * level_scale >= self.GRID_MIN_SPACING:
+            tile = max(1, round(chunk_size * level_scale))
+            pixmap = QPixmap(tile, tile)
+            pixmap.fill(self.backgroundBrush().color())
+            
+            tile_painter = QPainter(pixmap)
+            if self._grid_size * level_scale >= self.GRID_MIN_SPACING:
+                pen = QPen(self._normal_line_pen)
+                pen.setWidthF(max(1.0, pen.widthF() * level_scale))
+                tile_painter.setPen(pen)
+                for i in range(1, self._grid_chunk):
+                    offset = round(i * tile / self._grid_chunk)
+                    tile_painter.drawLine(offset, 0, offset, tile)
+                    tile_painter.drawLine(0, offset, tile, offset)
+            # 大格线画在图块两侧边缘，线宽大于 1 像素时由相邻图块各绘制一半
+            pen = QPen(self._dark_line_pen)
+            pen.setWidthF(max(1.0, pen.widthF() * level_scale))
+            tile_painter.setPen(pen)
+            for offset in (0, tile):
+                tile_painter.drawLine(offset, 0, offset, tile)
+                tile_painter.drawLine(0, offset, tile, offset)
+            tile_painter.end()
+            
+            brush = QBrush(pixmap)
+            # 图块像素 -> 场景坐标
+            brush.setTransform(QTransform.fromScale(chunk_size / tile, chunk_size / tile))
+        
+        if len(self._grid_brushes) >= self.GRID_CACHE_SIZE:
+            self._grid_brushes.clear()
+        self._grid_brushes[level] = brush
+        return brush
     
     def keyPressEvent(self, event):
         """键盘按下事件"""
@@ -0,0 +1,162 @@
+"""
+工作流画布加载器
+在线程池中读取并解析 workflow.json，再分批把节点和连接线添加到画布
+
+解析（JSON、节点类型和标题的解析）不占用界面线程；添加图元时关闭场景索引，
+每批之间回到事件循环，画布可以边加载边显示，界面保持响应。
+"""
+import json
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+
+def parse_workflow_for_canvas(workflow_path: str) -> dict:
+    """
+    读取工作流并解析为可以直接创建图元的数据（可在后台线程调用）
+    
+    Returns:
+        {"nodes": [(node_id, node_type, title, config, x, y)], "edges": [(from_id, to_id)]}
+        内置节点的 node_type 为 NodeType 枚举，自定义/外部节点为字符串
+    """
+    from src.core.node_base import NodeType
+    from src.core.node_registry import get_registry
+    
+    with open(workflow_path, 'r', encoding='utf-8') as f:
+        workflow_data = json.load(f)
+    
+    registry = get_registry()
+    titles = {}  # 节点类型 -> 标题
+    nodes = []
+    for node_data in workflow_data.get("nodes", []):
+        node_type_str = node_data.get("node_type")
+        node_id = node_data.get("node_id")
+        if not node_type_str or not node_id:
+            continue
+        
+        if node_type_str not in titles:
+            node_def = registry.get_node(node_type_str)
+            titles[node_type_str] = node_def.name if node_def else node_type_str
+        
+        try:
+            node_type = NodeType(node_type_str)
+        except ValueError:
+            node_type = node_type_str  # 自定义或外部节点
+        
+        pos = node_data.get("position") or {}
+        nodes.append((
+            node_id, node_type, titles[node_type_str], node_data.get("config", {}),
+            pos.get("x", 0), pos.get("y", 0)
+        ))
+    
+    edges = [tuple(edge) for edge in workflow_data.get("edges", [])]
+    return {"nodes": nodes, "edges": edges}
+
+
+class _ParseSignals(QObject):
+    """后台解析任务的信号（不设置父对象，任务结束前保持有效）"""
+    parsed = Signal(object)  # parse_workflow_for_canvas() 的结果
+    failed = Signal(str)
+
+
+class _ParseTask(QRunnable):
+    """在线程池中解析工作流"""
+    
+    def __init__(self, workflow_path: str, signals: _ParseSignals):
+        super().__init__()
+        self.workflow_path = workflow_path
+        self.signals = signals
+    
+    def run(self):
+        try:
+            data = parse_workflow_for_canvas(self.workflow_path)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.parsed.emit(data)
+
+
+class WorkflowCanvasLoader(QObject):
+    """把工作流分批加载到 WorkflowTabWidget 的画布中"""
+    
+    # 每批添加的图元数量
+    BATCH_SIZE = 500
+    
+    progress = Signal(int, int)  # 已添加的图元数（节点和连接线）, 图元总数
+    finished = Signal(int)       # 节点数
+    failed = Signal(str)         # 错误信息
+    
+    def __init__(self, workflow_widget, workflow_path: str):
+        """
+        Args:
+            workflow_widget: 目标 WorkflowTabWidget（同时作为父对象，标签页关闭时加载随之停止）
+            workflow_path: workflow.json 路径
+        """
+        super().__init__(workflow_widget)
+        self.workflow_widget = workflow_widget
+        self.workflow_path = workflow_path
+        self._nodes = []
+        self._edges = []
+        self._node_index = 0
+        self._edge_index = 0
+        
+        self._signals = _ParseSignals()
+        self._signals.parsed.connect(self._on_parsed)
+        self._signals.failed.connect(self.failed)
+        
+        # 由自身持有的定时器驱动分批添加，加载器销毁后不会再触发
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setSingleShot(True)
+        self._batch_timer.timeout.connect(self._add_batch)
+    
+    def start(self):
+        """开始加载（解析在线程池中进行）"""
+        QThreadPool.globalInstance().start(_ParseTask(self.workflow_path, self._signals))
+    
+    def _on_parsed(self, data: dict):
+        """解析完成，开始分批添加图元"""
+        self._nodes = data["nodes"]
+        self._edges = data["edges"]
+        self.workflow_widget.canvas._scene.begin_bulk_insert()
+        self.progress.emit(0, len(self._nodes) + len(self._edges))
+        self._batch_timer.start(0)
+    
+    def _add_batch(self):
+        """添加一批节点（节点全部添加后再添加连接线）"""
+        from src.views.node_graphics import NodeGraphicsItem, ConnectionGraphicsItem
+        
+        widget = self.workflow_widget
+        scene = widget.canvas._scene
+        budget = self.BATCH_SIZE
+        
+        while budget > 0 and self._node_index < len(self._nodes):
+            node_id, node_type, title, config, x, y = self._nodes[self._node_index]
+            self._node_index += 1
+            budget -= 1
+            
+            node_item = NodeGraphicsItem(node_id, node_type, title)
+            node_item.config = config
+            node_item.setPos(x, y)
+            scene.addItem(node_item)
+            widget.nodes[node_id] = node_item
+        
+        while budget > 0 and self._edge_index < len(self._edges):
+            from_id, to_id = self._edges[self._edge_index]
+            self._edge_index += 1
+            budget -= 1
+            
+            widget.connections.append((from_id, to_id))
+            from_node = widget.nodes.get(from_id)
+            to_node = widget.nodes.get(to_id)
+            if from_node and to_node and from_node.output_ports and to_node.input_ports:
+                scene.addItem(ConnectionGraphicsItem(from_node.output_ports[0], to_node.input_ports[0]))
+        
+        self.progress.emit(self._node_index + self._edge_index, len(self._nodes) + len(self._edges))
+        
+        if self._edge_index < len(self._edges) or self._node_index < len(self._nodes):
+            # 回到事件循环绘制已添加的图元，再继续下一批
+            self._batch_timer.start(0)
+            return
+        
+        scene.end_bulk_insert()
+        print(f"工作流已加载: {len(self._nodes)} 个节点")
+        self.finished.emit(len(self._nodes))
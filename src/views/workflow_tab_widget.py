@@ -23,6 +23,8 @@ class WorkflowTabWidget(QWidget):
         
         # 修改状态标记
         self._is_modified = False
+        # 是否正在分批加载工作流（加载完成前画布只读，禁止执行和保存）
+        self._loading = False
         
         # 创建工作流执行器
         self.uv_manager = UVManager()
@@ -79,6 +81,12 @@ class WorkflowTabWidget(QWidget):
         
         toolbar_layout.addStretch()
         
+        # 加载进度（大工作流分批加载时显示）
+        self.loading_label = QLabel()
+        self.loading_label.setStyleSheet(f"color: {ThemeManager.COLORS['text_secondary']};")
+        self.loading_label.hide()
+        toolbar_layout.addWidget(self.loading_label)
+        
         # 执行按钮
         self.run_btn = QPushButton("▶ 执行工作流")
         self.run_btn.setStyleSheet(ThemeManager.get_button_style("primary")) # Use primary style which is confusingly named but lets use success logic or customize
@@ -91,10 +99,10 @@ class WorkflowTabWidget(QWidget):
         toolbar_layout.addWidget(self.run_btn)
         
         # 保存按钮
-        save_btn = QPushButton("💾 保存")
-        save_btn.setStyleSheet(ThemeManager.get_button_style("secondary"))
-        save_btn.clicked.connect(self._save_workflow)
-        toolbar_layout.addWidget(save_btn)
+        self.save_btn = QPushButton("💾 保存")
+        self.save_btn.setStyleSheet(ThemeManager.get_button_style("secondary"))
+        self.save_btn.clicked.connect(self._save_workflow)
+        toolbar_layout.addWidget(self.save_btn)
         
         layout.addWidget(toolbar)
         
@@ -109,6 +117,30 @@ class WorkflowTabWidget(QWidget):
         layout.addWidget(self.canvas)
         self.setLayout(layout)
     
+    def begin_loading(self):
+        """开始分批加载：加载完成前画布只读，禁止执行和保存（避免保存不完整的工作流）"""
+        self.loading_label.setText("⏳ 加载中...")
+        self._set_loading(True)
+    
+    def set_loading_progress(self, loaded: int, total: int):
+        """
+        显示加载进度，全部图元添加完成后恢复编辑
+        
+        Args:
+            loaded: 已添加到画布的图元数
+            total: 图元总数
+        """
+        self.loading_label.setText(f"⏳ 加载中 {loaded}/{total}")
+        self._set_loading(loaded < total)
+    
+    def _set_loading(self, loading: bool):
+        """切换加载状态"""
+        self._loading = loading
+        self.loading_label.setVisible(loading)
+        self.run_btn.setEnabled(not loading)
+        self.save_btn.setEnabled(not loading)
+        self.canvas.set_read_only(loading)
+    
     def _on_node_added(self, node_item):
         """节点被添加到画布"""
         self.nodes[node_item.node_id] = node_item
@@ -170,8 +202,15 @@ class WorkflowTabWidget(QWidget):
         """获取修改状态"""
         return self._is_modified
     
+    def is_loading(self):
+        """是否正在加载工作流（加载期间不能编辑，也没有需要保存的更改）"""
+        return self._loading
+    
     def _execute_workflow(self):
         """执行工作流"""
+        if self._loading:
+            QMessageBox.information(self, "正在加载", "工作流尚未加载完成，请稍后再执行")
+            return
         if not self.nodes:
             QMessageBox.warning(self, "无法执行", "工作流中没有节点")
             return
@@ -269,6 +308,10 @@ class WorkflowTabWidget(QWidget):
     
     def _save_workflow(self):
         """保存工作流"""
+        if self._loading:
+            # 画布上还缺少未加载的节点和连接，此时保存会丢失数据
+            QMessageBox.information(self, "正在加载", "工作流尚未加载完成，请稍后再保存")
+            return
         try:
             # 验证工作流名称（保存时排除当前工作流名称，因为保存同一个工作流是允许的）
             is_valid, error_msg = self._validate_workflow_name(self.workflow_name, exclude_current=True)
@@ -354,6 +397,10 @@ class WorkflowTabWidget(QWidget):
         """刷新首页工作流列表"""
         try:
             if self.main_window:
+                # 立即处理文件变化，增量更新首页卡片和节点使用索引
+                if hasattr(self.main_window, 'poll_file_changes'):
+                    self.main_window.poll_file_changes()
+                    return
                 overview_tab = self.main_window.tabs.widget(0)
                 if overview_tab and hasattr(overview_tab, 'refresh_workflows'):
                     overview_tab.refresh_workflows()
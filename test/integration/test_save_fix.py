@@ -10,7 +10,7 @@ def test_imports():
     """测试导入是否正常"""
     print("测试1: 检查模块导入...")
     try:
-        from src.views.overview_widget import OverviewWidget, WorkflowCard
+        from src.views.overview_widget import OverviewWidget
         from src.views.workflow_tab_widget import WorkflowTabWidget
         print("  [OK] 所有模块导入成功")
         return True
@@ -0,0 +1,60 @@
+import io
+import json
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.core import workflow_runner
+from src.core.workflow_executor import WorkflowExecutor
+from src.core.node_base import VariableCalcNode, SQLiteConnectNode
+
+class TestBatchExecution(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.uv_manager = MagicMock()
+        self.uv_manager.get_workflow_dir.return_value = self.tmp_dir
+        self.executor = WorkflowExecutor("test_workflow", self.uv_manager)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_results_streamed_as_json_lines(self):
+        self.executor.add_node(VariableCalcNode("n1", {"expression": "customer_id * 10", "output_var": "score"}))
+        inputs = [{"customer_id": i} for i in range(20)] + [{}]
+
+        stream = io.StringIO()
+        results = list(self.executor.execute_batch(iter(inputs), max_workers=3, stream=stream))
+
+        self.assertEqual(len(results), 21)
+        by_index = {r["index"]: r for r in results}
+        self.assertEqual(by_index[7]["result"]["score"], 70)
+        self.assertFalse(by_index[20]["success"])
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(sorted(l["index"] for l in lines), list(range(21)))
+        self.uv_manager.start_worker.assert_not_called()
+
+    def test_workers_and_scripts_reused_across_items(self):
+        self.executor.add_node(SQLiteConnectNode("n1", {"db_path": ":memory:", "connection_name": "db"}))
+
+        def start_worker(name):
+            worker = MagicMock()
+            worker.poll.return_value = None
+            return worker
+        self.uv_manager.start_worker.side_effect = start_worker
+
+        def send(process, command, timeout=300):
+            if command["type"] == "run_node":
+                return workflow_runner.handle_run_node(command)
+            return {"success": True, "data": None}
+        self.uv_manager.send_command_to_worker.side_effect = send
+
+        results = list(self.executor.execute_batch(({"i": i} for i in range(10)), max_workers=2))
+
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(sorted(r["result"]["i"] for r in results), list(range(10)))
+        self.assertLessEqual(self.uv_manager.start_worker.call_count, 2)
+        self.assertEqual(len(list(self.tmp_dir.glob("scripts/*.py"))), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.core import workflow_runner
+from src.core.workflow_executor import WorkflowExecutor
+from src.core.node_base import (
+    VariableAssignNode, SQLiteConnectNode, SQLiteExecuteNode
+)
+
+class TestChainFusion(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.uv_manager = MagicMock()
+        self.uv_manager.get_workflow_dir.return_value = self.tmp_dir
+        self.executor = WorkflowExecutor("test_workflow", self.uv_manager)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _add_sqlite_chain(self):
+        self.executor.add_node(VariableAssignNode("n1", {"variable_name": "sql", "value": "SELECT 1 AS v"}))
+        self.executor.add_node(SQLiteConnectNode("n2", {"db_path": ":memory:", "connection_name": "db_conn"}))
+        self.executor.add_node(SQLiteExecuteNode("n3", {"connection_name": "db_conn", "sql_var": "sql", "output_var": "rows"}))
+        self.executor.add_edge("n1", "n2")
+        self.executor.add_edge("n2", "n3")
+
+    def test_groups_linear_worker_chain(self):
+        self._add_sqlite_chain()
+        self.executor.execution_order = self.executor._topological_sort()
+        self.assertEqual(self.executor._build_execution_groups(), [["n1"], ["n2", "n3"]])
+
+    def test_fan_out_breaks_chain(self):
+        self._add_sqlite_chain()
+        self.executor.add_node(SQLiteConnectNode("n4", {"db_path": ":memory:", "connection_name": "other"}))
+        self.executor.add_edge("n2", "n4")
+        self.executor.execution_order = self.executor._topological_sort()
+        groups = self.executor._build_execution_groups()
+        self.assertIn(["n2"], groups)
+        self.assertIn(["n3"], groups)
+
+    def test_chain_sent_as_single_command(self):
+        self._add_sqlite_chain()
+        worker = MagicMock()
+        self.uv_manager.start_worker.return_value = worker
+
+        def send(process, command, timeout=300):
+            if command["type"] == "run_chain":
+                return workflow_runner.handle_run_chain(command)
+            return {"success": True, "data": None}
+        self.uv_manager.send_command_to_worker.side_effect = send
+
+        result = self.executor.execute()
+
+        commands = [c.args[1]["type"] for c in self.uv_manager.send_command_to_worker.call_args_list]
+        self.assertEqual(commands, ["run_chain", "exit"])
+        self.assertEqual(result["rows"], [{"v": 1}])
+        self.assertTrue(result["db_conn"]["connected"])
+
+    def test_runner_reports_failing_node(self):
+        self.executor.add_node(SQLiteConnectNode("n1", {"db_path": ":memory:"}))
+        self.executor.add_node(SQLiteExecuteNode("n2", {"sql_var": "missing"}))
+        scripts = self.executor.generate_scripts()
+        result = workflow_runner.handle_run_chain({
+            "steps": [{"node_id": n, "script_path": scripts[n]} for n in ("n1", "n2")],
+            "input_data": {}
+        })
+        self.assertFalse(result["success"])
+        self.assertEqual(result["node_id"], "n2")
+        self.assertEqual(result["completed"], ["n1"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import json
+import sys
+import unittest
+import tempfile
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from src import cli
+from src.core.workflow_executor import WorkflowExecutor
+from src.core.node_base import VariableAssignNode, VariableCalcNode
+from unittest.mock import MagicMock
+
+class TestHeadlessCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        uv_manager = MagicMock()
+        uv_manager.get_workflow_dir.return_value = self.tmp_dir / "calc"
+        executor = WorkflowExecutor("calc", uv_manager)
+        executor.add_node(VariableAssignNode("n1", {"variable_name": "x", "value": "2", "value_type": "int"}))
+        executor.add_node(VariableCalcNode("n2", {"expression": "x * factor", "output_var": "y"}))
+        executor.add_edge("n1", "n2")
+        (self.tmp_dir / "calc").mkdir()
+        self.workflow_path = str(self.tmp_dir / "calc" / "workflow.json")
+        executor.save_workflow(self.workflow_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _run(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = cli.main(list(argv))
+        return code, out.getvalue()
+
+    def test_run_json_output(self):
+        code, out = self._run("run", self.workflow_path, "--no-prepare", "--json",
+                              "--input", '{"factor": 5}')
+        self.assertEqual(code, cli.EXIT_OK)
+        report = json.loads(out.strip())
+        self.assertTrue(report["success"])
+        self.assertEqual(report["result"]["y"], 10)
+        self.assertNotIn("PySide6", sys.modules)
+
+    def test_failure_exit_code(self):
+        code, out = self._run("run", self.workflow_path, "--no-prepare", "--json")
+        self.assertEqual(code, cli.EXIT_FAILED)
+        self.assertFalse(json.loads(out.strip())["success"])
+
+    def test_parallel_runs_each_workflow(self):
+        code, out = self._run("run", self.workflow_path, self.workflow_path, "--no-prepare",
+                              "--json", "--parallel", "2", "--input", '{"factor": 3}')
+        self.assertEqual(code, cli.EXIT_OK)
+        reports = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual([r["result"]["y"] for r in reports], [6, 6])
+
+    def test_batch_streams_results(self):
+        inputs_path = self.tmp_dir / "inputs.jsonl"
+        inputs_path.write_text("\n".join(json.dumps({"factor": i}) for i in range(5)), encoding="utf-8")
+        code, out = self._run("batch", self.workflow_path, "--inputs", str(inputs_path),
+                              "--no-prepare", "--parallel", "2")
+        self.assertEqual(code, cli.EXIT_OK)
+        results = {r["index"]: r["result"]["y"] for r in map(json.loads, out.splitlines())}
+        self.assertEqual(results, {i: 2 * i for i in range(5)})
+
+    def test_usage_errors(self):
+        self.assertEqual(self._run("run", "missing/workflow.json")[0], cli.EXIT_USAGE)
+        self.assertEqual(self._run("run", self.workflow_path, "--input", "[1]")[0], cli.EXIT_USAGE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from src.core.dependency_index import DependencyIndex, specifiers_overlap
+from src.core.node_registry import NodeRegistry, split_requirement
+from src.core.workflow_scanner import WorkflowScanner
+
+class TestDependencyIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self._write_node("csv_reader", ["pandas>=2"])
+        self._write_node("excel_reader", ["Pandas >= 2", "openpyxl"])
+        self._write_node("legacy_reader", ["pandas==1.5.3"])
+        self._write_workflow("wf_a", ["csv_reader", "csv_reader", "variable_assign"])
+        self._write_workflow("wf_b", ["excel_reader", "legacy_reader"])
+
+        registry = NodeRegistry(str(self.tmp_dir / "user_data"))
+        scanner = WorkflowScanner(str(self.tmp_dir / "workflows"), index_path=str(self.tmp_dir / "index.db"))
+        self.index = DependencyIndex(scanner, registry)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write_node(self, node_type, dependencies):
+        node_dir = self.tmp_dir / "user_data" / "custom_nodes" / node_type
+        node_dir.mkdir(parents=True)
+        config = {"node_type": node_type, "name": node_type, "entry_file": "node.py", "dependencies": dependencies}
+        (node_dir / "node.json").write_text(json.dumps(config), encoding="utf-8")
+        (node_dir / "node.py").write_text("", encoding="utf-8")
+
+    def _write_workflow(self, name, node_types):
+        workflow_dir = self.tmp_dir / "workflows" / name
+        workflow_dir.mkdir(parents=True)
+        data = {
+            "workflow_name": name,
+            "nodes": [{"node_id": f"{name}_{i}", "node_type": t} for i, t in enumerate(node_types)],
+        }
+        (workflow_dir / "workflow.json").write_text(json.dumps(data), encoding="utf-8")
+
+    def test_split_requirement(self):
+        self.assertEqual(split_requirement(" Pandas >= 2 "), ("pandas", ">=2"))
+        self.assertEqual(split_requirement("py_yaml"), ("py-yaml", ""))
+
+    def test_package_to_workflows(self):
+        usages = self.index.find_usages("pandas")
+        self.assertEqual([u.node_type for u in usages], ["csv_reader", "excel_reader", "legacy_reader"])
+        csv_usage = usages[0]
+        self.assertEqual([(w.workflow_name, w.count) for w in csv_usage.workflows], [("wf_a", 2)])
+
+    def test_version_specifier(self):
+        usages = self.index.find_usages("pandas>=2")
+        self.assertEqual([u.node_type for u in usages], ["csv_reader", "excel_reader"])
+        self.assertEqual(list(self.index.get_affected_workflows(["pandas==1.5.3"])), ["wf_b"])
+        self.assertEqual(list(self.index.get_affected_workflows(["pandas"])), ["wf_a", "wf_b"])
+        self.assertEqual(self.index.find_usages("numpy"), [])
+
+    def test_version_ranges_overlap(self):
+        self._write_node("parquet_reader", ["pandas>=2.0"])
+        self._write_node("json_reader", ["pandas>=2.1"])
+        self._write_node("pinned_reader", ["pandas==2.2.0"])
+        self._write_node("old_reader", ["pandas<2"])
+        registry = NodeRegistry(str(self.tmp_dir / "user_data"))
+        index = DependencyIndex(self.index._scanner, registry)
+
+        self.assertEqual([u.node_type for u in index.find_usages("pandas>=2")],
+                         ["csv_reader", "excel_reader", "json_reader", "parquet_reader", "pinned_reader"])
+        self.assertEqual([u.node_type for u in index.find_usages("pandas<2")], ["legacy_reader", "old_reader"])
+        self.assertEqual([u.node_type for u in index.find_usages("pandas==2.1.5")],
+                         ["csv_reader", "excel_reader", "json_reader", "parquet_reader"])
+
+    def test_specifiers_overlap(self):
+        self.assertTrue(specifiers_overlap(">=2", ""))
+        self.assertTrue(specifiers_overlap(">=2", "==2.*"))
+        self.assertTrue(specifiers_overlap(">2", "<2.1"))
+        self.assertTrue(specifiers_overlap(">=2,!=2.0", "<=2.0.5"))
+        self.assertFalse(specifiers_overlap("~=2.2", "<2.2"))
+        self.assertFalse(specifiers_overlap(">=2", "==1.5.3"))
+
+    def test_all_packages_and_workflow_requirements(self):
+        self.assertEqual(self.index.get_packages(), ["openpyxl", "pandas"])
+        self.assertEqual({u.package for u in self.index.find_usages()}, {"openpyxl", "pandas"})
+        self.assertEqual(self.index.get_workflow_requirements("wf_b"), ["Pandas >= 2", "openpyxl", "pandas==1.5.3"])
+
+if __name__ == '__main__':
+    unittest.main()
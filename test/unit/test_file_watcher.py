@@ -0,0 +1,92 @@
+import json
+import os
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from src.core.file_watcher import FileWatcher, ADDED, MODIFIED, DELETED
+from src.core.node_registry import NodeRegistry
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.workflows_dir = self.tmp_dir / "workflows"
+        (self.workflows_dir / "wf_a").mkdir(parents=True)
+        (self.workflows_dir / "wf_a" / "workflow.json").write_text("{}", encoding="utf-8")
+        self.watcher = FileWatcher([str(self.workflows_dir)])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _kinds(self, events):
+        return {(e.kind, Path(e.path).parent.name) for e in events}
+
+    def test_first_poll_is_baseline(self):
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_add_modify_delete_events(self):
+        self.watcher.poll()
+        (self.workflows_dir / "wf_b").mkdir()
+        (self.workflows_dir / "wf_b" / "workflow.json").write_text("{}", encoding="utf-8")
+        (self.workflows_dir / "wf_a" / "workflow.json").write_text('{"nodes": []}', encoding="utf-8")
+        self.assertEqual(self._kinds(self.watcher.poll()), {(ADDED, "wf_b"), (MODIFIED, "wf_a")})
+
+        shutil.rmtree(self.workflows_dir / "wf_a")
+        events = self.watcher.poll()
+        self.assertEqual(self._kinds(events), {(DELETED, "wf_a")})
+        self.assertEqual(events[0].root, str(self.workflows_dir))
+
+    def test_watched_paths(self):
+        (self.workflows_dir / "wf_a" / ".venv").mkdir()
+        self.watcher.poll()
+        directories, files = self.watcher.watched_paths()
+        self.assertEqual(sorted(Path(d).name for d in directories), ["wf_a", "workflows"])
+        self.assertEqual([Path(f).parent.name for f in files], ["wf_a"])
+
+    def test_ignored_dirs_and_suffixes(self):
+        self.watcher.poll()
+        (self.workflows_dir / "wf_a" / ".venv").mkdir()
+        (self.workflows_dir / "wf_a" / ".venv" / "pyvenv.json").write_text("{}", encoding="utf-8")
+        (self.workflows_dir / "wf_a" / "data.db").write_text("x", encoding="utf-8")
+        self.assertEqual(self.watcher.poll(), [])
+
+
+class TestRegistryFileEvents(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.registry = NodeRegistry(str(self.tmp_dir))
+        self.watcher = FileWatcher([str(self.tmp_dir)])
+        self.watcher.poll()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write_node(self, node_dir, name):
+        node_dir.mkdir(parents=True, exist_ok=True)
+        config = {"node_type": node_dir.name, "name": name, "entry_file": "node.py"}
+        (node_dir / "node.json").write_text(json.dumps(config), encoding="utf-8")
+        (node_dir / "node.py").write_text("def execute(self, input_data):\n    return input_data\n", encoding="utf-8")
+
+    def test_custom_and_external_nodes_follow_files(self):
+        custom_dir = self.tmp_dir / "custom_nodes" / "custom_demo"
+        external_dir = self.tmp_dir / "external_nodes" / "github" / "gh_demo"
+        self._write_node(custom_dir, "演示")
+        self._write_node(external_dir, "外部演示")
+
+        changed = self.registry.apply_file_events(self.watcher.poll())
+        self.assertEqual(sorted(changed), ["custom_demo", "gh_demo"])
+        self.assertEqual(self.registry.get_node("custom_demo").name, "演示")
+        self.assertIn("return input_data", self.registry.get_source_code("gh_demo"))
+
+        self._write_node(custom_dir, "演示2")
+        self.registry.apply_file_events(self.watcher.poll())
+        self.assertEqual(self.registry.get_node("custom_demo").name, "演示2")
+
+        shutil.rmtree(external_dir)
+        self.assertEqual(self.registry.apply_file_events(self.watcher.poll()), ["gh_demo"])
+        self.assertIsNone(self.registry.get_node("gh_demo"))
+        self.assertIsNotNone(self.registry.get_node("variable_assign"))
+
+if __name__ == '__main__':
+    unittest.main()
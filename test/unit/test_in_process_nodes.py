@@ -0,0 +1,93 @@
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.core.workflow_executor import WorkflowExecutor
+from src.core.node_base import (
+    VariableAssignNode, VariableCalcNode, SQLStatementNode, SQLiteConnectNode, is_safe_expression
+)
+
+class TestInProcessExecution(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.uv_manager = MagicMock()
+        self.uv_manager.get_workflow_dir.return_value = self.tmp_dir
+        self.executor = WorkflowExecutor("test_workflow", self.uv_manager)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _add_chain(self):
+        self.executor.add_node(VariableAssignNode("n1", {"variable_name": "x", "value": "10", "value_type": "int"}))
+        self.executor.add_node(VariableCalcNode("n2", {"expression": "x * 2", "output_var": "y"}))
+        self.executor.add_node(SQLStatementNode("n3", {"sql": "SELECT {y}", "output_var": "sql"}))
+        self.executor.add_edge("n1", "n2")
+        self.executor.add_edge("n2", "n3")
+
+    def test_pure_chain_skips_worker(self):
+        self._add_chain()
+        result = self.executor.execute()
+
+        self.assertEqual(result["x"], 10)
+        self.assertEqual(result["y"], 20)
+        self.assertEqual(result["sql"], "SELECT 20")
+        self.uv_manager.start_worker.assert_not_called()
+        self.uv_manager.send_command_to_worker.assert_not_called()
+        self.assertEqual(list(self.tmp_dir.glob("scripts/*.py")), [])
+
+    def test_mixed_chain_dispatches_only_impure_nodes(self):
+        self._add_chain()
+        self.executor.add_node(SQLiteConnectNode("n4", {"db_path": ":memory:", "connection_name": "db"}))
+        self.executor.add_edge("n3", "n4")
+
+        worker = MagicMock()
+        self.uv_manager.start_worker.return_value = worker
+        self.uv_manager.send_command_to_worker.return_value = {"success": True, "data": {"db": {"type": "sqlite"}}}
+
+        result = self.executor.execute()
+
+        self.assertEqual(result["db"], {"type": "sqlite"})
+        run_calls = [c for c in self.uv_manager.send_command_to_worker.call_args_list
+                     if c.args[1].get("type") == "run_node"]
+        self.assertEqual(len(run_calls), 1)
+        self.assertTrue(run_calls[0].args[1]["script_path"].endswith("node_n4.py"))
+        self.assertEqual(run_calls[0].args[1]["input_data"]["sql"], "SELECT 20")
+
+    def test_in_process_error_is_reported(self):
+        self.executor.add_node(VariableCalcNode("n1", {"expression": "missing + 1", "output_var": "y"}))
+        with self.assertRaises(RuntimeError):
+            self.executor.execute()
+
+    def test_unsafe_expression_runs_in_worker(self):
+        node = VariableCalcNode("n1", {"expression": "().__class__.__mro__", "output_var": "y"})
+        self.assertFalse(node.pure)
+        with self.assertRaises(ValueError):
+            node.execute({})
+
+        self.executor.add_node(node)
+        worker = MagicMock()
+        self.uv_manager.start_worker.return_value = worker
+        self.uv_manager.send_command_to_worker.return_value = {"success": True, "data": {"y": 1}}
+        self.executor.execute()
+        run_calls = [c for c in self.uv_manager.send_command_to_worker.call_args_list
+                     if c.args[1].get("type") == "run_node"]
+        self.assertEqual(len(run_calls), 1)
+
+    def test_safe_expressions(self):
+        self.assertTrue(is_safe_expression("x * 2 + (y - 1) / 3"))
+        self.assertTrue(is_safe_expression("a if x > 0 and not b else -1"))
+        self.assertFalse(is_safe_expression("__import__('os')"))
+        self.assertFalse(is_safe_expression("x.upper()"))
+        self.assertFalse(is_safe_expression("x[0]"))
+        self.assertFalse(is_safe_expression("x +"))
+
+    def test_large_power_runs_in_worker(self):
+        self.assertTrue(is_safe_expression("x ** 2 + 10 ** 8"))
+        self.assertTrue(VariableCalcNode("n1", {"expression": "x ** 0.5"}).pure)
+        for expression in ("9 ** 9 ** 9", "x ** 10 ** 8", "x ** y", "2 ** 1000", "1 << 10 ** 10"):
+            self.assertFalse(is_safe_expression(expression), expression)
+            self.assertFalse(VariableCalcNode("n1", {"expression": expression}).pure, expression)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.core.node_registry import NodeRegistry
+
+class TestNodeCatalogCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self._write_node(self.tmp_dir / "custom_nodes" / "custom_a", "节点A")
+        self._write_node(self.tmp_dir / "custom_nodes" / "custom_b", "节点B")
+        self._write_node(self.tmp_dir / "external_nodes" / "github" / "gh_c", "节点C")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write_node(self, node_dir, name):
+        node_dir.mkdir(parents=True, exist_ok=True)
+        config_file = node_dir / "node.json"
+        old_mtime = config_file.stat().st_mtime_ns if config_file.exists() else 0
+        config_file.write_text(json.dumps({"node_type": node_dir.name, "name": name, "dependencies": ["requests"]}), encoding="utf-8")
+        # 确保 mtime 发生变化
+        mtime = max(config_file.stat().st_mtime_ns, old_mtime + 1_000_000)
+        os.utime(config_file, ns=(mtime, mtime))
+        (node_dir / "node.py").write_text("def execute(self, input_data):\n    return input_data\n", encoding="utf-8")
+
+    def test_second_load_reads_only_catalog(self):
+        NodeRegistry(str(self.tmp_dir))
+        with patch.object(NodeRegistry, "_read_node_dir") as read_node_dir:
+            registry = NodeRegistry(str(self.tmp_dir))
+            read_node_dir.assert_not_called()
+        node = registry.get_node("gh_c")
+        self.assertEqual(node.name, "节点C")
+        self.assertEqual(node.dependencies, ["requests"])
+        self.assertIn("return input_data", node.source_code)
+
+    def test_only_changed_directory_is_reparsed(self):
+        NodeRegistry(str(self.tmp_dir))
+        self._write_node(self.tmp_dir / "custom_nodes" / "custom_b", "节点B2")
+        shutil.rmtree(self.tmp_dir / "custom_nodes" / "custom_a")
+
+        with patch.object(NodeRegistry, "_read_node_dir", autospec=True,
+                          side_effect=NodeRegistry._read_node_dir) as read_node_dir:
+            registry = NodeRegistry(str(self.tmp_dir))
+            self.assertEqual([c.args[1].name for c in read_node_dir.call_args_list], ["custom_b"])
+        self.assertEqual(registry.get_node("custom_b").name, "节点B2")
+        self.assertIsNone(registry.get_node("custom_a"))
+
+    def test_version_counter(self):
+        registry = NodeRegistry(str(self.tmp_dir))
+        version = registry.version
+        self.assertEqual(registry.reload_node_dir(self.tmp_dir / "custom_nodes" / "custom_a"), ["custom_a"])
+        self.assertGreater(registry.version, version)
+
+        version = registry.version
+        registry.unregister_node("missing")
+        self.assertEqual(registry.version, version)
+
+if __name__ == '__main__':
+    unittest.main()
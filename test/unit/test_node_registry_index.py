@@ -0,0 +1,58 @@
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+from src.core.node_base import NodeType
+from src.core.node_registry import NodeRegistry, NodeDefinition, NodeSource
+
+class TestNodeRegistryIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.registry = NodeRegistry(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _node(self, node_type, category="网络", dependencies=None, source=NodeSource.GITHUB):
+        return NodeDefinition(node_type=node_type, name=node_type, description="", source=source,
+                              category=category, source_code="", config_schema={},
+                              dependencies=dependencies or [])
+
+    def test_lookup_by_enum_and_string(self):
+        by_enum = self.registry.get_node(NodeType.SQLITE_CONNECT)
+        self.assertIsNotNone(by_enum)
+        self.assertIs(by_enum, self.registry.get_node("sqlite_connect"))
+        self.assertIsNone(self.registry.get_node("missing"))
+
+    def test_secondary_indexes(self):
+        self.registry.register_external_node(self._node("http_get", dependencies=["Requests>=2.0"]))
+        self.registry.register_external_node(self._node("http_post", dependencies=["requests"]))
+
+        self.assertEqual([n.node_type for n in self.registry.get_nodes_by_dependency("requests")],
+                         ["http_get", "http_post"])
+        self.assertEqual(len(self.registry.get_nodes_by_category("网络")), 2)
+        self.assertEqual(len(self.registry.get_nodes_by_source(NodeSource.OFFICIAL)), 5)
+
+        # 重新注册时替换旧索引项
+        self.registry.register_external_node(self._node("http_get", category="工具", source=NodeSource.CUSTOM))
+        self.assertEqual([n.node_type for n in self.registry.get_nodes_by_dependency("requests")], ["http_post"])
+        self.assertEqual([n.node_type for n in self.registry.get_nodes_by_source(NodeSource.CUSTOM)], ["http_get"])
+
+        self.registry.unregister_node("http_post")
+        self.assertEqual(self.registry.get_nodes_by_dependency("requests"), [])
+        self.assertEqual(self.registry.get_nodes_by_category("网络"), [])
+
+    def test_repr_and_eq_do_not_load_source(self):
+        source_path = f"{self.tmp_dir}/node.py"
+        with open(source_path, "w", encoding="utf-8") as f:
+            f.write("def execute(self, input_data):\n    return input_data\n")
+        node = self._node("lazy")
+        node.source_path = source_path
+
+        with patch("builtins.open", side_effect=AssertionError("source loaded")):
+            self.assertNotIn("source_code", repr(node))
+            self.assertEqual(node, node)
+        self.assertIn("return input_data", node.source_code)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+import unittest
+from src.core.node_search import NodeSearchIndex
+from src.core.node_registry import NodeRegistry
+
+class TestNodeSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.nodes = [
+            {"name": "SQL查询", "category": "数据库", "description": "执行 SELECT 语句"},
+            {"name": "变量赋值", "category": "变量", "description": "为变量赋值"},
+            {"name": "执行SQL", "category": "数据库", "description": "运行任意 sql"},
+            {"name": "HTTP请求", "category": "网络", "description": "发送请求并返回 json"},
+        ]
+        self.index = NodeSearchIndex(self.nodes)
+
+    def _naive(self, text):
+        text = text.lower()
+        return {
+            i for i, n in enumerate(self.nodes)
+            if text in n["name"].lower() or text in n["category"].lower() or text in n["description"].lower()
+        }
+
+    def test_matches_substring_filter(self):
+        for query in ["sql", "变量", "执行", "select", "请求并返回", "json", "xyz", "S"]:
+            self.assertEqual(set(self.index.search(query)), self._naive(query), query)
+
+    def test_ranking(self):
+        scores = self.index.search("sql")
+        # 名称前缀匹配 > 名称包含 > 仅描述
+        self.assertGreater(scores[0], scores[2])
+        self.assertEqual(sorted(scores, key=scores.get, reverse=True), [0, 2])
+        scores = self.index.search("变量")
+        self.assertEqual(list(scores), [1])
+
+    def test_multi_term_and(self):
+        self.assertEqual(set(self.index.search("数据库 select")), {0})
+        self.assertEqual(self.index.search("数据库 json"), {})
+
+    def test_long_query_verified(self):
+        # 所有 3-gram 都出现过，但整个字符串不是任何字段的子串
+        self.assertEqual(self.index.search("变量赋值为变量赋值"), {})
+        self.assertEqual(set(self.index.search("为变量赋值")), {1})
+
+    def test_empty_query(self):
+        self.assertIsNone(self.index.search(""))
+        self.assertIsNone(self.index.search("   "))
+
+    def test_registry_nodes(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        nodes = NodeRegistry(tmp_dir).get_all_nodes()
+        index = NodeSearchIndex(nodes)
+        expected = {i for i, n in enumerate(nodes) if "变量" in n["name"].lower()
+                    or "变量" in str(n.get("category") or "").lower()
+                    or "变量" in str(n.get("description") or "").lower()}
+        self.assertEqual(set(index.search("变量")), expected)
+
+if __name__ == '__main__':
+    unittest.main()
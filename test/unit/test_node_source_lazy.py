@@ -0,0 +1,55 @@
+import builtins
+import json
+import os
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.core.custom_node_manager import CustomNodeManager
+
+class TestLazyNodeSource(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.manager = CustomNodeManager(self.tmp_dir)
+        self.node_dir = self.manager.custom_nodes_dir / "custom_demo"
+        self.node_dir.mkdir()
+        (self.node_dir / "node.json").write_text(json.dumps({"node_type": "custom_demo", "name": "演示"}), encoding="utf-8")
+        self.entry_file = self.node_dir / "node.py"
+        self.entry_file.write_text("v1", encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _touch(self, text):
+        mtime = self.entry_file.stat().st_mtime_ns
+        self.entry_file.write_text(text, encoding="utf-8")
+        os.utime(self.entry_file, ns=(mtime + 1_000_000, mtime + 1_000_000))
+
+    def test_source_read_on_first_access_and_cached(self):
+        opened = []
+        real_open = builtins.open
+        def tracking_open(file, *args, **kwargs):
+            opened.append(str(file))
+            return real_open(file, *args, **kwargs)
+
+        with patch("builtins.open", tracking_open):
+            node_def = self.manager.load_all_custom_nodes()[0]
+            self.assertNotIn(str(self.entry_file), opened)
+            self.assertEqual(node_def.source_code, "v1")
+            self.assertEqual(node_def.source_code, "v1")
+        self.assertEqual(opened.count(str(self.entry_file)), 1)
+
+    def test_source_reloaded_when_file_changes(self):
+        node_def = self.manager.load_all_custom_nodes()[0]
+        self.assertEqual(node_def.source_code, "v1")
+        self._touch("v2")
+        self.assertEqual(node_def.source_code, "v2")
+
+        node_def.source_code = "in memory"
+        self.assertEqual(node_def.source_code, "in memory")
+        self._touch("v3")
+        self.assertEqual(node_def.source_code, "v3")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.core import workflow_metadata
+from src.core.workflow_executor import WorkflowExecutor
+from src.core.node_base import VariableAssignNode, VariableCalcNode
+
+class TestWorkflowMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        uv_manager = MagicMock()
+        uv_manager.get_workflow_dir.return_value = self.tmp_dir / "calc"
+        self.executor = WorkflowExecutor("calc", uv_manager)
+        self.executor.add_node(VariableAssignNode("n1", {"variable_name": "x", "value": "2", "value_type": "int"}))
+        self.executor.add_node(VariableAssignNode("n2", {"variable_name": "f", "value": "3", "value_type": "int"}))
+        self.executor.add_node(VariableCalcNode("n3", {"expression": "x * f", "output_var": "y"}))
+        (self.tmp_dir / "calc").mkdir()
+        self.workflow_path = str(self.tmp_dir / "calc" / "workflow.json")
+        self.executor.save_workflow(self.workflow_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_save_writes_compact_sidecar(self):
+        metadata = workflow_metadata.read_metadata(self.workflow_path)
+        self.assertEqual(metadata["workflow_name"], "calc")
+        self.assertEqual(metadata["node_count"], 3)
+        self.assertEqual(metadata["node_types"], {"variable_assign": 2, "variable_calc": 1})
+        self.assertNotIn("node_ids", metadata)
+        self.assertEqual(metadata["dependency_fingerprint"], workflow_metadata.dependency_fingerprint([]))
+        self.assertIsNone(metadata["last_run"])
+        self.assertLess(workflow_metadata.get_metadata_path(self.workflow_path).stat().st_size, 1024)
+
+    def test_stale_sidecar_is_rebuilt(self):
+        data = json.loads(Path(self.workflow_path).read_text(encoding="utf-8"))
+        data["nodes"] = data["nodes"][:1]
+        Path(self.workflow_path).write_text(json.dumps(data), encoding="utf-8")
+
+        self.assertIsNone(workflow_metadata.read_metadata(self.workflow_path))
+        self.assertEqual(workflow_metadata.load_metadata(self.workflow_path)["node_count"], 1)
+        self.assertIsNotNone(workflow_metadata.read_metadata(self.workflow_path))
+
+    def test_last_run_status_survives_save(self):
+        self.executor.execute()
+        self.assertEqual(workflow_metadata.read_metadata(self.workflow_path)["last_run"]["status"], "success")
+
+        self.executor.save_workflow(self.workflow_path)
+        executor = WorkflowExecutor.load_workflow(self.workflow_path, self.executor.uv_manager)
+        executor.nodes["n3"].config["expression"] = "missing_var"
+        with self.assertRaises(Exception):
+            executor.execute()
+        last_run = workflow_metadata.read_metadata(self.workflow_path)["last_run"]
+        self.assertEqual(last_run["status"], "failed")
+        self.assertTrue(last_run["error"])
+
+    def test_batch_run_records_summary(self):
+        inputs = [{"x": 1}, {"x": 2}, {"f": 5}]
+        self.executor.nodes["n3"].config["expression"] = "x * g"
+        results = list(self.executor.execute_batch(inputs, max_workers=2))
+        self.assertEqual(len(results), 3)
+
+        last_run = workflow_metadata.read_metadata(self.workflow_path)["last_run"]
+        self.assertEqual(last_run["status"], "failed")
+        self.assertEqual(last_run["batch"], {"succeeded": 0, "failed": 3})
+
+        self.executor.nodes["n3"].config["expression"] = "x * f"
+        list(self.executor.execute_batch(inputs, max_workers=2))
+        last_run = workflow_metadata.read_metadata(self.workflow_path)["last_run"]
+        self.assertEqual(last_run["status"], "success")
+        self.assertEqual(last_run["batch"], {"succeeded": 3, "failed": 0})
+
+    def test_concurrent_writes_use_separate_temp_files(self):
+        import threading
+        threads = [threading.Thread(target=workflow_metadata.record_run, args=(self.workflow_path, True, i))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(workflow_metadata.read_metadata(self.workflow_path)["last_run"]["status"], "success")
+        self.assertEqual(list((self.tmp_dir / "calc").glob("*.tmp")), [])
+
+    def test_invalid_workflow(self):
+        Path(self.workflow_path).write_text("not json", encoding="utf-8")
+        self.assertIsNone(workflow_metadata.load_metadata(self.workflow_path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.core.workflow_scanner import WorkflowScanner
+from src.core.workflow_metadata import read_workflow
+
+class TestWorkflowScannerIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.workflows_dir = self.tmp_dir / "workflows"
+        self.index_path = str(self.tmp_dir / "workflow_index.db")
+        self._write("wf_a", ["variable_assign", "variable_calc", "variable_assign"])
+        self._write("wf_b", ["sqlite_connect"])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name, node_types):
+        workflow_dir = self.workflows_dir / name
+        workflow_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            "workflow_name": name,
+            "nodes": [{"node_id": f"{name}_{i}", "node_type": t} for i, t in enumerate(node_types)],
+        }
+        path = workflow_dir / "workflow.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def _scanner(self):
+        return WorkflowScanner(str(self.workflows_dir), index_path=self.index_path)
+
+    def test_queries(self):
+        scanner = self._scanner()
+        usage = scanner.get_workflows_using_node("variable_assign")
+        self.assertEqual([u.workflow_name for u in usage], ["wf_a"])
+        self.assertEqual(usage[0].node_ids, ["wf_a_0", "wf_a_2"])
+        self.assertEqual(usage[0].count, 2)
+
+        nodes = scanner.get_nodes_in_workflow("wf_a")
+        self.assertEqual([(n.node_type, n.count) for n in nodes], [("variable_assign", 2), ("variable_calc", 1)])
+        self.assertEqual(scanner.get_nodes_in_workflow("missing"), [])
+
+    def test_only_changed_files_are_parsed(self):
+        scanner = self._scanner()
+        scanner.scan_all_workflows()
+
+        path = self._write("wf_b", ["sqlite_connect", "sqlite_execute"])
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        with patch("src.core.workflow_scanner.read_workflow", wraps=read_workflow) as load:
+            scanner.scan_all_workflows()
+            load.assert_called_once_with(str(path))
+        self.assertEqual(len(scanner.get_workflows_using_node("sqlite_execute")), 1)
+
+    def test_deleted_workflow_removed(self):
+        scanner = self._scanner()
+        scanner.scan_all_workflows()
+        shutil.rmtree(self.workflows_dir / "wf_b")
+        self.assertEqual(scanner.get_workflows_using_node("sqlite_connect"), [])
+
+    def test_index_persists_across_instances(self):
+        self._scanner().scan_all_workflows()
+        with patch("src.core.workflow_scanner.read_workflow") as load:
+            usage = self._scanner().get_workflows_using_node("variable_calc")
+            load.assert_not_called()
+        self.assertEqual([u.workflow_name for u in usage], ["wf_a"])
+
+if __name__ == '__main__':
+    unittest.main()
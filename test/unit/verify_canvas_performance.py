@@ -0,0 +1,96 @@
+"""
+画布性能基准
+创建一个包含大量节点和连接线的场景，测量整屏绘制、平移、拖动单个节点、
+拖动临时连接线以及小地图重建和跳转时的帧耗时
+
+用法: python -m test.unit.verify_canvas_performance [节点数]
+"""
+
+import sys
+import time
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QPointF
+
+from src.views.workflow_canvas import WorkflowCanvas, WorkflowGraphicsScene
+from src.views.node_graphics import NodeGraphicsItem, ConnectionGraphicsItem
+from src.core.node_base import NodeType
+
+
+NODE_TYPES = list(NodeType)
+
+
+def build_scene(scene, node_count: int, columns: int = 60):
+    """按网格排列节点，每个节点连接到右侧和下方的节点"""
+    nodes = []
+    for i in range(node_count):
+        node = NodeGraphicsItem(f"bench_{i}", NODE_TYPES[i % len(NODE_TYPES)], f"节点 {i}")
+        node.setPos((i % columns) * 260, (i // columns) * 140)
+        scene.addItem(node)
+        nodes.append(node)
+    
+    connections = 0
+    for i, node in enumerate(nodes):
+        for j in (i + 1, i + columns):
+            if j < node_count and (j != i + 1 or j % columns):
+                scene.addItem(ConnectionGraphicsItem(node.output_ports[0], nodes[j].input_ports[0]))
+                connections += 1
+    return nodes, connections
+
+
+def measure(app, canvas, label: str, step, frames: int = 30):
+    """执行 frames 次 step 并处理由此产生的重绘（只重绘视图标记为脏的区域），输出平均帧耗时"""
+    app.processEvents()
+    start = time.perf_counter()
+    for i in range(frames):
+        step(i)
+        # 第一次处理场景的脏图元，第二次处理视口的重绘请求
+        app.processEvents()
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) / frames * 1000
+    print(f"{label:<24} {elapsed:8.2f} ms/帧")
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    app = QApplication(sys.argv)
+    
+    scene = WorkflowGraphicsScene()
+    canvas = WorkflowCanvas(scene)
+    canvas.resize(1600, 1000)
+    canvas.show()
+    
+    start = time.perf_counter()
+    nodes, connections = build_scene(scene, node_count)
+    print(f"创建 {len(nodes)} 个节点、{connections} 条连接线: {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    # 近景：只有少量节点可见
+    canvas.resetTransform()
+    canvas.centerOn(nodes[len(nodes) // 2])
+    measure(app, canvas, "近景整屏重绘", lambda i: canvas.viewport().update())
+    measure(app, canvas, "近景平移", lambda i: canvas.translate(5, 3))
+    
+    node = nodes[len(nodes) // 2]
+    origin = node.pos()
+    measure(app, canvas, "近景拖动单个节点", lambda i: node.setPos(origin + QPointF(i * 4, i * 2)))
+    
+    temp = ConnectionGraphicsItem(node.output_ports[0])
+    scene.addItem(temp)
+    measure(app, canvas, "近景拖动临时连接线", lambda i: temp.set_end_pos(node.scenePos() + QPointF(300 + i * 5, i * 3)))
+    scene.removeItem(temp)
+    
+    # 远景：缩放到显示全部节点
+    canvas.fitInView(scene.itemsBoundingRect())
+    measure(app, canvas, "远景整屏重绘", lambda i: canvas.viewport().update())
+    measure(app, canvas, "远景拖动单个节点", lambda i: node.setPos(origin + QPointF(-i * 4, -i * 2)))
+    
+    # 小地图：整体重建快照、点击跳转（只移动视口，不缩放）
+    minimap = canvas._minimap
+    measure(app, canvas, "小地图重建快照", lambda i: minimap._rebuild(), frames=5)
+    canvas.resetTransform()
+    measure(app, canvas, "小地图点击跳转", lambda i: minimap._jump_to(QPointF(i * 7 % minimap.width(), i * 5 % minimap.height())))
+    
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()